@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+"""
+Benchmark indicator computation on a synthetic OHLCV universe, without Postgres.
+
+Times every indicator function in app/indicators and the incremental update on a
+sample of securities, compute_indicators_for_range end-to-end on the same sample,
+and the panel engine over the whole universe in shards. Writes a JSON report that
+is stable for the same parameters, so two versions can be diffed, and fails when a
+benchmark got slower than a baseline report by more than a threshold.
+
+    python -m app.benchmarks.indicators --securities 5000 --years 10 \\
+        --output report.json --baseline previous.json --threshold 0.25
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+
+from datetime import date
+from functools import partial
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from app.benchmarks.rolling_kernels import best_of
+from app.benchmarks.universe import security_frame, synthetic_universe
+from app.handlers.ohlcv_daily import OHLCVArrays
+from app.indicators.atr import atr
+from app.indicators.avg_volume import avg_volume
+from app.indicators.breakout_proximity import breakout_proximity
+from app.indicators.close_position import close_position
+from app.indicators.compute import (
+    TRADING_DAYS_REQUIRED,
+    OHLCVLoader,
+    compute_indicators_for_range_from,
+)
+from app.indicators.ema import ema
+from app.indicators.high_low import breakout_high_n, breakout_low_n
+from app.indicators.incremental import advance_indicator_state, build_indicator_state
+from app.indicators.macd import macd
+from app.indicators.panel import OHLCVPanel, compute_indicator_panel
+from app.indicators.percent_change import percent_change
+from app.indicators.price_volume_corr import price_volume_corr
+from app.indicators.range_pct import range_pct
+from app.indicators.rolling_volatility import rolling_volatility
+from app.indicators.rsi import rsi
+from app.indicators.sma import sma
+from app.indicators.volume_weighted_change import volume_weighted_change
+from app.utils.log_setup import configure_logging
+from app.utils.log_wrapper import Log
+
+REPORT_VERSION = 1
+
+# Per-security indicator functions, as compute.py used to call them
+INDICATOR_FUNCTIONS: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    "sma_200": lambda df: sma(df, lookback_days=200),
+    "ema_20": lambda df: ema(df, lookback_days=20),
+    "rsi_14": lambda df: rsi(df, lookback_days=14),
+    "macd": lambda df: macd(df),
+    "atr_14": lambda df: atr(df, lookback_days=14),
+    "avg_vol_20d": lambda df: avg_volume(df, lookback_days=20),
+    "avg_vol_weighted_change_50d": lambda df: volume_weighted_change(
+        df, lookback_days=50
+    ),
+    "price_volume_corr_20": lambda df: price_volume_corr(df, lookback_days=20),
+    "high_10d": lambda df: breakout_high_n(df, lookback_days=10),
+    "low_10d": lambda df: breakout_low_n(df, lookback_days=10),
+    "close_position": close_position,
+    "percent_change": percent_change,
+    "range_pct_20": lambda df: range_pct(df, lookback_days=20),
+    "breakout_proximity_20": lambda df: breakout_proximity(df, lookback_days=20),
+    "rolling_volatility_20": lambda df: rolling_volatility(df, lookback_days=20),
+}
+
+
+def run_suite(
+    universe: OHLCVArrays, sample: int, shard_size: int, repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    """Time every benchmark and return {name: {"seconds", "securities"}}."""
+    sample_ids = universe.security_ids[:sample].tolist()
+    frames = {
+        security_id: security_frame(universe, security_id) for security_id in sample_ids
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def record(name: str, func: Callable[[], object], securities: int) -> None:
+        seconds = best_of(func, repeat)
+        results[name] = {"seconds": round(seconds, 6), "securities": securities}
+        Log.info(f"{name:<48} {seconds * 1000:>10.1f} ms")
+
+    for name, function in INDICATOR_FUNCTIONS.items():
+        record(
+            f"function/{name}",
+            partial(_each, frames, function),
+            len(frames),
+        )
+
+    record(
+        "compute_indicators_for_range",
+        partial(_compute_for_range, frames, _frame_loader(frames)),
+        len(frames),
+    )
+    states = [
+        (build_indicator_state(security_id, df[:-1]), df.iloc[-1].to_dict())
+        for security_id, df in frames.items()
+    ]
+    record(
+        "incremental/advance_one_candle",
+        lambda: [advance_indicator_state(state, candle) for state, candle in states],
+        len(frames),
+    )
+
+    long = universe.to_frame()
+    shards = [
+        long[long["security_id"].isin(universe.security_ids[i : i + shard_size])]
+        for i in range(0, len(universe.security_ids), shard_size)
+    ]
+    record(
+        "panel/from_long",
+        lambda: [OHLCVPanel.from_long(shard) for shard in shards],
+        len(universe.security_ids),
+    )
+    panels = [OHLCVPanel.from_long(shard) for shard in shards]
+    record(
+        "panel/compute_indicator_panel",
+        lambda: [compute_indicator_panel(panel) for panel in panels],
+        len(universe.security_ids),
+    )
+
+    return results
+
+
+def build_report(
+    results: Dict[str, Dict[str, Any]], parameters: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "version": REPORT_VERSION,
+        "parameters": parameters,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def find_regressions(
+    report: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Benchmarks that are slower than in baseline by more than threshold (0.25 is 25%).
+    Benchmarks missing from either report are ignored.
+    """
+    regressions = []
+    for name, result in sorted(report["results"].items()):
+        previous = baseline["results"].get(name)
+        if previous is None or previous["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {previous['seconds']:.4f}s -> {result['seconds']:.4f}s "
+                f"({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def _each(
+    frames: Dict[int, pd.DataFrame], function: Callable[[pd.DataFrame], Any]
+) -> None:
+    for df in frames.values():
+        function(df)
+
+
+def _frame_loader(frames: Dict[int, pd.DataFrame]) -> OHLCVLoader:
+    """An OHLCVLoader over in-memory frames, standing in for the database."""
+
+    def load(security_id: int, start_date: date, end_date: date) -> pd.DataFrame:
+        df = frames[security_id]
+        return df[(df["candle_date"] >= start_date) & (df["candle_date"] <= end_date)]
+
+    return load
+
+
+def _compute_for_range(frames: Dict[int, pd.DataFrame], load: OHLCVLoader) -> None:
+    for security_id, df in frames.items():
+        compute_indicators_for_range_from(
+            load,
+            security_id=security_id,
+            start_date=df["candle_date"].iloc[min(TRADING_DAYS_REQUIRED, len(df) - 1)],
+            end_date=df["candle_date"].iloc[-1],
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--securities", type=int, default=500)
+    parser.add_argument("--years", type=float, default=10)
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=50,
+        help="securities timed through the per-security paths",
+    )
+    parser.add_argument("--shard-size", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    configure_logging(logger_name="bench-indicators", level=logging.INFO)
+
+    parameters = {
+        "securities": args.securities,
+        "years": args.years,
+        "sample": min(args.sample, args.securities),
+        "shard_size": args.shard_size,
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+    universe = synthetic_universe(args.securities, args.years, seed=args.seed)
+    Log.info(
+        f"Synthetic universe: {args.securities} securities, {len(universe)} candles"
+    )
+
+    report = build_report(
+        run_suite(universe, parameters["sample"], args.shard_size, args.repeat),
+        parameters,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["parameters"] != parameters:
+        Log.error(
+            f"Baseline was run with different parameters: {baseline['parameters']}"
+        )
+        return 2
+
+    regressions = find_regressions(report, baseline, args.threshold)
+    for regression in regressions:
+        Log.error(f"Regression beyond {args.threshold:.0%}: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Benchmark the single-pass rolling kernels (app.indicators.rolling) against the
+per-indicator functions in app/indicators and against per-window pandas rolling on a
+panel, for the rolling indicators they replace.
+
+    python -m app.benchmarks.rolling_kernels --securities 500 --bars 400
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from app.indicators.avg_volume import avg_volume
+from app.indicators.high_low import breakout_high_n, breakout_low_n
+from app.indicators.range_pct import range_pct
+from app.indicators.rolling import RollingWindows
+from app.indicators.rolling_volatility import rolling_volatility
+from app.indicators.sma import sma
+from app.utils.log_setup import configure_logging
+from app.utils.log_wrapper import Log
+
+SMA_WINDOWS = (20, 50, 200)
+VOLUME_WINDOWS = (5, 20, 50)
+
+
+def synthetic_prices(
+    n_securities: int, n_bars: int, seed: int = 0
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    close = 50 + np.abs(np.cumsum(rng.normal(0, 1, (n_bars, n_securities)), axis=0))
+    return {
+        "adjusted_close": close,
+        "close": close,
+        "high": close + rng.uniform(0, 2, (n_bars, n_securities)),
+        "low": close - rng.uniform(0, 2, (n_bars, n_securities)),
+        "volume": rng.integers(1, 5_000_000, (n_bars, n_securities)).astype("float64"),
+    }
+
+
+def per_security_functions(prices: Dict[str, np.ndarray]) -> None:
+    for column in range(prices["close"].shape[1]):
+        df = pd.DataFrame({name: values[:, column] for name, values in prices.items()})
+        for window in SMA_WINDOWS:
+            sma(df, lookback_days=window)
+        for window in VOLUME_WINDOWS:
+            avg_volume(df, lookback_days=window)
+        range_pct(df, lookback_days=20)
+        rolling_volatility(df, lookback_days=20)
+        breakout_high_n(df, lookback_days=10)
+        breakout_low_n(df, lookback_days=10)
+
+
+def panel_pandas_rolling(prices: Dict[str, np.ndarray]) -> None:
+    frames = {name: pd.DataFrame(values) for name, values in prices.items()}
+    for window in SMA_WINDOWS:
+        frames["adjusted_close"].rolling(window, min_periods=window).mean()
+    zero_volume = (frames["volume"] == 0).astype("float64")
+    for window in VOLUME_WINDOWS:
+        frames["volume"].rolling(window, min_periods=window).mean()
+        zero_volume.rolling(window, min_periods=window).sum()
+    close = frames["close"].rolling(20, min_periods=1)
+    for stat in ("max", "min", "mean", "std"):
+        getattr(close, stat)()
+    frames["high"].rolling(10, min_periods=10).max()
+    frames["low"].rolling(10, min_periods=10).min()
+
+
+def panel_rolling_windows(prices: Dict[str, np.ndarray]) -> None:
+    adjusted_close = RollingWindows(prices["adjusted_close"])
+    for window in SMA_WINDOWS:
+        adjusted_close.mean(window)
+    volume = RollingWindows(prices["volume"])
+    zero_volume = RollingWindows((prices["volume"] == 0).astype("float64"))
+    for window in VOLUME_WINDOWS:
+        volume.mean(window)
+        zero_volume.sum(window)
+    close = RollingWindows(prices["close"])
+    for stat in ("max", "min", "mean", "std"):
+        getattr(close, stat)(20, 1)
+    RollingWindows(prices["high"]).max(10)
+    RollingWindows(prices["low"]).min(10)
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--securities", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    configure_logging(logger_name="bench-rolling", level=logging.INFO)
+    prices = synthetic_prices(args.securities, args.bars)
+
+    results = {
+        "app/indicators functions, per security": best_of(
+            lambda: per_security_functions(prices), args.repeat
+        ),
+        "pandas rolling per window, panel": best_of(
+            lambda: panel_pandas_rolling(prices), args.repeat
+        ),
+        "RollingWindows, panel": best_of(
+            lambda: panel_rolling_windows(prices), args.repeat
+        ),
+    }
+
+    baseline = results["app/indicators functions, per security"]
+    Log.info(f"{args.securities} securities × {args.bars} bars, best of {args.repeat}")
+    for name, seconds in results.items():
+        Log.info(f"{name:<42} {seconds * 1000:>10.1f} ms  {baseline / seconds:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.handlers.ohlcv_daily import ARRAY_FIELDS, OHLCVArrays
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def synthetic_universe(
+    n_securities: int,
+    years: float,
+    seed: int = 0,
+    end: date = date(2024, 12, 31),
+    min_bars: Optional[int] = None,
+) -> OHLCVArrays:
+    """
+    Random-walk OHLCV for n_securities over business days ending at end, in the
+    layout OHLCVDailyHandler.load_arrays returns.
+
+    Every security ends on the same day. Each has between min_bars (default: half of
+    the span) and years of history, so the universe mixes long histories with recent
+    listings. Prices are rounded to cents and a few candles are flat or have zero
+    volume, as real data does.
+    """
+    rng = np.random.default_rng(seed)
+    n_bars = int(years * TRADING_DAYS_PER_YEAR)
+    min_bars = n_bars // 2 if min_bars is None else min(min_bars, n_bars)
+    calendar = pd.bdate_range(end=end, periods=n_bars).to_numpy(dtype="M8[D]")
+
+    lengths = rng.integers(min_bars, n_bars + 1, n_securities)
+    lengths[0] = n_bars
+    starts = np.cumsum(lengths) - lengths
+    security_index = np.repeat(np.arange(n_securities), lengths)
+
+    # Position of each candle in the shared calendar, right-aligned on the end date
+    positions = np.arange(len(security_index)) - np.repeat(starts, lengths)
+    calendar_rows = np.repeat(n_bars - lengths, lengths) + positions
+
+    # Log-price random walk restarted at each security's first candle
+    walk = np.cumsum(rng.normal(0, 0.01, len(security_index)))
+    walk -= np.repeat(walk[starts], lengths)
+    log_price = np.log(rng.uniform(5, 500, n_securities))[security_index]
+    close = np.round(np.exp(log_price + walk), 2)
+
+    spread = np.round(close * rng.uniform(0, 0.03, len(close)), 2)
+    high = close + spread
+    low = np.maximum(close - spread, 0.01)
+    high[::37] = low[::37] = close[::37]
+    volume = rng.integers(10_000, 10_000_000, len(close)).astype("float64")
+    volume[::211] = 0
+
+    fields = {
+        "open": np.round(close * (1 + rng.normal(0, 0.005, len(close))), 2),
+        "high": high,
+        "low": low,
+        "close": close,
+        "adjusted_close": close,
+        "volume": volume,
+    }
+
+    return OHLCVArrays(
+        security_ids=np.arange(1, n_securities + 1, dtype="int64"),
+        security_index=security_index.astype("int64"),
+        dates=calendar[calendar_rows],
+        fields={name: fields[name] for name in ARRAY_FIELDS},
+    )
+
+
+def security_frame(universe: OHLCVArrays, security_id: int) -> pd.DataFrame:
+    """One security's candles as the frame compute.py loads from the database."""
+    rows = universe.security_index == np.searchsorted(
+        universe.security_ids, security_id
+    )
+    frame = pd.DataFrame(
+        {
+            "security_id": security_id,
+            "candle_date": pd.to_datetime(universe.dates[rows]).date,
+        }
+    )
+    for name, values in universe.fields.items():
+        frame[name] = values[rows]
+    return frame
@@ -30,6 +30,20 @@ class Settings(BaseSettings):
     PORT: int = Field(default=8000)
     NUM_WORKERS: int = Field(default=0)
 
+    INDICATOR_WORKERS: int = Field(default=1)
+    INDICATOR_SHARD_SIZE: int = Field(default=250)
+    LAZY_INDICATORS: bool = Field(default=False)
+    # Advance persisted rolling state in the EOD run instead of reloading history
+    INCREMENTAL_INDICATORS: bool = Field(default=False)
+    ON_DEMAND_CACHE_MB: int = Field(default=256)
+    SIGNAL_WORKERS: int = Field(default=1)
+    # Poll strategy files for edits this often, 0 disables the watch
+    STRATEGY_RELOAD_SECONDS: float = Field(default=0)
+    # Age after which the screener reloads its snapshot of the latest trading day
+    SCREENER_REFRESH_SECONDS: float = Field(default=900)
+    # Distinct strategy configs whose compiled form is kept, least recently used first out
+    COMPILED_STRATEGY_CACHE_SIZE: int = Field(default=1024)
+
     API_VERSION: str = Field(default="0.1.0")
     IMAGE_TAG: str = Field(default="local-latest")
 
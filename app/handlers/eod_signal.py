@@ -3,13 +3,32 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date
 
+import pandas as pd
+
+from sqlalchemy import delete, exists, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session, select
 
 from app.core.db import upsert  # your existing helper
+from app.models.backtest_trade import BacktestTrade
 from app.models.eod_signal import EODSignal
 
 UNIQUE_CONSTRAINT = "uq_one_result_per_strategy_and_security"
 
+# Columns of a signal frame, see save_frame
+SIGNAL_FRAME_COLUMNS = [
+    "signal_date",
+    "strategy_name",
+    "strategy_id",
+    "security_id",
+    "ohlcv_daily_id",
+    "score",
+]
+SIGNAL_KEY_COLUMNS = ["signal_date", "strategy_name", "security_id"]
+
+# Rows per upsert statement, keeps bind parameters well under Postgres' 65535 limit
+UPSERT_CHUNK_SIZE = 1000
+
 
 @dataclass
 class EODSignalHandler:
@@ -19,13 +38,53 @@ class EODSignalHandler:
         if not rows:
             return
 
-        upsert(
-            model=EODSignal,
-            db_session=self.db_session,
-            data_iter=rows,
+        for chunk_start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            upsert(
+                model=EODSignal,
+                db_session=self.db_session,
+                data_iter=rows[chunk_start : chunk_start + UPSERT_CHUNK_SIZE],
+                constraint=UNIQUE_CONSTRAINT,
+                exclude_columns={"id", "created_at", "updated_at"},
+            )
+        self.db_session.flush()
+
+    def save_frame(self, df: pd.DataFrame) -> None:
+        """
+        Upsert a frame of signals (SIGNAL_FRAME_COLUMNS) without building models.
+        Rows repeating a (signal_date, strategy_name, security_id) key keep the first.
+
+        Like save_all, a regenerated signal resets its open validation. Nothing is
+        returned, so the statement has no RETURNING clause.
+        """
+        if df.empty:
+            return
+
+        df = df.drop_duplicates(subset=SIGNAL_KEY_COLUMNS, keep="first")
+        columns = {name: df[name].tolist() for name in SIGNAL_FRAME_COLUMNS}
+        params = [
+            {
+                **dict(zip(SIGNAL_FRAME_COLUMNS, row)),
+                "validated_at_open": None,
+                "next_open_price": None,
+                "validated_at_open_failures": [],
+            }
+            for row in zip(*columns.values())
+        ]
+
+        insert_statement = insert(EODSignal.__table__)  # type: ignore[attr-defined]
+        upsert_statement = insert_statement.on_conflict_do_update(
             constraint=UNIQUE_CONSTRAINT,
-            exclude_columns={"id", "created_at", "updated_at"},
+            set_={
+                **{
+                    name: insert_statement.excluded[name]
+                    for name in params[0]
+                    if name not in SIGNAL_KEY_COLUMNS
+                },
+                "updated_at": func.now(),
+            },
         )
+        # Executed as batched multi-row INSERTs by SQLAlchemy's insertmanyvalues
+        self.db_session.exec(upsert_statement, params=params)  # type: ignore[call-overload]
         self.db_session.flush()
 
     def get_unvalidated_by_date_and_strategy(
@@ -50,6 +109,40 @@ class EODSignalHandler:
 
         return self.db_session.exec(stmt).all()
 
+    def get_scores_for_strategy_and_date(
+        self, strategy_id: str, signal_date: date
+    ) -> pd.DataFrame:
+        """security_id, ohlcv_daily_id and score of a strategy's signals on a day."""
+        stmt = select(
+            EODSignal.security_id, EODSignal.ohlcv_daily_id, EODSignal.score
+        ).where(
+            EODSignal.strategy_id == strategy_id,
+            EODSignal.signal_date == signal_date,
+        )
+        return pd.DataFrame(
+            self.db_session.exec(stmt).all(),
+            columns=["security_id", "ohlcv_daily_id", "score"],
+        )
+
+    def delete_for_strategy_and_date_except(
+        self, strategy_id: str, signal_date: date, security_ids: list[int]
+    ) -> None:
+        """
+        Delete a strategy's signals on a day other than those of security_ids, such
+        as the ones a regenerated top N no longer holds. Signals a backtest traded
+        are kept.
+        """
+        stmt = delete(EODSignal).where(
+            EODSignal.strategy_id == strategy_id,  # type: ignore[arg-type]
+            EODSignal.signal_date == signal_date,  # type: ignore[arg-type]
+            EODSignal.security_id.notin_(security_ids),  # type: ignore[attr-defined]
+            ~exists().where(
+                BacktestTrade.eod_signal_id == EODSignal.id  # type: ignore[arg-type]
+            ),
+        )
+        self.db_session.exec(stmt)  # type: ignore[call-overload]
+        self.db_session.flush()
+
     def get_all_strategy_between_dates(
         self, start_date: date, end_date: date
     ) -> list[EODSignal]:
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List
+
+from sqlalchemy import and_, delete, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.models.indicator_invalidation import IndicatorInvalidation
+
+
+@dataclass
+class IndicatorInvalidationHandler:
+    db_session: Session
+
+    def record(self, changes: Dict[int, date]) -> None:
+        """
+        Mark {security_id: earliest changed candle date} as stale, keeping the earlier
+        date when a security is already pending.
+        """
+        if not changes:
+            return
+
+        table = IndicatorInvalidation.__table__  # type: ignore[attr-defined]
+        insert_statement = insert(table).values(
+            [
+                {"security_id": security_id, "earliest_changed_date": changed_date}
+                for security_id, changed_date in changes.items()
+            ]
+        )
+        self.db_session.exec(
+            insert_statement.on_conflict_do_update(  # type: ignore[call-overload]
+                index_elements=["security_id"],
+                set_={
+                    "earliest_changed_date": func.least(
+                        table.c.earliest_changed_date,
+                        insert_statement.excluded.earliest_changed_date,
+                    ),
+                    "updated_at": func.now(),
+                },
+            )
+        )
+        self.db_session.flush()
+
+    def get_all(self) -> List[IndicatorInvalidation]:
+        stmt = select(IndicatorInvalidation).order_by(
+            IndicatorInvalidation.earliest_changed_date  # type: ignore[arg-type]
+        )
+        return list(self.db_session.exec(stmt))
+
+    def clear(self, invalidations: List[IndicatorInvalidation]) -> None:
+        """
+        Delete invalidations once recomputed. A row recorded again since it was read
+        has a newer updated_at and is kept for the next run.
+        """
+        if not invalidations:
+            return
+
+        stmt = delete(IndicatorInvalidation).where(
+            or_(
+                *(
+                    and_(
+                        IndicatorInvalidation.security_id == i.security_id,  # type: ignore[arg-type]
+                        IndicatorInvalidation.updated_at == i.updated_at,  # type: ignore[arg-type]
+                    )
+                    for i in invalidations
+                )
+            )
+        )
+        self.db_session.exec(stmt)  # type: ignore[call-overload]
+        self.db_session.flush()
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.core.db import upsert
+from app.models.indicator_state import IndicatorState
+
+
+@dataclass
+class IndicatorStateHandler:
+    db_session: Session
+
+    def save_all(self, states: List[IndicatorState]) -> None:
+        if not states:
+            return
+
+        upsert(
+            model=IndicatorState,
+            db_session=self.db_session,
+            index_elements=["security_id"],
+            data_iter=states,
+            exclude_columns={"created_at"},
+        )
+        self.db_session.flush()
+
+    def get_all_by_security_id(self) -> Dict[int, IndicatorState]:
+        stmt = select(IndicatorState)
+        return {state.security_id: state for state in self.db_session.exec(stmt)}
+
+    def delete_for_securities(self, security_ids: List[int]) -> None:
+        if not security_ids:
+            return
+
+        stmt = delete(IndicatorState).where(
+            IndicatorState.security_id.in_(security_ids)  # type: ignore[attr-defined]
+        )
+        self.db_session.exec(stmt)  # type: ignore[call-overload]
+        self.db_session.flush()
@@ -1,31 +1,124 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import (
+    Date,
+    Float,
+    Integer,
+    and_,
+    cast,
+    column,
+    func,
+    literal_column,
+    or_,
+    values as values_clause,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session, select
 
-from app.core.db import upsert
+from app.handlers.indicator_invalidation import IndicatorInvalidationHandler
 from app.models.ohlcv_daily import OHLCVDaily, OHLCVDailyCreate
 
+ARRAY_FIELDS = ("open", "high", "low", "close", "adjusted_close", "volume")
+
+# Rows materialized per round trip of the server-side cursor
+OHLCV_FETCH_SIZE = 50_000
+
+
+@dataclass
+class OHLCVArrays:
+    """
+    Candles of many securities as contiguous columns, one entry per candle, ordered by
+    security then candle date. security_index points into security_ids.
+    """
+
+    security_ids: np.ndarray  # (securities,) int64, sorted
+    security_index: np.ndarray  # (candles,) int64
+    dates: np.ndarray  # (candles,) datetime64[D]
+    fields: Dict[str, np.ndarray]  # ARRAY_FIELDS -> (candles,) float64
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long frame with security_id, candle_date and ARRAY_FIELDS columns."""
+        if not len(self):
+            return pd.DataFrame()
+        frame = pd.DataFrame(
+            {
+                "security_id": self.security_ids[self.security_index],
+                "candle_date": pd.to_datetime(self.dates).date,
+            }
+        )
+        for name, values in self.fields.items():
+            frame[name] = values
+        return frame
+
 
 @dataclass
 class OHLCVDailyHandler:
     db_session: Session
 
     def save_all(self, new_candles: List[OHLCVDailyCreate]) -> None:
+        """
+        Upsert candles, leaving identical ones untouched. Candles inserted before a
+        security's latest candle, or whose values were corrected, are recorded as
+        indicator invalidations for recompute_invalidated_indicators.
+        """
         if not new_candles:
             return
 
-        upsert(
-            model=OHLCVDaily,
-            db_session=self.db_session,
-            exclude_columns={"id", "created_at"},
-            data_iter=new_candles,
+        latest = self.get_latest_candle_dates(
+            sorted({candle.security_id for candle in new_candles})
+        )
+
+        table = OHLCVDaily.__table__  # type: ignore[attr-defined]
+        insert_statement = insert(table).values(
+            [
+                candle.model_dump(exclude={"id", "created_at", "updated_at"})
+                for candle in new_candles
+            ]
+        )
+        excluded = insert_statement.excluded
+        upsert_statement = insert_statement.on_conflict_do_update(
             constraint="uq_ohlcv_daily_date_security",
+            set_={
+                **{field: excluded[field] for field in ARRAY_FIELDS},
+                "updated_at": func.now(),
+            },
+            where=or_(
+                *(
+                    table.c[field].is_distinct_from(excluded[field])
+                    for field in ARRAY_FIELDS
+                )
+            ),
+        ).returning(
+            table.c.security_id,
+            table.c.candle_date,
+            # xmax is zero on a freshly inserted row version, set on an updated one
+            literal_column("xmax = 0").label("inserted"),
+        )
+        written = self.db_session.exec(upsert_statement).fetchall()  # type: ignore[call-overload]
+
+        IndicatorInvalidationHandler(self.db_session).record(
+            mid_history_changes(written, latest)
         )
         self.db_session.flush()
 
+    def get_latest_candle_dates(self, security_ids: List[int]) -> Dict[int, date]:
+        stmt = (
+            select(OHLCVDaily.security_id, func.max(OHLCVDaily.candle_date))
+            .where(
+                OHLCVDaily.security_id.in_(security_ids),  # type: ignore[attr-defined]
+            )
+            .group_by(OHLCVDaily.security_id)  # type: ignore[arg-type]
+        )
+        return {row[0]: row[1] for row in self.db_session.exec(stmt)}
+
     def get_latest_candle_date(self, security_id: int) -> Optional[date]:
         stmt = select(func.max(OHLCVDaily.candle_date)).where(
             OHLCVDaily.security_id == security_id
@@ -54,6 +147,113 @@ class OHLCVDailyHandler:
         )
         return self.db_session.exec(stmt).all()
 
+    def get_period_for_securities(
+        self, start: date, end: date, security_ids: List[int]
+    ) -> List[OHLCVDaily]:
+        stmt = (
+            select(OHLCVDaily)
+            .where(
+                OHLCVDaily.security_id.in_(security_ids),  # type: ignore[attr-defined]
+                OHLCVDaily.candle_date >= start,
+                OHLCVDaily.candle_date <= end,
+            )
+            .order_by(OHLCVDaily.security_id, OHLCVDaily.candle_date)  # type: ignore[arg-type]
+        )
+        return list(self.db_session.exec(stmt).all())
+
+    def load_arrays(
+        self,
+        start: date,
+        end: date,
+        security_ids: List[int],
+        fetch_size: int = OHLCV_FETCH_SIZE,
+    ) -> OHLCVArrays:
+        """
+        Load the candles of many securities in one query without building ORM objects.
+
+        Prices are cast to double precision in SQL, so no Decimal is created, and rows
+        are streamed through a server-side cursor fetch_size at a time, each batch
+        packed into arrays before the next is fetched. Memory on full-history loads is
+        bounded by the arrays themselves rather than by row objects.
+        """
+        stmt = (
+            select(  # type: ignore[call-overload]
+                OHLCVDaily.security_id,
+                OHLCVDaily.candle_date,
+                *(cast(getattr(OHLCVDaily, name), Float) for name in ARRAY_FIELDS),
+            )
+            .where(
+                OHLCVDaily.security_id.in_(security_ids),  # type: ignore[attr-defined]
+                OHLCVDaily.candle_date >= start,
+                OHLCVDaily.candle_date <= end,
+            )
+            .order_by(OHLCVDaily.security_id, OHLCVDaily.candle_date)
+        )
+        result = self.db_session.connection().execute(
+            stmt, execution_options={"stream_results": True, "yield_per": fetch_size}
+        )
+        return ohlcv_rows_to_arrays(result.partitions())
+
+    def load_window_arrays(
+        self,
+        windows: List[Tuple[int, date, date]],
+        fetch_size: int = OHLCV_FETCH_SIZE,
+    ) -> OHLCVArrays:
+        """
+        Like load_arrays, but each (security_id, start, end) window is loaded on its
+        own, so disjoint windows of one or many securities cost only their candles.
+        The result is keyed by window position instead of security id: its
+        security_ids are indexes into windows.
+        """
+        window_table = values_clause(
+            column("window_id", Integer),
+            column("security_id", Integer),
+            column("start_date", Date),
+            column("end_date", Date),
+            name="ohlcv_window",
+        ).data([(i, *window) for i, window in enumerate(windows)])
+
+        stmt = (
+            select(  # type: ignore[call-overload]
+                window_table.c.window_id,
+                OHLCVDaily.candle_date,
+                *(cast(getattr(OHLCVDaily, name), Float) for name in ARRAY_FIELDS),
+            )
+            .join(
+                window_table,
+                and_(
+                    OHLCVDaily.security_id == window_table.c.security_id,  # type: ignore[arg-type]
+                    OHLCVDaily.candle_date >= window_table.c.start_date,
+                    OHLCVDaily.candle_date <= window_table.c.end_date,
+                ),
+            )
+            .order_by(window_table.c.window_id, OHLCVDaily.candle_date)
+        )
+        result = self.db_session.connection().execute(
+            stmt, execution_options={"stream_results": True, "yield_per": fetch_size}
+        )
+        return ohlcv_rows_to_arrays(result.partitions())
+
+    def get_data_versions(self, security_ids: List[int]) -> Dict[int, Tuple]:
+        """
+        A value per security that changes whenever any of its candles is added,
+        removed or corrected: candle count, last date and the latest updated_at,
+        which save_all bumps on every insert and on every changed OHLCV field.
+        """
+        stmt = (
+            select(  # type: ignore[call-overload]
+                OHLCVDaily.security_id,
+                func.count(),
+                func.max(OHLCVDaily.candle_date),
+                func.max(OHLCVDaily.updated_at),
+            )
+            .where(
+                OHLCVDaily.security_id.in_(security_ids),  # type: ignore[attr-defined]
+            )
+            .group_by(OHLCVDaily.security_id)  # type: ignore[arg-type]
+        )
+        return {row[0]: tuple(row[1:]) for row in self.db_session.exec(stmt)}
+
     def get_dates_for_security(self, security_id: int) -> set[date]:
         stmt = (
             select(OHLCVDaily.candle_date)
@@ -71,3 +271,56 @@ class OHLCVDailyHandler:
             OHLCVDaily.candle_date == candle_date,
         )
         return self.db_session.exec(stmt).first()
+
+
+def ohlcv_rows_to_arrays(batches: Iterable[Sequence[Sequence]]) -> OHLCVArrays:
+    """
+    Pack batches of (security_id, candle_date, *ARRAY_FIELDS) rows into OHLCVArrays.
+    NULL prices become NaN.
+    """
+    ids, dates = [], []
+    fields: Dict[str, list] = {name: [] for name in ARRAY_FIELDS}
+
+    for batch in batches:
+        if not batch:
+            continue
+        columns = list(zip(*batch))
+        ids.append(np.asarray(columns[0], dtype="int64"))
+        dates.append(np.asarray(columns[1], dtype="M8[D]"))
+        for name, values in zip(ARRAY_FIELDS, columns[2:]):
+            fields[name].append(np.asarray(values, dtype="float64"))
+
+    if not ids:
+        return OHLCVArrays(
+            security_ids=np.empty(0, dtype="int64"),
+            security_index=np.empty(0, dtype="int64"),
+            dates=np.empty(0, dtype="M8[D]"),
+            fields={name: np.empty(0) for name in ARRAY_FIELDS},
+        )
+
+    security_ids, security_index = np.unique(np.concatenate(ids), return_inverse=True)
+    return OHLCVArrays(
+        security_ids=security_ids,
+        security_index=security_index.astype("int64"),
+        dates=np.concatenate(dates),
+        fields={name: np.concatenate(values) for name, values in fields.items()},
+    )
+
+
+def mid_history_changes(
+    written: Iterable[Sequence], latest: Dict[int, date]
+) -> Dict[int, date]:
+    """
+    Earliest changed candle date per security among written (security_id,
+    candle_date, inserted) rows, counting corrections and candles inserted before
+    the security's previously latest candle. Appending after it changes no existing
+    indicator, so new candles at the end of history are not changes.
+    """
+    changes: Dict[int, date] = {}
+    for security_id, candle_date, inserted in written:
+        previous_latest = latest.get(security_id)
+        if inserted and (previous_latest is None or candle_date > previous_latest):
+            continue
+        if candle_date < changes.get(security_id, date.max):
+            changes[security_id] = candle_date
+    return changes
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from app.models.signal_input import SignalInput
+
+# Rows per insert statement, keeps bind parameters well under Postgres' 65535 limit
+INSERT_CHUNK_SIZE = 1000
+
+# Days of row hashes kept before the latest signal date; older days are not rerun
+RETENTION_DAYS = 14
+
+
+@dataclass
+class SignalInputHandler:
+    db_session: Session
+
+    def get_hashes(self, signal_date: date) -> Dict[int, str]:
+        stmt = select(SignalInput.security_id, SignalInput.row_hash).where(
+            SignalInput.signal_date == signal_date
+        )
+        return {
+            security_id: row_hash
+            for security_id, row_hash in self.db_session.exec(stmt)
+        }
+
+    def replace(self, signal_date: date, hashes: Dict[int, str]) -> None:
+        """
+        Store hashes ({security_id: row_hash}) as signal_date's inputs, and drop the
+        hashes of days more than RETENTION_DAYS before it.
+        """
+        self.db_session.exec(  # type: ignore[call-overload]
+            delete(SignalInput).where(
+                (SignalInput.signal_date == signal_date)  # type: ignore[arg-type]
+                | (
+                    SignalInput.signal_date
+                    < signal_date - timedelta(days=RETENTION_DAYS)
+                )
+            )
+        )
+
+        rows = [
+            {
+                "signal_date": signal_date,
+                "security_id": security_id,
+                "row_hash": row_hash,
+            }
+            for security_id, row_hash in sorted(hashes.items())
+        ]
+        for chunk_start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            self.db_session.exec(  # type: ignore[call-overload]
+                insert(SignalInput).values(
+                    rows[chunk_start : chunk_start + INSERT_CHUNK_SIZE]
+                )
+            )
+        self.db_session.flush()
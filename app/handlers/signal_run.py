@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.models.signal_run import SignalRun
+
+
+@dataclass
+class SignalRunHandler:
+    db_session: Session
+
+    def get_for_date(self, signal_date: date) -> Dict[str, SignalRun]:
+        """Last run of each strategy for signal_date, by strategy_id."""
+        stmt = select(SignalRun).where(SignalRun.signal_date == signal_date)
+        return {run.strategy_id: run for run in self.db_session.exec(stmt)}
+
+    def record(
+        self, signal_date: date, config_hashes: Dict[str, str], data_version: str
+    ) -> None:
+        """Record that strategies ({strategy_id: config_hash}) ran on data_version."""
+        if not config_hashes:
+            return
+
+        insert_statement = insert(SignalRun.__table__).values(  # type: ignore[attr-defined]
+            [
+                {
+                    "strategy_id": strategy_id,
+                    "signal_date": signal_date,
+                    "config_hash": config_hash,
+                    "data_version": data_version,
+                }
+                for strategy_id, config_hash in config_hashes.items()
+            ]
+        )
+        self.db_session.exec(
+            insert_statement.on_conflict_do_update(  # type: ignore[call-overload]
+                index_elements=["strategy_id", "signal_date"],
+                set_={
+                    "config_hash": insert_statement.excluded.config_hash,
+                    "data_version": insert_statement.excluded.data_version,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+        self.db_session.flush()
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Set
 
+from sqlalchemy import delete
 from sqlmodel import Session, select
 
 from app.models.stock_index_constituent import (
@@ -9,6 +10,12 @@ from app.models.stock_index_constituent import (
     StockIndexConstituent,
     StockIndexConstituentCreate,
 )
+from app.models.stock_index_constituent_delta import (
+    ConstituentChange,
+    StockIndexConstituentDelta,
+    StockIndexConstituentDeltaCreate,
+    replay_deltas,
+)
 from app.models.stock_index_snapshot import StockIndexSnapshot
 
 
@@ -57,13 +64,26 @@ class StockIndexConstituentHandler:
         self.db_session.add_all(ics)
         self.db_session.flush()
 
+    def save_deltas(
+        self, snapshot: StockIndexSnapshot, added: Set[int], removed: Set[int]
+    ) -> None:
+        deltas = _map_delta_objects(snapshot.index_name, snapshot.id, added, removed)
+        rows = [StockIndexConstituentDelta.model_validate(d) for d in deltas]
+        self.db_session.add_all(rows)
+        self.db_session.flush()
+
     def save_snapshot(
-        self, index_name: str, snapshot_hash: str, snapshot_date: date
+        self,
+        index_name: str,
+        snapshot_hash: str,
+        snapshot_date: date,
+        is_delta: bool = False,
     ) -> StockIndexSnapshot:
         snapshot = StockIndexSnapshot(
             index_name=index_name,
             snapshot_hash=snapshot_hash,
             snapshot_date=snapshot_date,
+            is_delta=is_delta,
         )
         self.db_session.add(snapshot)
         self.db_session.flush()
@@ -82,3 +102,112 @@ class StockIndexConstituentHandler:
             .limit(1)
         )
         return self.db_session.exec(stmt).first()
+
+    def get_snapshots_ordered(self, index_name: str) -> List[StockIndexSnapshot]:
+        stmt = (
+            select(StockIndexSnapshot)
+            .where(StockIndexSnapshot.index_name == index_name)
+            .order_by(StockIndexSnapshot.snapshot_date.asc())  # type: ignore[attr-defined]
+        )
+        return list(self.db_session.exec(stmt))
+
+    def get_membership_as_of(self, as_of: date, index_name: str = SP500) -> Set[int]:
+        """
+        Security ids in the index as of a date: the latest materialized snapshot on or
+        before `as_of`, with every later delta up to `as_of` replayed on top of it.
+        """
+        base_stmt = (
+            select(StockIndexSnapshot)
+            .where(
+                StockIndexSnapshot.index_name == index_name,
+                StockIndexSnapshot.snapshot_date <= as_of,
+                StockIndexSnapshot.is_delta == False,  # noqa
+            )
+            .order_by(StockIndexSnapshot.snapshot_date.desc())  # type: ignore[attr-defined]
+            .limit(1)
+        )
+        base_snapshot = self.db_session.exec(base_stmt).first()
+        if base_snapshot is None or base_snapshot.id is None:
+            return set()
+
+        base_members = {
+            ic.security_id for ic in self.get_by_snapshot_id(base_snapshot.id)
+        }
+
+        delta_stmt = (
+            select(
+                StockIndexConstituentDelta.security_id,
+                StockIndexConstituentDelta.change,
+            )
+            .join(
+                StockIndexSnapshot,
+                StockIndexSnapshot.id == StockIndexConstituentDelta.snapshot_id,  # type: ignore[arg-type]
+            )
+            .where(
+                StockIndexSnapshot.index_name == index_name,
+                StockIndexSnapshot.snapshot_date > base_snapshot.snapshot_date,
+                StockIndexSnapshot.snapshot_date <= as_of,
+                StockIndexSnapshot.is_delta == True,  # noqa
+            )
+            .order_by(StockIndexSnapshot.snapshot_date.asc())  # type: ignore[attr-defined]
+        )
+        deltas = [
+            (security_id, ConstituentChange(change))
+            for security_id, change in self.db_session.exec(delta_stmt)
+        ]
+        return replay_deltas(base_members, deltas)
+
+    def materialize_snapshot(
+        self, snapshot: StockIndexSnapshot, members: Set[int]
+    ) -> None:
+        """Replace a delta snapshot's adds/removes with its full constituent set."""
+        self.db_session.exec(  # type: ignore[call-overload]
+            delete(StockIndexConstituentDelta).where(
+                StockIndexConstituentDelta.snapshot_id == snapshot.id  # type: ignore[arg-type]
+            )
+        )
+        self.save_all(
+            [
+                StockIndexConstituentCreate(
+                    index_name=snapshot.index_name,
+                    snapshot_id=snapshot.id,
+                    security_id=security_id,
+                )
+                for security_id in sorted(members)
+            ]
+        )
+        snapshot.is_delta = False
+        self.db_session.add(snapshot)
+        self.db_session.flush()
+
+    def convert_to_delta(
+        self, snapshot: StockIndexSnapshot, added: Set[int], removed: Set[int]
+    ) -> None:
+        """Replace a materialized snapshot's constituent rows with adds/removes."""
+        self.db_session.exec(  # type: ignore[call-overload]
+            delete(StockIndexConstituent).where(
+                StockIndexConstituent.snapshot_id == snapshot.id  # type: ignore[arg-type]
+            )
+        )
+        self.save_deltas(snapshot, added, removed)
+        snapshot.is_delta = True
+        self.db_session.add(snapshot)
+        self.db_session.flush()
+
+
+def _map_delta_objects(
+    index_name: str, snapshot_id: Optional[int], added: Set[int], removed: Set[int]
+) -> List[StockIndexConstituentDeltaCreate]:
+    return [
+        StockIndexConstituentDeltaCreate(
+            index_name=index_name,
+            snapshot_id=snapshot_id,  # type: ignore[arg-type]
+            security_id=security_id,
+            change=change,
+        )
+        for change, security_ids in (
+            (ConstituentChange.ADD, added),
+            (ConstituentChange.REMOVE, removed),
+        )
+        for security_id in sorted(security_ids)
+    ]
@@ -1,12 +1,44 @@
+from contextlib import closing
 from dataclasses import dataclass
 from datetime import date
-from typing import Any, Dict, List, Optional
+from io import StringIO
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import pandas as pd
+
+from sqlalchemy import (
+    Float,
+    String,
+    cast,
+    column,
+    func,
+    literal,
+    null,
+    table,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert
 from sqlmodel import Session, select
 
 from app.core.db import upsert
+from app.indicators.cross_sectional import CROSS_SECTIONAL_INPUTS
 from app.models.ohlcv_daily import OHLCVDaily
-from app.models.technical_indicator import CombinedSignalRow, TechnicalIndicator
+from app.models.security import Security
+from app.models.technical_indicator import (
+    CROSS_SECTIONAL_COLUMNS,
+    CombinedSignalRow,
+    TechnicalIndicator,
+)
+
+# Rows per upsert statement, keeps bind parameters well under Postgres' 65535 limit
+UPSERT_CHUNK_SIZE = 1000
+
+# Session-local temp table that save_frame COPYs into before merging
+STAGING_TABLE = "technical_indicator_staging"
+KEY_COLUMNS = ["security_id", "measurement_date"]
+
+# OHLCV prices of CombinedSignalRow, read as floats
+COMBINED_PRICE_COLUMNS = ("open", "high", "low", "close")
 
 
 @dataclass
@@ -19,22 +51,193 @@ class TechnicalIndicatorHandler:
         return [
             c.name
             for c in TechnicalIndicator.__table__.columns
-            if c.name not in {"security_id", "measurement_date"}
+            if c.name not in {"security_id", "measurement_date", "missing_columns"}
         ]
 
-    def save_all(self, technical_indicators: List[TechnicalIndicator]) -> None:
+    def save_all(
+        self,
+        technical_indicators: List[TechnicalIndicator],
+        columns: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Upsert indicator rows. With columns, only those indicator columns are written:
+        new rows record the others in missing_columns, existing rows keep their other
+        values and drop the written columns from missing_columns. Cross-sectional
+        columns are never touched; see save_cross_sectional.
+        """
         if not technical_indicators:
             return
 
-        upsert(
-            model=TechnicalIndicator,
-            db_session=self.db_session,
-            index_elements=["security_id", "measurement_date"],
-            data_iter=technical_indicators,
-            exclude_columns={"created_at"},
+        for chunk_start in range(0, len(technical_indicators), UPSERT_CHUNK_SIZE):
+            chunk = technical_indicators[chunk_start : chunk_start + UPSERT_CHUNK_SIZE]
+            if columns is None:
+                upsert(
+                    model=TechnicalIndicator,
+                    db_session=self.db_session,
+                    index_elements=["security_id", "measurement_date"],
+                    data_iter=chunk,
+                    exclude_columns={"created_at", *CROSS_SECTIONAL_COLUMNS},
+                )
+            else:
+                self._upsert_columns(chunk, columns)
+        self.db_session.flush()
+
+    def save_frame(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> None:
+        """
+        Bulk upsert an indicator DataFrame (security_id, measurement_date and indicator
+        columns) without building models: the frame is serialized columnwise to CSV,
+        COPYed into a temp staging table and merged with one INSERT ... SELECT ...
+        ON CONFLICT. NaN becomes NULL. columns behaves as in save_all.
+        """
+        if df.empty:
+            return
+
+        indicator_columns = columns if columns is not None else self._value_columns()
+        copy_columns = KEY_COLUMNS + indicator_columns
+
+        connection = self.db_session.connection()
+        connection.exec_driver_sql(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+            f"(LIKE {TechnicalIndicator.__tablename__}) ON COMMIT DELETE ROWS"
+        )
+        connection.exec_driver_sql(f"TRUNCATE {STAGING_TABLE}")
+
+        with closing(connection.connection.cursor()) as cursor:
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({', '.join(copy_columns)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                indicator_frame_to_csv(df, copy_columns),
+            )
+
+        staging = table(STAGING_TABLE, *(column(c) for c in copy_columns))
+        missing_value = (
+            null()
+            if columns is None
+            else literal(self._skipped_columns(columns), ARRAY(String))
+        )
+        insert_statement = insert(TechnicalIndicator.__table__).from_select(  # type: ignore[attr-defined]
+            copy_columns + ["missing_columns"],
+            select(*(staging.c[c] for c in copy_columns), missing_value),  # type: ignore[call-overload]
+        )
+
+        updated_params: Dict[str, Any] = {
+            c: insert_statement.excluded[c] for c in indicator_columns
+        }
+        updated_params["updated_at"] = func.now()
+        updated_params["missing_columns"] = (
+            null() if columns is None else self._missing_columns_after_write(columns)
+        )
+
+        self.db_session.exec(  # type: ignore[call-overload]
+            insert_statement.on_conflict_do_update(
+                index_elements=KEY_COLUMNS, set_=updated_params
+            )
         )
         self.db_session.flush()
 
+    def save_cross_sectional(self, df: pd.DataFrame) -> None:
+        """
+        Write the CROSS_SECTIONAL_COLUMNS of df onto existing indicator rows, leaving
+        the per-security columns as they are.
+        """
+        self.save_frame(df, columns=CROSS_SECTIONAL_COLUMNS)
+
+    def get_cross_sectional_inputs(self, start: date, end: date) -> pd.DataFrame:
+        """
+        CROSS_SECTIONAL_INPUTS of every security with indicators and a candle in
+        [start, end], in a single query.
+        """
+        stmt = (
+            select(  # type: ignore[call-overload]
+                TechnicalIndicator.security_id,
+                TechnicalIndicator.measurement_date,
+                Security.gics_sector,
+                TechnicalIndicator.rsi_14,
+                TechnicalIndicator.percent_change,
+                OHLCVDaily.volume,
+                TechnicalIndicator.avg_vol_20d,
+            )
+            .join(
+                OHLCVDaily,
+                (OHLCVDaily.security_id == TechnicalIndicator.security_id)
+                & (OHLCVDaily.candle_date == TechnicalIndicator.measurement_date),
+            )
+            .join(Security, Security.id == TechnicalIndicator.security_id)
+            .where(
+                TechnicalIndicator.measurement_date >= start,
+                TechnicalIndicator.measurement_date <= end,
+            )
+        )
+        rows = self.db_session.exec(stmt).all()
+        return pd.DataFrame(rows, columns=CROSS_SECTIONAL_INPUTS).astype(
+            {
+                c: "float64"
+                for c in ["rsi_14", "percent_change", "volume", "avg_vol_20d"]
+            }
+        )
+
+    def _value_columns(self) -> List[str]:
+        # Per-security indicator columns; cross-sectional ones are written separately
+        return [
+            c
+            for c in self.get_indicator_columns()
+            if c not in {"created_at", "updated_at", *CROSS_SECTIONAL_COLUMNS}
+        ]
+
+    def _skipped_columns(self, columns: List[str]) -> List[str]:
+        return [c for c in self._value_columns() if c not in columns]
+
+    @staticmethod
+    def _missing_columns_after_write(columns: List[str]) -> Any:
+        # Existing rows stay partial only in the columns this write did not cover
+        missing_columns = TechnicalIndicator.__table__.c.missing_columns  # type: ignore[attr-defined]
+        for written in columns:
+            missing_columns = func.array_remove(missing_columns, written)
+        return missing_columns
+
+    def _upsert_columns(
+        self, technical_indicators: List[TechnicalIndicator], columns: List[str]
+    ) -> None:
+        skipped = self._skipped_columns(columns)
+        data = [
+            {
+                **row.model_dump(
+                    include={"security_id", "measurement_date", "updated_at", *columns}
+                ),
+                "missing_columns": skipped,
+            }
+            for row in technical_indicators
+        ]
+
+        insert_statement = insert(TechnicalIndicator.__table__).values(data)  # type: ignore[attr-defined]
+
+        updated_params = {c: insert_statement.excluded[c] for c in columns}
+        updated_params["updated_at"] = insert_statement.excluded.updated_at
+        updated_params["missing_columns"] = self._missing_columns_after_write(columns)
+
+        self.db_session.exec(  # type: ignore[call-overload]
+            insert_statement.on_conflict_do_update(
+                index_elements=["security_id", "measurement_date"],
+                set_=updated_params,
+            )
+        )
+
+    def get_rows_missing_columns(
+        self, security_ids: List[int], start: date, end: date, columns: List[str]
+    ) -> List[Tuple[int, date, List[str]]]:
+        """(security_id, measurement_date, missing_columns) of rows lacking any of columns."""
+        stmt = select(  # type: ignore[call-overload]
+            TechnicalIndicator.security_id,
+            TechnicalIndicator.measurement_date,
+            TechnicalIndicator.missing_columns,
+        ).where(
+            TechnicalIndicator.security_id.in_(security_ids),  # type: ignore[attr-defined]
+            TechnicalIndicator.measurement_date >= start,
+            TechnicalIndicator.measurement_date <= end,
+            TechnicalIndicator.missing_columns.overlap(array(columns)),  # type: ignore[union-attr]
+        )
+        return [tuple(row) for row in self.db_session.exec(stmt)]
+
     def get_dates_with_indicators_for_security(self, security_id: int) -> set[date]:
         stmt = (
             select(TechnicalIndicator.measurement_date)
@@ -44,6 +247,26 @@ class TechnicalIndicatorHandler:
         result = self.db_session.exec(stmt)
         return {row for row in result if row is not None}
 
+    def get_dates_with_indicators_between(
+        self, start: date, end: date
+    ) -> Dict[int, set[date]]:
+        """Indicator dates per security within [start, end], in a single query."""
+        stmt = select(  # type: ignore[call-overload]
+            TechnicalIndicator.security_id, TechnicalIndicator.measurement_date
+        ).where(
+            TechnicalIndicator.measurement_date >= start,
+            TechnicalIndicator.measurement_date <= end,
+        )
+        dates: Dict[int, set[date]] = {}
+        for security_id, measurement_date in self.db_session.exec(stmt):
+            dates.setdefault(security_id, set()).add(measurement_date)
+        return dates
+
+    def get_latest_measurement_date(self) -> Optional[date]:
+        stmt = select(func.max(TechnicalIndicator.measurement_date))
+        result = self.db_session.exec(stmt).one_or_none()
+        return result if result else None
+
     def get_by_date_and_security_ids(
         self, measurement_date: date, security_ids: List[int]
     ) -> List[TechnicalIndicator]:
@@ -86,6 +309,80 @@ class TechnicalIndicatorHandler:
             for ohlcv, ti in results
         ]
 
+    def get_combined_frame_between_dates(
+        self,
+        start: date,
+        end: date,
+        columns: Iterable[str],
+        security_ids: Optional[List[int]] = None,
+    ) -> pd.DataFrame:
+        """
+        The rows get_combined_data_by_date_and_security_ids returns, for every
+        security (or only security_ids) and date in [start, end] in one query, as a
+        DataFrame with security_id, measurement_date, ohlcv_daily_id and the
+        requested OHLCV and indicator columns. Requested columns that are not stored
+        are left out.
+        """
+        indicator_columns = set(self.get_indicator_columns())
+        selected: List[Any] = [
+            TechnicalIndicator.security_id,
+            TechnicalIndicator.measurement_date,
+            OHLCVDaily.id.label("ohlcv_daily_id"),  # type: ignore[attr-defined]
+        ]
+        for name in sorted(set(columns)):
+            if name in COMBINED_PRICE_COLUMNS:
+                selected.append(cast(getattr(OHLCVDaily, name), Float).label(name))
+            elif name == "volume":
+                selected.append(OHLCVDaily.volume)
+            elif name in indicator_columns:
+                selected.append(getattr(TechnicalIndicator, name))
+
+        stmt = (
+            select(*selected)
+            .where(
+                OHLCVDaily.security_id == TechnicalIndicator.security_id,
+                OHLCVDaily.candle_date == TechnicalIndicator.measurement_date,
+                TechnicalIndicator.measurement_date >= start,
+                TechnicalIndicator.measurement_date <= end,
+            )
+            .order_by(
+                TechnicalIndicator.measurement_date, TechnicalIndicator.security_id
+            )
+        )
+        if security_ids is not None:
+            stmt = stmt.where(
+                TechnicalIndicator.security_id.in_(security_ids)  # type: ignore[attr-defined]
+            )
+        result = self.db_session.exec(stmt)  # type: ignore[call-overload]
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+    def get_input_hashes(self, measurement_date: date) -> Dict[int, str]:
+        """
+        An md5 per security of its combined OHLCV and indicator row on
+        measurement_date, over every value a strategy can read. It changes whenever
+        the candle or any stored indicator of that row does; timestamps are left out,
+        so rewriting the same values does not change it.
+        """
+        values = [
+            OHLCVDaily.id,
+            *(getattr(OHLCVDaily, name) for name in COMBINED_PRICE_COLUMNS),
+            OHLCVDaily.volume,
+            *(
+                getattr(TechnicalIndicator, name)
+                for name in self.get_indicator_columns()
+                if name not in {"created_at", "updated_at"}
+            ),
+        ]
+        stmt = select(
+            TechnicalIndicator.security_id,
+            func.md5(cast(tuple_(*values), String)),
+        ).where(
+            OHLCVDaily.security_id == TechnicalIndicator.security_id,
+            OHLCVDaily.candle_date == TechnicalIndicator.measurement_date,
+            TechnicalIndicator.measurement_date == measurement_date,
+        )
+        return {row[0]: row[1] for row in self.db_session.exec(stmt)}
+
     def get_selected_fields_for_security_between_dates(
         self,
         security_id: int,
@@ -132,3 +429,20 @@ class TechnicalIndicatorHandler:
             results.append(record)
 
         return results
+
+
+def indicator_frame_to_csv(df: pd.DataFrame, columns: List[str]) -> StringIO:
+    """
+    Serialize indicator columns for COPY ... WITH (FORMAT csv): dates as ISO, floats at
+    round-trip precision and NaN as an unquoted empty field, which COPY reads as NULL.
+    """
+    frame = df[columns].copy()
+    frame["security_id"] = frame["security_id"].astype("int64")
+    frame["measurement_date"] = pd.to_datetime(frame["measurement_date"]).dt.strftime(
+        "%Y-%m-%d"
+    )
+
+    buffer = StringIO()
+    frame.to_csv(buffer, index=False, header=False, na_rep="")
+    buffer.seek(0)
+    return buffer
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def atr(df: pd.DataFrame, lookback_days: int = 14) -> pd.Series:
     """
@@ -16,14 +18,5 @@ def atr(df: pd.DataFrame, lookback_days: int = 14) -> pd.Series:
     if not required.issubset(df.columns):
         raise ValueError(f"DataFrame must contain: {required}")
 
-    high = df["high"]
-    low = df["low"]
-    close = df["close"]
-    prev_close = close.shift(1)
-
-    tr = pd.concat(
-        [(high - low), (high - prev_close).abs(), (low - prev_close).abs()], axis=1
-    ).max(axis=1)
-
-    atr_result = tr.ewm(alpha=1 / lookback_days, adjust=False).mean()
-    return atr_result
+    tr = registry.true_range(df["high"], df["low"], df["close"])
+    return registry.wilder(tr, pd.Series(True, index=df.index), lookback_days)
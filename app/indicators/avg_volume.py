@@ -1,6 +1,7 @@
-import numpy as np
 import pandas as pd
 
+from app.indicators import registry
+
 
 def avg_volume(df: pd.DataFrame, lookback_days: int = 20) -> pd.Series:
     """
@@ -17,13 +18,10 @@ def avg_volume(df: pd.DataFrame, lookback_days: int = 20) -> pd.Series:
     if "volume" not in df.columns:
         raise ValueError("DataFrame must contain 'volume' column from ohlcv_daily")
 
-    # Mark zero-volume entries as NaN
-    safe_volume = df["volume"].copy()
-
-    # If any zero in the rolling window, result is NaN
-    def zero_sensitive_avg(window):
-        return np.nan if (window == 0).any() else window.mean()
-
-    return safe_volume.rolling(window=lookback_days, min_periods=lookback_days).apply(
-        zero_sensitive_avg, raw=True
+    volume = df["volume"]
+    return registry.avg_volume(
+        registry.windows(volume),
+        registry.windows(registry.zero_volume(volume)),
+        volume,
+        lookback_days=lookback_days,
     )
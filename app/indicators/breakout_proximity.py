@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def breakout_proximity(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     """
@@ -16,5 +18,8 @@ def breakout_proximity(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     if "close" not in df.columns:
         raise ValueError("DataFrame must include 'close' column")
 
-    rolling_max = df["close"].rolling(window=lookback_days, min_periods=1).max()
-    return (df["close"] / rolling_max) - 1
+    close = df["close"]
+    rolling_max = registry.window_stat(
+        registry.windows(close), close, "max", lookback_days, min_periods=1
+    )
+    return registry.breakout_proximity(close, rolling_max)
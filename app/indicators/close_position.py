@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def close_position(df: pd.DataFrame) -> pd.Series:
     """
@@ -17,21 +19,9 @@ def close_position(df: pd.DataFrame) -> pd.Series:
     if not required.issubset(df.columns):
         raise ValueError(f"DataFrame must contain columns: {required}")
 
-    high = df["high"]
-    low = df["low"]
-    close = df["close"]
-
-    range_ = high - low
-
     # cast to float, decimal input incompatible with float
-    close_pos = pd.Series(index=df.index, dtype="float64")
-
-    nonzero_mask = range_ != 0
-    result = (close[nonzero_mask] - low[nonzero_mask]) / range_[nonzero_mask]
-
-    # Cast result to float before assignment to avoid dtype warning
-    close_pos[nonzero_mask] = result.astype(float)
-
-    close_pos[~nonzero_mask] = 0.5
+    high, low, close = (
+        df[field].astype("float64") for field in ("high", "low", "close")
+    )
 
-    return close_pos
+    return registry.close_position(close, high, low)
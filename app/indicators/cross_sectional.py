@@ -0,0 +1,53 @@
+import pandas as pd
+
+# Inputs read from technical_indicator, ohlcv_daily and security
+CROSS_SECTIONAL_INPUTS = [
+    "security_id",
+    "measurement_date",
+    "gics_sector",
+    "rsi_14",
+    "percent_change",
+    "volume",
+    "avg_vol_20d",
+]
+
+# Per-security values that are ranked and z-scored across the universe
+CROSS_SECTIONAL_FEATURES = ["rsi_14", "percent_change", "relative_volume"]
+
+
+def cross_sectional_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Universe-relative indicators for every (security, date) row of df, which holds
+    the columns of CROSS_SECTIONAL_INPUTS for all securities of the universe.
+
+    Each feature gets its percentile rank among that day's securities (ties share
+    the average rank) and its z-score within that day's GICS sector. Every date and
+    sector is done in one vectorized groupby over the whole panel. Missing values are
+    left out of the ranks and statistics and stay NaN, as do z-scores of sectors
+    with fewer than two values or no dispersion.
+    """
+    features = pd.DataFrame(
+        {
+            "rsi_14": df["rsi_14"],
+            "percent_change": df["percent_change"],
+            "relative_volume": df["volume"]
+            / df["avg_vol_20d"].where(df["avg_vol_20d"] > 0),
+        },
+        dtype="float64",
+    )
+
+    by_date = features.groupby(df["measurement_date"], sort=False)
+    by_sector = features.groupby(
+        [df["measurement_date"], df["gics_sector"]], sort=False
+    )
+    ranks = by_date.rank(pct=True)
+    sector_mean = by_sector.transform("mean")
+    sector_std = by_sector.transform("std")
+    z_scores = (features - sector_mean) / sector_std.where(sector_std > 0)
+
+    result = df[["security_id", "measurement_date"]].copy()
+    for feature in CROSS_SECTIONAL_FEATURES:
+        result[f"{feature}_pct_rank"] = ranks[feature]
+    for feature in CROSS_SECTIONAL_FEATURES:
+        result[f"{feature}_sector_z"] = z_scores[feature]
+    return result
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def ema(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     """
@@ -17,4 +19,4 @@ def ema(df: pd.DataFrame, lookback_days: int) -> pd.Series:
             "DataFrame must contain 'adjusted_close' column from ohlcv_daily"
         )
 
-    return df["adjusted_close"].ewm(span=lookback_days, adjust=False).mean()
+    return registry.ema(df["adjusted_close"], span=lookback_days)
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def breakout_high_n(df: pd.DataFrame, lookback_days: int = 10) -> pd.Series:
     """
@@ -8,7 +10,8 @@ def breakout_high_n(df: pd.DataFrame, lookback_days: int = 10) -> pd.Series:
     if "high" not in df.columns:
         raise ValueError("DataFrame must contain 'high' column from ohlcv_daily")
 
-    return df["high"].rolling(window=lookback_days, min_periods=lookback_days).max()
+    high = df["high"]
+    return registry.window_stat(registry.windows(high), high, "max", lookback_days)
 
 
 def breakout_low_n(df: pd.DataFrame, lookback_days: int = 10) -> pd.Series:
@@ -18,4 +21,5 @@ def breakout_low_n(df: pd.DataFrame, lookback_days: int = 10) -> pd.Series:
     if "low" not in df.columns:
         raise ValueError("DataFrame must contain 'low' column from ohlcv_daily")
 
-    return df["low"].rolling(window=lookback_days, min_periods=lookback_days).min()
+    low = df["low"]
+    return registry.window_stat(registry.windows(low), low, "min", lookback_days)
@@ -0,0 +1,271 @@
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.models.indicator_state import IndicatorState
+
+# Longest trailing window each tail must keep
+ADJUSTED_CLOSE_TAIL = 200  # sma_200
+CLOSE_TAIL = 20  # range_pct_20, breakout_proximity_20, rolling_volatility_20
+HIGH_LOW_TAIL = 10  # high_10d, low_10d
+VOLUME_TAIL = 50  # avg_vol_50d
+WEIGHTED_CHANGE_TAIL = 50  # avg_vol_weighted_change_50d
+PERCENT_CHANGE_TAIL = 20  # price_volume_corr_20
+
+RSI_DAYS = 14
+ATR_DAYS = 14
+
+
+def build_indicator_state(security_id: int, df: pd.DataFrame) -> IndicatorState:
+    """
+    Seed the rolling state from a prepared OHLCV history (see load_ohlcv_history),
+    as of its last candle.
+    """
+    adjusted_close = df["adjusted_close"]
+    close = df["close"]
+    high = df["high"]
+    low = df["low"]
+
+    delta = adjusted_close.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+
+    ema_12 = adjusted_close.ewm(span=12, adjust=False).mean()
+    ema_26 = adjusted_close.ewm(span=26, adjust=False).mean()
+    macd_signal = (ema_12 - ema_26).ewm(span=9, adjust=False).mean()
+
+    prev_close = close.shift(1)
+    true_range = pd.concat(
+        [(high - low), (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+    ).max(axis=1)
+
+    percent_change = close.pct_change()
+    weighted_change = df["volume"] * percent_change.abs()
+
+    return IndicatorState(
+        security_id=security_id,
+        as_of_date=df["candle_date"].iloc[-1],
+        prev_close=float(close.iloc[-1]),
+        prev_adjusted_close=float(adjusted_close.iloc[-1]),
+        ema_9=_last(adjusted_close.ewm(span=9, adjust=False).mean()),
+        ema_20=_last(adjusted_close.ewm(span=20, adjust=False).mean()),
+        ema_12=_last(ema_12),
+        ema_26=_last(ema_26),
+        macd_signal=_last(macd_signal),
+        rsi_avg_gain=_last(gain.ewm(alpha=1 / RSI_DAYS, adjust=False).mean()),
+        rsi_avg_loss=_last(loss.ewm(alpha=1 / RSI_DAYS, adjust=False).mean()),
+        atr_14=_last(true_range.ewm(alpha=1 / ATR_DAYS, adjust=False).mean()),
+        adjusted_close_tail=_tail(adjusted_close, ADJUSTED_CLOSE_TAIL),
+        close_tail=_tail(close, CLOSE_TAIL),
+        high_tail=_tail(high, HIGH_LOW_TAIL),
+        low_tail=_tail(low, HIGH_LOW_TAIL),
+        volume_tail=_tail(df["volume"], VOLUME_TAIL),
+        percent_change_tail=_tail(percent_change, PERCENT_CHANGE_TAIL),
+        weighted_change_tail=_tail(weighted_change, WEIGHTED_CHANGE_TAIL),
+    )
+
+
+def advance_indicator_state(
+    state: IndicatorState, candle: Mapping[str, Any]
+) -> Tuple[IndicatorState, Dict[str, Any]]:
+    """
+    Fold one new candle into the state and return (new_state, indicator_row).
+
+    Recursive indicators are updated with the same EWM recurrence pandas uses; rolling
+    indicators are read from the bounded tails, so each update costs at most one pass
+    over a 200-value window regardless of how much history the security has.
+    """
+    adjusted_close = float(candle["adjusted_close"])
+    close = float(candle["close"])
+    high = float(candle["high"])
+    low = float(candle["low"])
+    volume = float(candle["volume"])
+
+    delta = adjusted_close - state.prev_adjusted_close
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # A zero previous close gives inf (NaN for 0/0), as the vectorised path does
+        percent_change = float(np.float64(close) / np.float64(state.prev_close) - 1)
+    true_range = max(
+        high - low, abs(high - state.prev_close), abs(low - state.prev_close)
+    )
+
+    ema_12 = _ewm_step(state.ema_12, adjusted_close, _span_alpha(12))
+    ema_26 = _ewm_step(state.ema_26, adjusted_close, _span_alpha(26))
+    macd_line = ema_12 - ema_26
+
+    new_state = IndicatorState(
+        security_id=state.security_id,
+        as_of_date=candle["candle_date"],
+        prev_close=close,
+        prev_adjusted_close=adjusted_close,
+        ema_9=_ewm_step(state.ema_9, adjusted_close, _span_alpha(9)),
+        ema_20=_ewm_step(state.ema_20, adjusted_close, _span_alpha(20)),
+        ema_12=ema_12,
+        ema_26=ema_26,
+        macd_signal=_ewm_step(state.macd_signal, macd_line, _span_alpha(9)),
+        rsi_avg_gain=_ewm_step(
+            state.rsi_avg_gain, delta if delta > 0 else 0.0, _wilder_alpha(RSI_DAYS)
+        ),
+        rsi_avg_loss=_ewm_step(
+            state.rsi_avg_loss, -delta if delta < 0 else 0.0, _wilder_alpha(RSI_DAYS)
+        ),
+        atr_14=_ewm_step(state.atr_14, true_range, _wilder_alpha(ATR_DAYS)),
+        adjusted_close_tail=_push(
+            state.adjusted_close_tail, adjusted_close, ADJUSTED_CLOSE_TAIL
+        ),
+        close_tail=_push(state.close_tail, close, CLOSE_TAIL),
+        high_tail=_push(state.high_tail, high, HIGH_LOW_TAIL),
+        low_tail=_push(state.low_tail, low, HIGH_LOW_TAIL),
+        volume_tail=_push(state.volume_tail, volume, VOLUME_TAIL),
+        percent_change_tail=_push(
+            state.percent_change_tail, percent_change, PERCENT_CHANGE_TAIL
+        ),
+        weighted_change_tail=_push(
+            state.weighted_change_tail,
+            volume * abs(percent_change),
+            WEIGHTED_CHANGE_TAIL,
+        ),
+    )
+
+    return new_state, _indicator_row(new_state, candle)
+
+
+def find_inconsistencies(
+    incremental: Mapping[str, Any],
+    full: Mapping[str, Any],
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+) -> List[str]:
+    """
+    Return the indicator columns where an incrementally computed row disagrees with a
+    full recomputation. NULL/NaN on both sides counts as agreement.
+
+    The default tolerance allows for EWM seeds that differ because the full path only
+    reloads TRADING_DAYS_REQUIRED days while the persisted state carries all history.
+    """
+    mismatches = []
+    for column, expected in full.items():
+        if column in {"measurement_date", "security_id"}:
+            continue
+        actual = incremental.get(column, np.nan)
+        expected_missing = expected is None or pd.isna(expected)
+        actual_missing = actual is None or pd.isna(actual)
+        if expected_missing and actual_missing:
+            continue
+        if expected_missing != actual_missing or not np.isclose(
+            float(actual), float(expected), rtol=rtol, atol=atol
+        ):
+            mismatches.append(column)
+    return mismatches
+
+
+def _indicator_row(state: IndicatorState, candle: Mapping[str, Any]) -> Dict[str, Any]:
+    adjusted_close = np.asarray(state.adjusted_close_tail, dtype="float64")
+    close = np.asarray(state.close_tail, dtype="float64")
+    volume = np.asarray(state.volume_tail, dtype="float64")
+    weighted_change = np.asarray(state.weighted_change_tail, dtype="float64")
+    high, low, last_close = float(candle["high"]), float(candle["low"]), close[-1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.float64(state.rsi_avg_gain) / np.float64(state.rsi_avg_loss)
+        rsi = 100 - (100 / (1 + rs))
+
+        close_max, close_min = close.max(), close.min()
+        close_mean = close.mean()
+        close_std = close.std(ddof=1) if len(close) > 1 else np.nan
+
+        return {
+            "measurement_date": candle["candle_date"],
+            "security_id": state.security_id,
+            "sma_20": _window_mean(adjusted_close, 20),
+            "sma_50": _window_mean(adjusted_close, 50),
+            "sma_200": _window_mean(adjusted_close, 200),
+            "ema_9": state.ema_9,
+            "ema_20": state.ema_20,
+            "rsi_14": rsi,
+            "high_10d": _window_extreme(state.high_tail, 10, max),
+            "low_10d": _window_extreme(state.low_tail, 10, min),
+            "avg_vol_5d": _zero_sensitive_mean(volume, 5),
+            "avg_vol_20d": _zero_sensitive_mean(volume, 20),
+            "avg_vol_50d": _zero_sensitive_mean(volume, 50),
+            "avg_vol_weighted_change_5d": _nan_mean(weighted_change[-5:]),
+            "avg_vol_weighted_change_50d": _nan_mean(weighted_change[-50:]),
+            "price_volume_corr_20": _window_corr(
+                state.percent_change_tail, volume[-PERCENT_CHANGE_TAIL:]
+            ),
+            "macd": state.ema_12 - state.ema_26,
+            "macd_signal": state.macd_signal,
+            "macd_hist": (state.ema_12 - state.ema_26) - state.macd_signal,
+            "atr_14": state.atr_14,
+            "close_position": (
+                (last_close - low) / (high - low) if high != low else 0.5
+            ),
+            "percent_change": state.percent_change_tail[-1],
+            "range_pct_20": (
+                (close_max - close_min) / close_min if close_min != 0 else np.nan
+            ),
+            "breakout_proximity_20": (last_close / close_max) - 1,
+            "rolling_volatility_20": (
+                close_std / close_mean if close_mean != 0 else np.nan
+            ),
+        }
+
+
+def _span_alpha(span: int) -> float:
+    # Same alpha pandas derives from span via the centre of mass
+    return 1.0 / (1.0 + (span - 1) / 2.0)
+
+
+def _wilder_alpha(days: int) -> float:
+    # Same alpha pandas derives from alpha=1/days via the centre of mass
+    return 1.0 / (1.0 + (1.0 / (1 / days) - 1.0))
+
+
+def _ewm_step(previous: float, value: float, alpha: float) -> float:
+    # pandas' adjust=False recurrence, including its normalisation and constant guard
+    if previous == value:
+        return previous
+    old_weight, new_weight = 1.0 - alpha, alpha
+    return (old_weight * previous + new_weight * value) / (old_weight + new_weight)
+
+
+def _push(tail: List[float], value: float, length: int) -> List[float]:
+    return (list(tail) + [value])[-length:]
+
+
+def _tail(series: pd.Series, length: int) -> List[float]:
+    return [float(v) for v in series.iloc[-length:]]
+
+
+def _last(series: pd.Series) -> float:
+    return float(series.iloc[-1])
+
+
+def _window_mean(values: np.ndarray, window: int) -> Optional[float]:
+    return float(values[-window:].mean()) if len(values) >= window else None
+
+
+def _window_extreme(tail: List[float], window: int, func) -> Optional[float]:
+    return float(func(tail[-window:])) if len(tail) >= window else None
+
+
+def _zero_sensitive_mean(volume: np.ndarray, window: int) -> Optional[float]:
+    if len(volume) < window:
+        return None
+    recent = volume[-window:]
+    return None if (recent == 0).any() else float(recent.mean())
+
+
+def _nan_mean(values: np.ndarray) -> Optional[float]:
+    finite = values[~np.isnan(values)]
+    return float(finite.mean()) if len(finite) else None
+
+
+def _window_corr(percent_change: List[float], volume: np.ndarray) -> Optional[float]:
+    x = np.asarray(percent_change, dtype="float64")
+    if len(x) < PERCENT_CHANGE_TAIL or np.isnan(x).any():
+        return None
+    x_dev, y_dev = x - x.mean(), volume - volume.mean()
+    denominator = np.sqrt((x_dev**2).sum() * (y_dev**2).sum())
+    return float((x_dev * y_dev).sum() / denominator) if denominator else None
@@ -0,0 +1,104 @@
+from datetime import date
+from typing import Dict, Iterable, List, Set, Tuple
+
+import pandas as pd
+
+from sqlmodel import Session
+
+from app.handlers.technical_indicator import TechnicalIndicatorHandler
+from app.indicators.panel import compute_indicators_for_securities
+from app.indicators.registry import INDICATOR_REGISTRY
+from app.models.execution_strategy import ExecutionStrategy
+from app.models.signal_strategy import SignalStrategy
+from app.signals.compiled import compile_strategy
+from app.stratagies.execution_strategies import EXECUTION_STRATEGY_PROVIDER
+from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
+from app.utils.log_wrapper import Log
+
+
+def required_indicator_columns(
+    signal_strategies: Iterable[SignalStrategy],
+    execution_strategies: Iterable[ExecutionStrategy] = (),
+) -> List[str]:
+    """
+    Union of the indicator columns the given strategies read, in registry order.
+    OHLCV fields such as close and volume are not indicators and are dropped.
+    """
+    columns: Set[str] = set()
+    for signal_strategy in signal_strategies:
+        compiled = compile_strategy(signal_strategy)
+        columns |= compiled.eod_columns | compiled.sod_columns
+    for execution_strategy in execution_strategies:
+        columns |= execution_strategy.required_columns()
+
+    return [name for name in INDICATOR_REGISTRY.outputs if name in columns]
+
+
+def active_indicator_columns() -> List[str]:
+    """Indicator columns needed by the active signal and execution strategies."""
+    return required_indicator_columns(
+        [s for s in SIGNAL_STRATEGY_PROVIDER.iter_strategies() if s.active],
+        [s for s in EXECUTION_STRATEGY_PROVIDER.iter_strategies() if s.active],
+    )
+
+
+def ensure_indicator_columns(
+    db_session: Session,
+    security_ids: List[int],
+    start_date: date,
+    end_date: date,
+    columns: Iterable[str],
+) -> None:
+    """
+    Backfill indicator columns that a lazy computation skipped, for the rows in
+    [start_date, end_date] that are about to be read. Rows that were never computed
+    are left to the heal.
+    """
+    requested = [name for name in INDICATOR_REGISTRY.outputs if name in set(columns)]
+    if not requested or not security_ids:
+        return
+
+    handler = TechnicalIndicatorHandler(db_session)
+    pending = handler.get_rows_missing_columns(
+        security_ids, start_date, end_date, requested
+    )
+    if not pending:
+        return
+
+    backfill = [
+        name for name in requested if any(name in missing for _, _, missing in pending)
+    ]
+    ranges = _date_range_by_security(pending)
+    Log.info(
+        f"[LAZY] Backfilling {backfill} for {len(pending)} rows of "
+        f"{len(ranges)} securities"
+    )
+
+    df = compute_indicators_for_securities(
+        security_ids=sorted(ranges),
+        start_date=min(start for start, _ in ranges.values()),
+        end_date=max(end for _, end in ranges.values()),
+        session=db_session,
+        columns=backfill,
+    )
+    if df.empty:
+        return
+
+    keys = pd.DataFrame(
+        [(security_id, day) for security_id, day, _ in pending],
+        columns=["security_id", "measurement_date"],
+    )
+    df = df.merge(keys, on=["security_id", "measurement_date"])
+
+    handler.save_frame(df, columns=backfill)
+    db_session.commit()
+
+
+def _date_range_by_security(
+    pending: List[Tuple[int, date, List[str]]],
+) -> Dict[int, Tuple[date, date]]:
+    ranges: Dict[int, Tuple[date, date]] = {}
+    for security_id, day, _ in pending:
+        start, end = ranges.get(security_id, (day, day))
+        ranges[security_id] = (min(start, day), max(end, day))
+    return ranges
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def macd(
     df: pd.DataFrame,
@@ -18,11 +20,11 @@ def macd(
             "DataFrame must contain 'adjusted_close' column from ohlcv_daily"
         )
 
-    short_ema = df["adjusted_close"].ewm(span=short_period, adjust=False).mean()
-    long_ema = df["adjusted_close"].ewm(span=long_period, adjust=False).mean()
-    macd_line = short_ema - long_ema
-    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-    histogram = macd_line - signal_line
+    short_ema = registry.ema(df["adjusted_close"], span=short_period)
+    long_ema = registry.ema(df["adjusted_close"], span=long_period)
+    macd_line = registry.difference(short_ema, long_ema)
+    signal_line = registry.ema(macd_line, span=signal_period)
+    histogram = registry.difference(macd_line, signal_line)
 
     return pd.DataFrame(
         {"macd": macd_line, "macd_signal": signal_line, "macd_hist": histogram}
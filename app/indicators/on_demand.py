@@ -0,0 +1,384 @@
+import re
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sqlmodel import Session
+
+from app.core.settings import get_settings
+from app.indicators.compute import EXCHANGE
+from app.indicators.panel import OHLCVPanel
+from app.indicators.registry import (
+    IndicatorRegistry,
+    avg_volume,
+    delta,
+    ema,
+    ewm_warmup,
+    gain,
+    loss,
+    rsi,
+    span_warmup,
+    true_range,
+    wilder,
+    window_stat,
+    windows,
+    zero_volume,
+)
+from app.utils.log_wrapper import Log
+from app.utils.trading_calendar import get_nth_trading_day
+
+# "sma(100)", "rsi(7)": an on-demand indicator and its integer parameters
+SPEC_PATTERN = re.compile(r"^\s*([a-z_]+)\s*\(\s*(\d+(?:\s*,\s*\d+)*)\s*\)\s*$")
+
+
+# Series attribute holding the first candle date a cached series was computed from
+LOADED_FROM = "loaded_from"
+
+
+class OnDemandIndicatorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    function: str
+    params: Tuple[int, ...]
+
+    @classmethod
+    def parse(cls, text: str) -> "IndicatorSpec":
+        match = SPEC_PATTERN.match(text)
+        if not match:
+            raise OnDemandIndicatorError(
+                f"Expected an on-demand indicator like 'sma(100)', got '{text}'"
+            )
+        function = match.group(1)
+        params = tuple(int(p) for p in match.group(2).split(","))
+
+        builder = ON_DEMAND_INDICATORS.get(function)
+        if builder is None:
+            raise OnDemandIndicatorError(
+                f"Unknown on-demand indicator '{function}', expected one of "
+                f"{sorted(ON_DEMAND_INDICATORS)}"
+            )
+        if len(params) != builder.n_params or min(params) < 1:
+            raise OnDemandIndicatorError(
+                f"'{function}' takes {builder.n_params} positive integer parameter(s)"
+            )
+        return cls(function=function, params=params)
+
+    @property
+    def column(self) -> str:
+        """Canonical column name, e.g. sma(100)."""
+        return f"{self.function}({', '.join(str(p) for p in self.params)})"
+
+    def registry(self) -> IndicatorRegistry:
+        """A registry holding this indicator, named column, and its intermediates."""
+        registry = IndicatorRegistry()
+        ON_DEMAND_INDICATORS[self.function].register(
+            registry, self.column, *self.params
+        )
+        return registry
+
+
+@dataclass(frozen=True)
+class OnDemandIndicator:
+    n_params: int
+    register: Callable[..., None]
+
+
+def is_on_demand(column: str) -> bool:
+    return SPEC_PATTERN.match(column) is not None
+
+
+def on_demand_specs(columns: Iterable[str]) -> List[IndicatorSpec]:
+    """Parse the on-demand indicators among columns, ignoring stored columns."""
+    specs = {IndicatorSpec.parse(c) for c in columns if is_on_demand(c)}
+    return sorted(specs, key=lambda spec: spec.column)
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU of computed indicator series, bounded by the bytes they hold
+    rather than by entry count. A series larger than the whole budget is not cached.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, pd.Series]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[pd.Series]:
+        with self._lock:
+            series = self._entries.get(key)
+            if series is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return series
+
+    def put(self, key: Hashable, series: pd.Series) -> None:
+        size = _nbytes(series)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= _nbytes(previous)
+            self._entries[key] = series
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= _nbytes(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+ON_DEMAND_CACHE = IndicatorCache(
+    max_bytes=get_settings().ON_DEMAND_CACHE_MB * 1024 * 1024
+)
+
+
+def compute_on_demand_indicators(
+    session: Session,
+    specs: List[IndicatorSpec],
+    security_ids: List[int],
+    start_date: date,
+    end_date: date,
+    cache: IndicatorCache = ON_DEMAND_CACHE,
+) -> pd.DataFrame:
+    """
+    On-demand indicators for securities between two dates, in long form: one row per
+    security and candle with security_id, measurement_date and a column per spec.
+
+    Each indicator is computed with the registry kernels from the history its
+    warm-up needs before start_date, the same lookback compute_indicators_for_range
+    loads, through the security's latest candle. The series is cached under
+    (indicator, security, data version) and sliced to each requested range, so
+    later or overlapping ranges reuse it; a range starting before the cached lookback
+    computes it again from further back. The data version changes whenever the
+    security's candles do, so stale entries are simply never hit again.
+    """
+    from app.handlers.ohlcv_daily import OHLCVDailyHandler
+
+    columns = ["security_id", "measurement_date"] + [spec.column for spec in specs]
+    if not specs or not security_ids:
+        return pd.DataFrame(columns=columns)
+
+    handler = OHLCVDailyHandler(session)
+    versions = handler.get_data_versions(security_ids)
+    lookback_starts = {spec: _lookback_start(spec, start_date) for spec in specs}
+
+    computed: Dict[Tuple[str, int], pd.Series] = {}
+    misses: Dict[IndicatorSpec, List[int]] = {}
+    for spec in specs:
+        for security_id, version in versions.items():
+            series = cache.get((spec.column, security_id, version))
+            if series is None or series.attrs[LOADED_FROM] > lookback_starts[spec]:
+                misses.setdefault(spec, []).append(security_id)
+            else:
+                computed[(spec.column, security_id)] = series
+
+    missing_ids = sorted({i for ids in misses.values() for i in ids})
+    if missing_ids:
+        Log.debug(
+            f"[ON-DEMAND] Computing {[spec.column for spec in misses]} for "
+            f"{len(missing_ids)} securities"
+        )
+        loaded_from = min(lookback_starts[spec] for spec in misses)
+        panel = OHLCVPanel.from_long(
+            handler.load_arrays(loaded_from, date.max, missing_ids).to_frame()
+        )
+        for spec, ids in misses.items():
+            for security_id, series in _compute_panel(spec, panel, ids).items():
+                series.attrs[LOADED_FROM] = loaded_from
+                cache.put((spec.column, security_id, versions[security_id]), series)
+                computed[(spec.column, security_id)] = series
+
+    return _to_long(computed, specs, list(versions), start_date, end_date)
+
+
+def attach_on_demand_indicators(
+    session: Session, df: pd.DataFrame, columns: Iterable[str]
+) -> pd.DataFrame:
+    """
+    Add the on-demand indicators among columns to a frame of (security_id,
+    measurement_date) rows, such as the combined signal rows a strategy filters.
+    """
+    specs = on_demand_specs(columns)
+    if not specs or df.empty:
+        return df
+
+    dates = df["measurement_date"]
+    values = compute_on_demand_indicators(
+        session,
+        specs,
+        sorted(df["security_id"].unique().tolist()),
+        dates.min(),
+        dates.max(),
+    )
+    return df.merge(values, on=["security_id", "measurement_date"], how="left")
+
+
+def _to_long(
+    computed: Dict[Tuple[str, int], pd.Series],
+    specs: List[IndicatorSpec],
+    security_ids: List[int],
+    start_date: date,
+    end_date: date,
+) -> pd.DataFrame:
+    columns = ["security_id", "measurement_date"] + [spec.column for spec in specs]
+    frames = []
+    for security_id in security_ids:
+        by_spec = {
+            spec.column: computed[(spec.column, security_id)]
+            for spec in specs
+            if (spec.column, security_id) in computed
+        }
+        if not by_spec:
+            continue
+        frame = pd.DataFrame(by_spec).loc[start_date:end_date]  # type: ignore[misc]
+        frame.insert(0, "security_id", security_id)
+        frames.append(frame.rename_axis("measurement_date").reset_index())
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True).reindex(columns=columns)
+
+
+def _compute_panel(
+    spec: IndicatorSpec, panel: OHLCVPanel, security_ids: List[int]
+) -> Dict[int, pd.Series]:
+    registry = spec.registry()
+    valid = panel.valid
+    sources = {name: frame.where(valid) for name, frame in panel.fields.items()}
+    sources["valid"] = valid
+
+    result = registry.compute(sources, [spec.column])
+    values = registry.mask_warmup(result, valid)[spec.column].to_numpy(
+        dtype="float64", na_value=np.nan
+    )
+
+    series = {}
+    for position, security_id in enumerate(panel.security_ids):
+        if security_id not in security_ids:
+            continue
+        has_candle = ~np.isnat(panel.dates[:, position])
+        series[int(security_id)] = pd.Series(
+            values[has_candle, position],
+            index=pd.Index(pd.to_datetime(panel.dates[has_candle, position]).date),
+            name=spec.column,
+        )
+    return series
+
+
+def _lookback_start(spec: IndicatorSpec, start_date: date) -> date:
+    """First candle date spec needs loaded for a value on start_date."""
+    history = spec.registry().history([spec.column])[spec.column]
+    return get_nth_trading_day(exchange=EXCHANGE, as_of=start_date, offset=-history)
+
+
+def _nbytes(series: pd.Series) -> int:
+    return int(series.memory_usage(index=True, deep=True))
+
+
+def _register_sma(registry: IndicatorRegistry, name: str, days: int) -> None:
+    registry.register("windows", windows, ["adjusted_close"], output=False)
+    registry.register(
+        name,
+        window_stat,
+        ["windows", "adjusted_close"],
+        warmup=days - 1,
+        stat="mean",
+        lookback_days=days,
+    )
+
+
+def _register_ema(registry: IndicatorRegistry, name: str, span: int) -> None:
+    registry.register(
+        name, ema, ["adjusted_close"], warmup=span_warmup(span), span=span
+    )
+
+
+def _register_rsi(registry: IndicatorRegistry, name: str, days: int) -> None:
+    registry.register("delta", delta, ["adjusted_close"], output=False, warmup=1)
+    registry.register("gain", gain, ["delta"], output=False)
+    registry.register("loss", loss, ["delta"], output=False)
+    for side in ("gain", "loss"):
+        registry.register(
+            f"avg_{side}",
+            wilder,
+            [side, "valid"],
+            output=False,
+            warmup=ewm_warmup(1 / days),
+            lookback_days=days,
+        )
+    registry.register(name, rsi, ["avg_gain", "avg_loss"])
+
+
+def _register_atr(registry: IndicatorRegistry, name: str, days: int) -> None:
+    registry.register(
+        "true_range", true_range, ["high", "low", "close"], output=False, warmup=1
+    )
+    registry.register(
+        name,
+        wilder,
+        ["true_range", "valid"],
+        warmup=ewm_warmup(1 / days),
+        lookback_days=days,
+    )
+
+
+def _register_extreme(field: str, stat: str) -> Callable[..., None]:
+    def register(registry: IndicatorRegistry, name: str, days: int) -> None:
+        registry.register("windows", windows, [field], output=False)
+        registry.register(
+            name,
+            window_stat,
+            ["windows", field],
+            warmup=days - 1,
+            stat=stat,
+            lookback_days=days,
+        )
+
+    return register
+
+
+def _register_avg_volume(registry: IndicatorRegistry, name: str, days: int) -> None:
+    registry.register("zero_volume", zero_volume, ["volume"], output=False)
+    registry.register("volume_windows", windows, ["volume"], output=False)
+    registry.register("zero_volume_windows", windows, ["zero_volume"], output=False)
+    registry.register(
+        name,
+        avg_volume,
+        ["volume_windows", "zero_volume_windows", "volume"],
+        warmup=days - 1,
+        lookback_days=days,
+    )
+
+
+# Parameterized counterparts of the stored indicators (sma_20 is sma(20), ...)
+ON_DEMAND_INDICATORS: Dict[str, OnDemandIndicator] = {
+    "sma": OnDemandIndicator(n_params=1, register=_register_sma),
+    "ema": OnDemandIndicator(n_params=1, register=_register_ema),
+    "rsi": OnDemandIndicator(n_params=1, register=_register_rsi),
+    "atr": OnDemandIndicator(n_params=1, register=_register_atr),
+    "high": OnDemandIndicator(n_params=1, register=_register_extreme("high", "max")),
+    "low": OnDemandIndicator(n_params=1, register=_register_extreme("low", "min")),
+    "avg_vol": OnDemandIndicator(n_params=1, register=_register_avg_volume),
+}
@@ -0,0 +1,223 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sqlmodel import Session
+
+from app.indicators.compute import EXCHANGE, PRICE_FIELDS
+from app.indicators.registry import INDICATOR_REGISTRY
+from app.utils.log_wrapper import Log
+from app.utils.trading_calendar import get_nth_trading_day
+
+
+@dataclass
+class OHLCVPanel:
+    """
+    OHLCV for many securities laid out as (bar × security) frames.
+
+    Each security's candles are right-aligned on the last row, so row i of a column is
+    that security's (n - i)-th most recent candle. Rolling windows therefore count a
+    security's own candles exactly as the per-security path does, and for securities
+    sharing a trading calendar rows line up with dates. Leading cells with no candle
+    are NaN and masked out of every result.
+    """
+
+    security_ids: np.ndarray
+    dates: np.ndarray  # (bars × securities) datetime64[D], NaT where there is no candle
+    fields: Dict[str, pd.DataFrame]
+
+    @property
+    def valid(self) -> pd.DataFrame:
+        return pd.DataFrame(~np.isnat(self.dates), columns=self.security_ids)
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame) -> "OHLCVPanel":
+        """Build a panel from long rows with security_id, candle_date and PRICE_FIELDS."""
+        df = df.sort_values(["security_id", "candle_date"], kind="stable")
+
+        security_codes, security_ids = pd.factorize(df["security_id"], sort=True)
+        counts = np.bincount(security_codes, minlength=len(security_ids))
+        n_bars = int(counts.max()) if len(counts) else 0
+
+        # Position of each candle within its security, offset so the last candle
+        # of every security lands on the final row.
+        position_in_security = df.groupby("security_id").cumcount().to_numpy()
+        rows = n_bars - counts[security_codes] + position_in_security
+
+        dates = np.full((n_bars, len(security_ids)), np.datetime64("NaT"), "M8[D]")
+        dates[rows, security_codes] = pd.to_datetime(df["candle_date"]).to_numpy(
+            dtype="M8[D]"
+        )
+
+        fields = {}
+        for field in PRICE_FIELDS:
+            values = np.full((n_bars, len(security_ids)), np.nan)
+            values[rows, security_codes] = pd.to_numeric(
+                df[field], errors="coerce"
+            ).to_numpy(dtype="float64")
+            fields[field] = pd.DataFrame(values, columns=security_ids)
+
+        return cls(
+            security_ids=np.asarray(security_ids),
+            dates=dates,
+            fields=fields,
+        )
+
+
+def compute_indicators_for_securities(
+    security_ids: List[int],
+    start_date: date,
+    end_date: date,
+    session: Session,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Panel counterpart of compute_indicators_for_range: one OHLCV load and one vectorized
+    pass for many securities. Securities without enough candles for any requested
+    indicator are skipped, mirroring the InsufficientOHLCVDataError raised per
+    security; the others get NaN for indicators whose history is not yet complete.
+
+    Returns the same columns as compute_indicators_for_range (restricted to columns
+    when given), ordered by security_id then measurement_date.
+    """
+    history = INDICATOR_REGISTRY.history(columns)
+    lookback_start = get_nth_trading_day(
+        exchange=EXCHANGE, as_of=start_date, offset=-max(history.values())
+    )
+
+    df = _load_ohlcv_long_df(security_ids, lookback_start, end_date, session)
+    if df.empty:
+        return pd.DataFrame()
+
+    panel = OHLCVPanel.from_long(df)
+
+    candle_counts = panel.valid.sum(axis=0)
+    insufficient = candle_counts[candle_counts < min(history.values())].index
+    if len(insufficient):
+        Log.warning(
+            f"Insufficient OHLCV data for {len(insufficient)} securities from "
+            f"{lookback_start} to {end_date}: {sorted(insufficient.tolist())}"
+        )
+
+    indicators = compute_indicator_panel(panel, columns)
+    indicators = indicators[~indicators["security_id"].isin(insufficient)]
+
+    return indicators[
+        (indicators["measurement_date"] >= start_date)
+        & (indicators["measurement_date"] <= end_date)
+    ].reset_index(drop=True)
+
+
+def compute_indicators_for_ranges(
+    ranges: List[Tuple[int, date, date]],
+    session: Session,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    compute_indicators_for_securities over a different date range per entry: each
+    (security_id, start_date, end_date) gets its own lookback and becomes its own
+    panel column, so disjoint ranges, of one security or many, load only the candles
+    they need and are still computed in one vectorized pass. Ranges of a security
+    must not overlap.
+    """
+    history = INDICATOR_REGISTRY.history(columns)
+    windows = [
+        (
+            security_id,
+            get_nth_trading_day(
+                exchange=EXCHANGE, as_of=start_date, offset=-max(history.values())
+            ),
+            end_date,
+        )
+        for security_id, start_date, end_date in ranges
+    ]
+
+    df = _load_ohlcv_windows_long_df(windows, session)
+    if df.empty:
+        return pd.DataFrame()
+
+    panel = OHLCVPanel.from_long(df)
+
+    candle_counts = panel.valid.sum(axis=0)
+    insufficient = candle_counts[candle_counts < min(history.values())].index
+    if len(insufficient):
+        Log.warning(
+            f"Insufficient OHLCV data for {len(insufficient)} ranges: "
+            f"{sorted(ranges[i] for i in insufficient)}"
+        )
+
+    indicators = compute_indicator_panel(panel, columns)
+    indicators = indicators[~indicators["security_id"].isin(insufficient)]
+
+    # Panel columns are range positions; map them back and keep each range's dates
+    window = indicators["security_id"].to_numpy(dtype="int64")
+    starts = np.array([r[1] for r in ranges], dtype="M8[D]")[window]
+    ends = np.array([r[2] for r in ranges], dtype="M8[D]")[window]
+    measured = pd.to_datetime(indicators["measurement_date"]).to_numpy(dtype="M8[D]")
+
+    indicators = indicators.assign(
+        security_id=np.array([r[0] for r in ranges], dtype="int64")[window]
+    )[(measured >= starts) & (measured <= ends)]
+
+    return indicators.sort_values(
+        ["security_id", "measurement_date"], kind="stable"
+    ).reset_index(drop=True)
+
+
+def compute_indicator_panel(
+    panel: OHLCVPanel, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Compute the indicators of compute_indicators_for_range (every one when columns is
+    omitted) across all panel columns at once and return them in long form (one row
+    per security and candle). Each security's warm-up candles are NaN, as per security.
+    """
+    valid = panel.valid
+    sources = {name: frame.where(valid) for name, frame in panel.fields.items()}
+    sources["valid"] = valid
+
+    results = INDICATOR_REGISTRY.compute(sources, columns)
+    return _to_long(panel, INDICATOR_REGISTRY.mask_warmup(results, valid))
+
+
+def _to_long(panel: OHLCVPanel, wide: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    # Column-major flattening keeps rows grouped by security, then by date
+    valid_flat = ~np.isnat(panel.dates).ravel(order="F")
+    n_bars = panel.dates.shape[0]
+
+    long = pd.DataFrame(
+        {
+            "measurement_date": pd.to_datetime(
+                panel.dates.ravel(order="F")[valid_flat]
+            ).date,
+            "security_id": np.repeat(panel.security_ids, n_bars)[valid_flat],
+        }
+    )
+    for name, frame in wide.items():
+        values = frame.to_numpy(dtype="float64", na_value=np.nan)
+        long[name] = values.ravel(order="F")[valid_flat]
+
+    return long
+
+
+def _load_ohlcv_long_df(
+    security_ids: List[int], start_date: date, end_date: date, session: Session
+) -> pd.DataFrame:
+    from app.handlers.ohlcv_daily import OHLCVDailyHandler
+
+    arrays = OHLCVDailyHandler(session).load_arrays(
+        start=start_date, end=end_date, security_ids=security_ids
+    )
+
+    return arrays.to_frame()
+
+
+def _load_ohlcv_windows_long_df(
+    windows: List[Tuple[int, date, date]], session: Session
+) -> pd.DataFrame:
+    from app.handlers.ohlcv_daily import OHLCVDailyHandler
+
+    return OHLCVDailyHandler(session).load_window_arrays(windows).to_frame()
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def percent_change(df: pd.DataFrame) -> pd.Series:
     """
@@ -14,4 +16,4 @@ def percent_change(df: pd.DataFrame) -> pd.Series:
     if "close" not in df.columns:
         raise ValueError("DataFrame must include a 'close' column")
 
-    return df["close"].pct_change()
+    return registry.percent_change(df["close"])
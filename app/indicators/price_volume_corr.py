@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def price_volume_corr(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     """
@@ -15,5 +17,5 @@ def price_volume_corr(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     if not {"close", "volume"}.issubset(df.columns):
         raise ValueError("DataFrame must include 'close' and 'volume' columns")
 
-    percent_change = df["close"].pct_change()
-    return percent_change.rolling(window=lookback_days).corr(df["volume"])
+    percent_change = registry.percent_change(df["close"])
+    return registry.rolling_corr(percent_change, df["volume"], lookback_days)
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def range_pct(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     """
@@ -16,6 +18,12 @@ def range_pct(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     if "close" not in df.columns:
         raise ValueError("DataFrame must include 'close' column")
 
-    rolling_max = df["close"].rolling(window=lookback_days, min_periods=1).max()
-    rolling_min = df["close"].rolling(window=lookback_days, min_periods=1).min()
-    return (rolling_max - rolling_min) / rolling_min.replace(0, pd.NA)
+    close = df["close"]
+    windows = registry.windows(close)
+    rolling_max = registry.window_stat(
+        windows, close, "max", lookback_days, min_periods=1
+    )
+    rolling_min = registry.window_stat(
+        windows, close, "min", lookback_days, min_periods=1
+    )
+    return registry.range_pct(rolling_max, rolling_min)
@@ -0,0 +1,426 @@
+import math
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.indicators.rolling import RollingWindows
+
+# A single security's column (Series) or a (bar × security) panel frame
+Frame = Union[pd.Series, pd.DataFrame]
+
+# Inputs every computation is given; "valid" is False where a panel cell has no candle
+SOURCES = ("open", "high", "low", "close", "adjusted_close", "volume", "valid")
+
+# An EWM counts as warmed up once its seed value weighs less than this
+EWM_SEED_WEIGHT = 1e-4
+
+
+class IndicatorGraphError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    """
+    One computed column: func(*inputs, **params). Outputs are persisted indicator
+    columns; other nodes are intermediates shared between indicators. warmup is the
+    number of bars the node itself needs before its first meaningful value, on top
+    of what its inputs need.
+    """
+
+    name: str
+    func: Callable[..., Frame]
+    inputs: Tuple[str, ...]
+    params: Dict[str, Any] = field(default_factory=dict)
+    output: bool = True
+    warmup: int = 0
+
+
+class IndicatorRegistry:
+    """
+    Indicators and shared intermediates, declared with their inputs and parameters.
+
+    compute() resolves the dependency graph of the requested outputs and evaluates
+    every node once, so intermediates such as percent change or a rolling close max
+    are shared by all indicators that read them. Kernels only use elementwise and
+    column-wise pandas operations, so the same graph runs on a single security's
+    Series and on a panel of securities.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[str, IndicatorNode] = {}
+
+    def register(
+        self,
+        name: str,
+        func: Callable[..., Frame],
+        inputs: Iterable[str],
+        output: bool = True,
+        warmup: int = 0,
+        **params: Any,
+    ) -> None:
+        if name in self._nodes or name in SOURCES:
+            raise IndicatorGraphError(f"Indicator '{name}' is already registered")
+        self._nodes[name] = IndicatorNode(
+            name=name,
+            func=func,
+            inputs=tuple(inputs),
+            params=params,
+            output=output,
+            warmup=warmup,
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._nodes
+
+    def __getitem__(self, name: str) -> IndicatorNode:
+        return self._nodes[name]
+
+    @property
+    def outputs(self) -> List[str]:
+        """Persisted indicator columns, in registration order."""
+        return [name for name, node in self._nodes.items() if node.output]
+
+    def plan(self, targets: Iterable[str]) -> List[str]:
+        """Return the nodes needed for targets in dependency order, each once."""
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if name in SOURCES or state.get(name) == "done":
+                return
+            if name not in self._nodes:
+                raise IndicatorGraphError(f"Unknown indicator or input '{name}'")
+            if state.get(name) == "visiting":
+                raise IndicatorGraphError(
+                    f"Cycle in indicator graph: {' -> '.join(path + (name,))}"
+                )
+            state[name] = "visiting"
+            for dependency in self._nodes[name].inputs:
+                visit(dependency, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for target in targets:
+            visit(target, ())
+        return order
+
+    def history(self, targets: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Candles each target (default: every output) needs before its first meaningful
+        value: one bar plus the longest chain of warm-ups through its inputs.
+        """
+        targets = list(self.outputs if targets is None else targets)
+        lookback: Dict[str, int] = {source: 0 for source in SOURCES}
+
+        for name in self.plan(targets):
+            node = self._nodes[name]
+            lookback[name] = node.warmup + max(
+                (lookback[dependency] for dependency in node.inputs), default=0
+            )
+
+        return {name: lookback[name] + 1 for name in targets}
+
+    def mask_warmup(self, results: Dict[str, Frame], valid: Frame) -> Dict[str, Frame]:
+        """
+        Blank out each result on the candles that come before its history is
+        complete, counting each security's own candles (valid cells).
+        """
+        candles_seen = valid.astype("int64").cumsum()
+        history = self.history(results)
+        return {
+            name: values.where(candles_seen >= history[name])
+            for name, values in results.items()
+        }
+
+    def compute(
+        self, sources: Dict[str, Frame], targets: Optional[Iterable[str]] = None
+    ) -> Dict[str, Frame]:
+        """
+        Evaluate targets (default: every output) from the source columns and return
+        them by name.
+        """
+        targets = list(self.outputs if targets is None else targets)
+        values: Dict[str, Frame] = dict(sources)
+
+        for name in self.plan(targets):
+            node = self._nodes[name]
+            values[name] = node.func(
+                *(values[dependency] for dependency in node.inputs), **node.params
+            )
+
+        return {name: values[name] for name in targets}
+
+
+def ema(values: Frame, span: int) -> Frame:
+    return values.ewm(span=span, adjust=False).mean()
+
+
+def wilder(values: Frame, valid: Frame, lookback_days: int) -> Frame:
+    # Keep cells without a candle NaN so each column's EWM starts at its first candle
+    return values.where(valid).ewm(alpha=1 / lookback_days, adjust=False).mean()
+
+
+def span_warmup(span: int) -> int:
+    return ewm_warmup(2 / (span + 1))
+
+
+def ewm_warmup(alpha: float) -> int:
+    return math.ceil(math.log(EWM_SEED_WEIGHT) / math.log(1 - alpha))
+
+
+def windows(values: Frame) -> RollingWindows:
+    return RollingWindows(values.to_numpy(dtype="float64", na_value=np.nan))
+
+
+def window_stat(
+    windows: RollingWindows,
+    like: Frame,
+    stat: str,
+    lookback_days: int,
+    min_periods: Optional[int] = None,
+) -> Frame:
+    return _like(getattr(windows, stat)(lookback_days, min_periods), like)
+
+
+def _like(values: np.ndarray, like: Frame) -> Frame:
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(values, index=like.index, columns=like.columns)
+    return pd.Series(values, index=like.index)
+
+
+def delta(values: Frame) -> Frame:
+    return values.diff()
+
+
+def gain(delta: Frame) -> Frame:
+    return delta.where(delta > 0, 0.0)
+
+
+def loss(delta: Frame) -> Frame:
+    return -delta.where(delta < 0, 0.0)
+
+
+def rsi(avg_gain: Frame, avg_loss: Frame) -> Frame:
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def percent_change(close: Frame) -> Frame:
+    return close.div(close.shift(1)) - 1
+
+
+def weighted_change(volume: Frame, percent_change: Frame) -> Frame:
+    return volume * percent_change.abs()
+
+
+def zero_volume(volume: Frame) -> Frame:
+    return (volume == 0).astype("float64").where(volume.notna())
+
+
+def avg_volume(
+    volume_windows: RollingWindows,
+    zero_volume_windows: RollingWindows,
+    volume: Frame,
+    lookback_days: int,
+) -> Frame:
+    # Any window containing a zero-volume day is NaN
+    zeros_in_window = zero_volume_windows.sum(lookback_days)
+    average = volume_windows.mean(lookback_days)
+    return _like(np.where(zeros_in_window == 0, average, np.nan), volume)
+
+
+def rolling_corr(x: Frame, y: Frame, lookback_days: int) -> Frame:
+    return x.rolling(window=lookback_days).corr(y)
+
+
+def difference(a: Frame, b: Frame) -> Frame:
+    return a - b
+
+
+def true_range(high: Frame, low: Frame, close: Frame) -> Frame:
+    prev_close = close.shift(1)
+    return np.fmax(
+        np.fmax(high - low, (high - prev_close).abs()), (low - prev_close).abs()
+    )
+
+
+def close_position(close: Frame, high: Frame, low: Frame) -> Frame:
+    daily_range = high - low
+    return ((close - low) / daily_range).where(daily_range != 0, 0.5)
+
+
+def range_pct(rolling_max: Frame, rolling_min: Frame) -> Frame:
+    return (rolling_max - rolling_min) / rolling_min.where(rolling_min != 0)
+
+
+def breakout_proximity(close: Frame, rolling_max: Frame) -> Frame:
+    return (close / rolling_max) - 1
+
+
+def normalized_volatility(rolling_std: Frame, rolling_mean: Frame) -> Frame:
+    return rolling_std / rolling_mean.where(rolling_mean != 0)
+
+
+INDICATOR_REGISTRY = IndicatorRegistry()
+_register = INDICATOR_REGISTRY.register
+
+# Shared intermediates
+_register("adjusted_close_delta", delta, ["adjusted_close"], output=False, warmup=1)
+_register("gain", gain, ["adjusted_close_delta"], output=False)
+_register("loss", loss, ["adjusted_close_delta"], output=False)
+for _side in ("gain", "loss"):
+    _register(
+        f"avg_{_side}_14",
+        wilder,
+        [_side, "valid"],
+        output=False,
+        warmup=ewm_warmup(1 / 14),
+        lookback_days=14,
+    )
+for _span in (12, 26):
+    _register(
+        f"ema_{_span}",
+        ema,
+        ["adjusted_close"],
+        output=False,
+        warmup=span_warmup(_span),
+        span=_span,
+    )
+_register("zero_volume", zero_volume, ["volume"], output=False)
+_register(
+    "weighted_change", weighted_change, ["volume", "percent_change"], output=False
+)
+_register("true_range", true_range, ["high", "low", "close"], output=False, warmup=1)
+
+# Rolling windows: prefix sums per series, shared by every window length read from it
+_register("adjusted_close_windows", windows, ["adjusted_close"], output=False)
+_register("close_windows", windows, ["close"], output=False)
+_register("high_windows", windows, ["high"], output=False)
+_register("low_windows", windows, ["low"], output=False)
+_register("volume_windows", windows, ["volume"], output=False)
+_register("zero_volume_windows", windows, ["zero_volume"], output=False)
+_register("weighted_change_windows", windows, ["weighted_change"], output=False)
+
+for _stat in ("max", "min", "mean", "std"):
+    _register(
+        f"close_{_stat}_20",
+        window_stat,
+        ["close_windows", "close"],
+        output=False,
+        warmup=19,
+        stat=_stat,
+        lookback_days=20,
+        min_periods=1,
+    )
+
+# Persisted indicators, in technical_indicator column order
+_register(
+    "sma_20",
+    window_stat,
+    ["adjusted_close_windows", "adjusted_close"],
+    warmup=19,
+    stat="mean",
+    lookback_days=20,
+)
+_register(
+    "sma_50",
+    window_stat,
+    ["adjusted_close_windows", "adjusted_close"],
+    warmup=49,
+    stat="mean",
+    lookback_days=50,
+)
+_register(
+    "sma_200",
+    window_stat,
+    ["adjusted_close_windows", "adjusted_close"],
+    warmup=199,
+    stat="mean",
+    lookback_days=200,
+)
+_register("ema_9", ema, ["adjusted_close"], warmup=span_warmup(9), span=9)
+_register("ema_20", ema, ["adjusted_close"], warmup=span_warmup(20), span=20)
+_register("rsi_14", rsi, ["avg_gain_14", "avg_loss_14"])
+_register(
+    "high_10d",
+    window_stat,
+    ["high_windows", "high"],
+    warmup=9,
+    stat="max",
+    lookback_days=10,
+)
+_register(
+    "low_10d",
+    window_stat,
+    ["low_windows", "low"],
+    warmup=9,
+    stat="min",
+    lookback_days=10,
+)
+_register(
+    "avg_vol_5d",
+    avg_volume,
+    ["volume_windows", "zero_volume_windows", "volume"],
+    warmup=4,
+    lookback_days=5,
+)
+_register(
+    "avg_vol_20d",
+    avg_volume,
+    ["volume_windows", "zero_volume_windows", "volume"],
+    warmup=19,
+    lookback_days=20,
+)
+_register(
+    "avg_vol_50d",
+    avg_volume,
+    ["volume_windows", "zero_volume_windows", "volume"],
+    warmup=49,
+    lookback_days=50,
+)
+_register(
+    "avg_vol_weighted_change_5d",
+    window_stat,
+    ["weighted_change_windows", "weighted_change"],
+    warmup=4,
+    stat="mean",
+    lookback_days=5,
+    min_periods=1,
+)
+_register(
+    "avg_vol_weighted_change_50d",
+    window_stat,
+    ["weighted_change_windows", "weighted_change"],
+    warmup=49,
+    stat="mean",
+    lookback_days=50,
+    min_periods=1,
+)
+_register(
+    "price_volume_corr_20",
+    rolling_corr,
+    ["percent_change", "volume"],
+    warmup=19,
+    lookback_days=20,
+)
+_register("macd", difference, ["ema_12", "ema_26"])
+_register("macd_signal", ema, ["macd"], warmup=span_warmup(9), span=9)
+_register("macd_hist", difference, ["macd", "macd_signal"])
+_register(
+    "atr_14",
+    wilder,
+    ["true_range", "valid"],
+    warmup=ewm_warmup(1 / 14),
+    lookback_days=14,
+)
+_register("close_position", close_position, ["close", "high", "low"])
+_register("percent_change", percent_change, ["close"], warmup=1)
+_register("range_pct_20", range_pct, ["close_max_20", "close_min_20"])
+_register("breakout_proximity_20", breakout_proximity, ["close", "close_max_20"])
+_register(
+    "rolling_volatility_20", normalized_volatility, ["close_std_20", "close_mean_20"]
+)
@@ -0,0 +1,127 @@
+from typing import Optional
+
+import numpy as np
+
+
+class RollingWindows:
+    """
+    Trailing-window statistics of a (bars,) or (bars × securities) array, for any
+    number of window lengths from a single set of prefix sums.
+
+    Counts, sums and sums of squares are accumulated once along the bar axis; each
+    mean or std is then two vectorized differences of those prefix sums, whatever the
+    window length. Values are centred on each column's first valid value before
+    accumulating, which keeps the prefix sums small and the differences accurate.
+    NaN cells are skipped, as pandas' rolling does, so the results match
+    .rolling(window, min_periods) on a Series or on every column of a panel.
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype="float64")
+        self._one_dimensional = values.ndim == 1
+        self.values = values.reshape(len(values), -1)
+
+        valid = ~np.isnan(self.values)
+        first_valid = np.where(valid.any(axis=0), valid.argmax(axis=0), 0)
+        offset = self.values[first_valid, np.arange(self.values.shape[1])]
+        self._offset = np.where(np.isnan(offset), 0.0, offset)
+
+        self._centered = np.where(valid, self.values - self._offset, 0.0)
+        self._count = _prefix(valid.astype("float64"))
+        self._sum = _prefix(self._centered)
+        self._sum_sq: Optional[np.ndarray] = None
+
+    def count(self, window: int) -> np.ndarray:
+        return self._shape(_window_difference(self._count, window))
+
+    def sum(self, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+        count = _window_difference(self._count, window)
+        total = _window_difference(self._sum, window) + count * self._offset
+        return self._shape(self._require(total, count, window, min_periods))
+
+    def mean(self, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+        count = _window_difference(self._count, window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = _window_difference(self._sum, window) / count + self._offset
+        return self._shape(self._require(mean, count, window, min_periods))
+
+    def std(
+        self, window: int, min_periods: Optional[int] = None, ddof: int = 1
+    ) -> np.ndarray:
+        if self._sum_sq is None:
+            self._sum_sq = _prefix(self._centered**2)
+
+        count = _window_difference(self._count, window)
+        total = _window_difference(self._sum, window)
+        total_sq = _window_difference(self._sum_sq, window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (total_sq - total * total / count) / (count - ddof)
+        std = np.sqrt(np.maximum(variance, 0.0))
+        std[count <= ddof] = np.nan
+        return self._shape(self._require(std, count, window, min_periods))
+
+    def max(self, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+        extreme = _sliding_extreme(self.values, window, np.fmax)
+        count = _window_difference(self._count, window)
+        return self._shape(self._require(extreme, count, window, min_periods))
+
+    def min(self, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+        extreme = _sliding_extreme(self.values, window, np.fmin)
+        count = _window_difference(self._count, window)
+        return self._shape(self._require(extreme, count, window, min_periods))
+
+    @staticmethod
+    def _require(
+        result: np.ndarray, count: np.ndarray, window: int, min_periods: Optional[int]
+    ) -> np.ndarray:
+        required = window if min_periods is None else max(min_periods, 1)
+        return np.where(count >= required, result, np.nan)
+
+    def _shape(self, result: np.ndarray) -> np.ndarray:
+        return result[:, 0] if self._one_dimensional else result
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    # Leading zero row so a window's total is prefix[end] - prefix[start]
+    prefix = np.zeros((values.shape[0] + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=prefix[1:])
+    return prefix
+
+
+def _window_difference(prefix: np.ndarray, window: int) -> np.ndarray:
+    n_bars = prefix.shape[0] - 1
+    starts = np.maximum(np.arange(1, n_bars + 1) - window, 0)
+    return prefix[1:] - prefix[starts]
+
+
+def _sliding_extreme(
+    values: np.ndarray,
+    window: int,
+    reduce: np.ufunc,
+) -> np.ndarray:
+    """
+    Trailing max/min of every window in O(bars) per window length (van Herk /
+    Gil-Werman): split the bars into blocks of `window`, accumulate the extreme
+    forwards and backwards within each block, and combine the two at each window.
+    It is the vectorized counterpart of a monotonic deque. NaN is ignored via
+    np.fmax / np.fmin.
+    """
+    n_bars, n_columns = values.shape
+    if n_bars == 0:
+        return values.copy()
+    window = min(window, n_bars)
+
+    # Front-pad so each window ends at a block boundary or spans exactly two blocks
+    n_blocks = -(-(n_bars + window - 1) // window)
+    padded = np.full((n_blocks * window, n_columns), np.nan)
+    padded[window - 1 : window - 1 + n_bars] = values
+
+    blocks = padded.reshape(n_blocks, window, n_columns)
+    forward = reduce.accumulate(blocks, axis=1).reshape(-1, n_columns)
+    backward = reduce.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(
+        -1, n_columns
+    )
+
+    # Window ending at padded row e covers rows e - window + 1 .. e
+    ends = np.arange(window - 1, window - 1 + n_bars)
+    return reduce(backward[ends - window + 1], forward[ends])
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def rolling_volatility(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     """
@@ -15,6 +17,12 @@ def rolling_volatility(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     if "close" not in df.columns:
         raise ValueError("DataFrame must include 'close' column")
 
-    rolling_std = df["close"].rolling(window=lookback_days, min_periods=1).std()
-    rolling_mean = df["close"].rolling(window=lookback_days, min_periods=1).mean()
-    return rolling_std / rolling_mean.replace(0, pd.NA)
+    close = df["close"]
+    windows = registry.windows(close)
+    rolling_std = registry.window_stat(
+        windows, close, "std", lookback_days, min_periods=1
+    )
+    rolling_mean = registry.window_stat(
+        windows, close, "mean", lookback_days, min_periods=1
+    )
+    return registry.normalized_volatility(rolling_std, rolling_mean)
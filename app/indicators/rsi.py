@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def rsi(df: pd.DataFrame, lookback_days: int = 14) -> pd.Series:
     """
@@ -15,13 +17,10 @@ def rsi(df: pd.DataFrame, lookback_days: int = 14) -> pd.Series:
     if "adjusted_close" not in df.columns:
         raise ValueError("DataFrame must contain 'adjusted_close' column.")
 
-    delta = df["adjusted_close"].diff()
-
-    gain = delta.where(delta > 0, 0.0)
-    loss = -delta.where(delta < 0, 0.0)
+    delta = registry.delta(df["adjusted_close"])
+    valid = pd.Series(True, index=df.index)
 
-    avg_gain = gain.ewm(alpha=1 / lookback_days, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1 / lookback_days, adjust=False).mean()
+    avg_gain = registry.wilder(registry.gain(delta), valid, lookback_days)
+    avg_loss = registry.wilder(registry.loss(delta), valid, lookback_days)
 
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+    return registry.rsi(avg_gain, avg_loss)
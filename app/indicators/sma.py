@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def sma(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     """
@@ -18,8 +20,7 @@ def sma(df: pd.DataFrame, lookback_days: int) -> pd.Series:
             "DataFrame must contain 'adjusted_close' column from ohlcv_daily"
         )
 
-    return (
-        df["adjusted_close"]
-        .rolling(window=lookback_days, min_periods=lookback_days)
-        .mean()
+    adjusted_close = df["adjusted_close"]
+    return registry.window_stat(
+        registry.windows(adjusted_close), adjusted_close, "mean", lookback_days
     )
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.indicators import registry
+
 
 def volume_weighted_change(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     """
@@ -15,6 +17,13 @@ def volume_weighted_change(df: pd.DataFrame, lookback_days: int) -> pd.Series:
     if not {"close", "volume"}.issubset(df.columns):
         raise ValueError("DataFrame must include 'close' and 'volume' columns")
 
-    percent_change = df["close"].pct_change().abs()
-    weighted_change = df["volume"] * percent_change
-    return weighted_change.rolling(window=lookback_days, min_periods=1).mean()
+    weighted_change = registry.weighted_change(
+        df["volume"], registry.percent_change(df["close"])
+    )
+    return registry.window_stat(
+        registry.windows(weighted_change),
+        weighted_change,
+        "mean",
+        lookback_days,
+        min_periods=1,
+    )
@@ -40,3 +40,6 @@ class ExecutionStrategy(BaseModel):
     exit: ExitConfig
     max_hold_days: int = Field(ge=1)
     active: bool = False
+
+    def required_columns(self) -> set[str]:
+        return {self.exit.stop_offset.unit.value, self.exit.target_offset.unit.value}
@@ -0,0 +1,22 @@
+from datetime import date
+
+from sqlmodel import Field
+
+from app.models.base_model import BaseModel
+
+
+class IndicatorInvalidationBase(BaseModel, table=False):  # type: ignore[call-arg]
+    """
+    A security whose candles were inserted or corrected in the middle of its history
+    since its indicators were computed. Indicators from earliest_changed_date on are
+    stale until recompute_invalidated_indicators clears the row.
+    """
+
+    security_id: int = Field(foreign_key="security.id", primary_key=True)
+    earliest_changed_date: date = Field(
+        description="Earliest candle date inserted or corrected since the last recompute"
+    )
+
+
+class IndicatorInvalidation(IndicatorInvalidationBase, table=True):  # type: ignore[call-arg]
+    __tablename__ = "indicator_invalidation"
@@ -0,0 +1,55 @@
+from datetime import date
+from typing import List
+
+from sqlalchemy import Float
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Column, Field
+
+from app.models.base_model import BaseModel
+
+
+class IndicatorStateBase(BaseModel, table=False):  # type: ignore[call-arg]
+    """
+    Rolling state needed to advance a security's indicators by one candle without
+    reloading history: the recursive (EMA-family) values plus the trailing windows
+    the rolling indicators read from.
+    """
+
+    security_id: int = Field(foreign_key="security.id", primary_key=True)
+    as_of_date: date = Field(
+        description="Candle date of the last candle folded into this state"
+    )
+
+    prev_close: float
+    prev_adjusted_close: float
+
+    ema_9: float
+    ema_20: float
+    ema_12: float = Field(description="Short EMA of the MACD line")
+    ema_26: float = Field(description="Long EMA of the MACD line")
+    macd_signal: float
+    rsi_avg_gain: float = Field(description="Wilder-smoothed average gain, 14 days")
+    rsi_avg_loss: float = Field(description="Wilder-smoothed average loss, 14 days")
+    atr_14: float
+
+    adjusted_close_tail: List[float] = Field(
+        default_factory=list, sa_column=Column(ARRAY(Float))
+    )
+    close_tail: List[float] = Field(
+        default_factory=list, sa_column=Column(ARRAY(Float))
+    )
+    high_tail: List[float] = Field(default_factory=list, sa_column=Column(ARRAY(Float)))
+    low_tail: List[float] = Field(default_factory=list, sa_column=Column(ARRAY(Float)))
+    volume_tail: List[float] = Field(
+        default_factory=list, sa_column=Column(ARRAY(Float))
+    )
+    percent_change_tail: List[float] = Field(
+        default_factory=list, sa_column=Column(ARRAY(Float))
+    )
+    weighted_change_tail: List[float] = Field(
+        default_factory=list, sa_column=Column(ARRAY(Float))
+    )
+
+
+class IndicatorState(IndicatorStateBase, table=True):  # type: ignore[call-arg]
+    __tablename__ = "indicator_state"
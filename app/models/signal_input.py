@@ -0,0 +1,20 @@
+from datetime import date
+
+from sqlmodel import Field
+
+from app.models.base_model import BaseModel
+
+
+class SignalInputBase(BaseModel, table=False):  # type: ignore[call-arg]
+    """
+    Hash of a security's combined OHLCV and indicator row on a day, as of the last
+    daily signal run, so the next run can tell which securities changed.
+    """
+
+    signal_date: date = Field(primary_key=True)
+    security_id: int = Field(foreign_key="security.id", primary_key=True)
+    row_hash: str
+
+
+class SignalInput(SignalInputBase, table=True):  # type: ignore[call-arg]
+    __tablename__ = "signal_input"
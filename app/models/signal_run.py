@@ -0,0 +1,24 @@
+from datetime import date
+
+from sqlmodel import Field
+
+from app.models.base_model import BaseModel
+
+
+class SignalRunBase(BaseModel, table=False):  # type: ignore[call-arg]
+    """
+    The inputs a strategy's signals for a day were last generated from: its config
+    and the indicator rows of that day. Signals whose inputs are unchanged are not
+    generated again.
+    """
+
+    strategy_id: str = Field(primary_key=True)
+    signal_date: date = Field(primary_key=True)
+    config_hash: str = Field(description="strategy_config_hash of the strategy")
+    data_version: str = Field(
+        description="input_fingerprint of the day's indicator rows the run read"
+    )
+
+
+class SignalRun(SignalRunBase, table=True):  # type: ignore[call-arg]
+    __tablename__ = "signal_run"
@@ -0,0 +1,64 @@
+from enum import Enum
+from typing import Iterable, Set, Tuple
+
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field
+
+from app.models.base_model import BaseModel
+from app.models.stock_index_constituent import SP500
+
+
+class ConstituentChange(str, Enum):
+    ADD = "add"
+    REMOVE = "remove"
+
+
+class StockIndexConstituentDeltaBase(BaseModel, table=False):  # type: ignore[call-arg]
+    """
+    A single membership change recorded against a delta snapshot. Deltas are always
+    relative to the snapshot immediately before it (by snapshot_date) for the same index.
+    """
+
+    index_name: str = Field(default=SP500, index=True)
+    snapshot_id: int = Field(foreign_key="stock_index_snapshot.id", index=True)
+    security_id: int = Field(foreign_key="security.id")
+    change: ConstituentChange
+
+
+class StockIndexConstituentDelta(StockIndexConstituentDeltaBase, table=True):  # type: ignore[call-arg]
+    __tablename__ = "stock_index_constituent_delta"
+
+    id: int = Field(default=None, primary_key=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "snapshot_id", "security_id", name="uq_constituent_delta_snapshot_security"
+        ),
+        {"extend_existing": True},
+    )
+
+
+class StockIndexConstituentDeltaCreate(StockIndexConstituentDeltaBase):
+    pass
+
+
+def diff_constituents(
+    previous: Set[int], current: Set[int]
+) -> Tuple[Set[int], Set[int]]:
+    """Return (added, removed) security ids going from `previous` to `current`."""
+    return current - previous, previous - current
+
+
+def replay_deltas(
+    base: Set[int], deltas: Iterable[Tuple[int, ConstituentChange]]
+) -> Set[int]:
+    """
+    Apply (security_id, change) pairs, in snapshot order, on top of a full membership set.
+    """
+    members = set(base)
+    for security_id, change in deltas:
+        if change == ConstituentChange.ADD:
+            members.add(security_id)
+        else:
+            members.discard(security_id)
+    return members
@@ -18,6 +18,11 @@ class StockIndexSnapshot(BaseModel, table=True):  # type: ignore[call-arg]
         index=True,
         description="As historic data is added this represents when this version of the index was actual",
     )
+    is_delta: bool = Field(
+        default=False,
+        description="True when membership is stored as adds/removes against the previous snapshot, "
+        "False when the full constituent set is materialized",
+    )
     constituents: list["StockIndexConstituent"] = Relationship(  # type: ignore[name-defined]  # noqa: F821
         back_populates="snapshot"
     )
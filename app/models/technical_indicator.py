@@ -1,11 +1,24 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel as PydanticBase, Field as PydanticField
-from sqlmodel import Field
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Column, Field
 
 from app.models.base_model import BaseModel
 
+# Universe-relative columns, computed per date across all securities after the
+# per-security indicators (see app.indicators.cross_sectional)
+CROSS_SECTIONAL_COLUMNS = [
+    "rsi_14_pct_rank",
+    "percent_change_pct_rank",
+    "relative_volume_pct_rank",
+    "rsi_14_sector_z",
+    "percent_change_sector_z",
+    "relative_volume_sector_z",
+]
+
 
 class TechnicalIndicatorBase(BaseModel, table=False):  # type: ignore[call-arg]
     security_id: int = Field(
@@ -119,10 +132,42 @@ class TechnicalIndicatorBase(BaseModel, table=False):  # type: ignore[call-arg]
         "measures relative price stability",
     )
 
+    rsi_14_pct_rank: Optional[float] = Field(
+        default=None,
+        description="Percentile rank (0, 1] of rsi_14 across the universe on the same day",
+    )
+    percent_change_pct_rank: Optional[float] = Field(
+        default=None,
+        description="Percentile rank (0, 1] of percent_change across the universe on the same day",
+    )
+    relative_volume_pct_rank: Optional[float] = Field(
+        default=None,
+        description="Percentile rank (0, 1] of volume / avg_vol_20d across the universe on the same day",
+    )
+    rsi_14_sector_z: Optional[float] = Field(
+        default=None,
+        description="Z-score of rsi_14 within the security's GICS sector on the same day",
+    )
+    percent_change_sector_z: Optional[float] = Field(
+        default=None,
+        description="Z-score of percent_change within the security's GICS sector on the same day",
+    )
+    relative_volume_sector_z: Optional[float] = Field(
+        default=None,
+        description="Z-score of volume / avg_vol_20d within the security's GICS sector on the same day",
+    )
+
 
 class TechnicalIndicator(TechnicalIndicatorBase, table=True):  # type: ignore[call-arg]
     __tablename__ = "technical_indicator"
 
+    missing_columns: Optional[List[str]] = Field(
+        default=None,
+        sa_column=Column(ARRAY(String)),
+        description="Indicator columns skipped by a lazy computation and not yet "
+        "backfilled; NULL when the row is complete",
+    )
+
 
 class TechnicalIndicatorRead(TechnicalIndicatorBase):  # type: ignore[call-arg]
     id: int
@@ -176,6 +221,14 @@ class CombinedSignalRow(PydanticBase):
     breakout_proximity_20: Optional[float]
     rolling_volatility_20: Optional[float]
 
+    # cross-sectional metrics
+    rsi_14_pct_rank: Optional[float] = None
+    percent_change_pct_rank: Optional[float] = None
+    relative_volume_pct_rank: Optional[float] = None
+    rsi_14_sector_z: Optional[float] = None
+    percent_change_sector_z: Optional[float] = None
+    relative_volume_sector_z: Optional[float] = None
+
     # Optional: computed fields
     strategy_score: Optional[float] = None
 
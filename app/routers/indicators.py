@@ -1,11 +1,18 @@
 from datetime import date
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
 
 from app.core.db import get_db
+from app.handlers.ohlcv_daily import OHLCVDailyHandler
 from app.handlers.technical_indicator import TechnicalIndicatorHandler
+from app.indicators.lazy import ensure_indicator_columns
+from app.indicators.on_demand import (
+    IndicatorSpec,
+    OnDemandIndicatorError,
+    compute_on_demand_indicators,
+)
 from app.models.technical_indicator import TechnicalIndicatorRead
 from app.utils import Log
 
@@ -23,6 +30,46 @@ router = APIRouter(
 )
 
 
+@router.get(
+    "/{security_id}/on-demand",
+    status_code=status.HTTP_200_OK,
+    response_model=List[Dict[str, Any]],
+)
+def list_on_demand_indicators(
+    security_id: int,
+    indicator: List[str] = Query(..., description="e.g. sma(100) or rsi(7)"),
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    db_session: Session = Depends(get_db),
+):
+    try:
+        specs = [IndicatorSpec.parse(text) for text in indicator]
+    except OnDemandIndicatorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    # Clamp the range to the security's candles, the default when omitted
+    handler = OHLCVDailyHandler(db_session)
+    first_candle = handler.get_earliest_candle_date(security_id)
+    last_candle = handler.get_latest_candle_date(security_id)
+    if first_candle is None or last_candle is None:
+        Log.info(f"No candles found for security {security_id}")
+        return []
+    from_date = max(from_date or first_candle, first_candle)
+    to_date = min(to_date or last_candle, last_candle)
+
+    df = compute_on_demand_indicators(
+        db_session, specs, [security_id], from_date, to_date
+    )
+    if df.empty:
+        Log.info(
+            f"No candles found for security {security_id} in range {from_date}..{to_date}"
+        )
+        return []
+
+    df = df.drop(columns="security_id").astype(object)
+    return df.where(df.notna(), None).to_dict(orient="records")
+
+
 @router.get(
     "/{security_id}",
     status_code=status.HTTP_200_OK,
@@ -35,6 +82,14 @@ def list_indicators(
     fields: Optional[List[str]] = Query(None),
     db_session: Session = Depends(get_db),
 ):
+    ensure_indicator_columns(
+        db_session,
+        [security_id],
+        from_date or date.min,
+        to_date or date.max,
+        fields or TechnicalIndicatorHandler.get_indicator_columns(),
+    )
+
     indicators = TechnicalIndicatorHandler(
         db_session
     ).get_selected_fields_for_security_between_dates(
@@ -0,0 +1,40 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.models.signal_strategy import SignalStrategy
+from app.services.screener_service import SCREENER
+
+INTERFACE = "screener"
+
+router = APIRouter(
+    prefix=f"/{INTERFACE}",
+    tags=[INTERFACE.capitalize()],
+    responses={
+        400: {"detail": "Error details"},
+        401: {"detail": "Access token was not provided"},
+        403: {"detail": "Not authenticated"},
+        404: {"detail": "Error details"},
+    },
+)
+
+
+@router.post(
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=List[Dict[str, Any]],
+)
+def screen(rules: SignalStrategy):
+    try:
+        df = SCREENER.screen(rules)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict(orient="records")
+
+
+@router.post("/refresh", status_code=status.HTTP_200_OK)
+def refresh_snapshot():
+    snapshot = SCREENER.refresh()
+    return {"measurement_date": snapshot.measurement_date, "rows": len(snapshot.df)}
@@ -0,0 +1,139 @@
+import threading
+import time
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Optional
+
+import pandas as pd
+
+from app.core.db import get_db
+from app.core.settings import get_settings
+from app.handlers.security import SecurityHandler
+from app.handlers.technical_indicator import (
+    COMBINED_PRICE_COLUMNS,
+    TechnicalIndicatorHandler,
+)
+from app.models.signal_strategy import SignalStrategy
+from app.signals.compiled import compile_strategy
+from app.signals.evaluator import StrategyEvaluator
+from app.utils.log_wrapper import Log
+
+settings = get_settings()
+
+# Columns every screen result starts with, followed by the columns its rules read
+RESULT_COLUMNS = ["security_id", "symbol", "measurement_date", "score"]
+
+
+@dataclass(frozen=True)
+class FeatureSnapshot:
+    """Combined OHLCV and indicator rows of every security on one trading day."""
+
+    measurement_date: Optional[date]
+    df: pd.DataFrame
+    evaluator: StrategyEvaluator
+    loaded_at: float  # time.monotonic()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "FeatureSnapshot":
+        return cls(
+            measurement_date=df["measurement_date"].max() if not df.empty else None,
+            df=df,
+            evaluator=StrategyEvaluator(df),
+            loaded_at=time.monotonic(),
+        )
+
+
+def load_latest_feature_frame() -> pd.DataFrame:
+    """
+    Every stored OHLCV and indicator column of the latest trading day with
+    indicators, one row per security, with its symbol. Lazily skipped indicators
+    are not backfilled here and read as missing.
+    """
+    with next(get_db()) as db_session:
+        handler = TechnicalIndicatorHandler(db_session)
+        latest = handler.get_latest_measurement_date()
+        if latest is None:
+            return pd.DataFrame(columns=["security_id", "symbol", "measurement_date"])
+
+        columns = [*COMBINED_PRICE_COLUMNS, "volume", *handler.get_indicator_columns()]
+        df = handler.get_combined_frame_between_dates(latest, latest, columns)
+        symbols = {
+            security.id: security.symbol
+            for security in SecurityHandler(db_session).get_all()
+        }
+
+    df.insert(1, "symbol", df["security_id"].map(symbols))
+    return df
+
+
+class ScreenerService:
+    """
+    Screens ad-hoc rule sets against an in-memory snapshot of the latest trading
+    day, with the same filter and ranking semantics as signal generation.
+
+    The snapshot is loaded on first use and again once it is older than
+    max_age_seconds, so a long-lived process picks up the next EOD run; refresh
+    reloads it right away. Columns are converted to arrays and each distinct filter
+    term is evaluated once per snapshot, so repeated screens only pay for new rules,
+    the row slice and the ranking.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], pd.DataFrame] = load_latest_feature_frame,
+        max_age_seconds: float = settings.SCREENER_REFRESH_SECONDS,
+    ) -> None:
+        self.load = load
+        self.max_age_seconds = max_age_seconds
+        self._snapshot: Optional[FeatureSnapshot] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> FeatureSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and not self._is_stale(snapshot):
+            return snapshot
+
+        with self._lock:
+            # Another request may have reloaded it while this one waited
+            if self._snapshot is snapshot:
+                return self._reload()
+            assert self._snapshot is not None
+            return self._snapshot
+
+    def refresh(self) -> FeatureSnapshot:
+        with self._lock:
+            return self._reload()
+
+    def screen(self, rules: SignalStrategy) -> pd.DataFrame:
+        """
+        Rows of the snapshot that pass rules' default and signal filters, ranked and
+        cut to its max_signals_per_day, with the columns the rules read. Raises
+        ValueError or KeyError if rules read a column the snapshot does not have.
+        """
+        snapshot = self.snapshot()
+        compiled = compile_strategy(rules)
+        columns = RESULT_COLUMNS + sorted(
+            compiled.eod_columns & set(snapshot.df.columns)
+        )
+        if snapshot.df.empty:
+            return pd.DataFrame(columns=columns)
+
+        ranked = snapshot.evaluator.evaluate(rules)
+        return ranked.reindex(columns=columns).reset_index(drop=True)
+
+    def _is_stale(self, snapshot: FeatureSnapshot) -> bool:
+        return time.monotonic() - snapshot.loaded_at > self.max_age_seconds
+
+    def _reload(self) -> FeatureSnapshot:
+        started = time.perf_counter()
+        snapshot = FeatureSnapshot.from_frame(self.load())
+        self._snapshot = snapshot
+        Log.info(
+            f"[SCREENER] Loaded {len(snapshot.df)} rows of {snapshot.measurement_date} "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        return snapshot
+
+
+SCREENER = ScreenerService()
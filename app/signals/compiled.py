@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import FrozenSet
+
+from app.core.settings import get_settings
+from app.models.signal_strategy import SignalStrategy
+from app.signals.filters import (
+    FilterPlan,
+    compile_filter_rules,
+    compile_signal_filters,
+    strategy_config_hash,
+)
+from app.signals.ranking import RankingPlan, compile_ranking
+from app.utils.lru import LRUCache
+
+
+@dataclass(frozen=True)
+class CompiledStrategy:
+    """
+    Everything evaluating a signal strategy needs that depends only on its config:
+    the columns it reads, its default and signal filters as one plan, its open
+    validation filters, and its ranking formulas.
+    """
+
+    strategy: SignalStrategy
+    config_hash: str
+    eod_columns: FrozenSet[str]
+    sod_columns: FrozenSet[str]
+    filter_plan: FilterPlan
+    open_filter_plan: FilterPlan
+    ranking_plan: RankingPlan
+
+
+def compile_strategy(signal_strategy: SignalStrategy) -> CompiledStrategy:
+    """
+    The compiled form of signal_strategy, built once per distinct config: strategies
+    with the same content (see strategy_config_hash) share one CompiledStrategy, and
+    an edited strategy gets a new one. The least recently used configs are dropped
+    beyond COMPILED_STRATEGY_CACHE_SIZE, so hot-reloaded edits, sweep variants and
+    screener rule sets do not accumulate.
+    """
+    key = strategy_config_hash(signal_strategy)
+    compiled = _COMPILED_STRATEGIES.get(key)
+    if compiled is None:
+        compiled = CompiledStrategy(
+            strategy=signal_strategy,
+            config_hash=key,
+            eod_columns=frozenset(signal_strategy.required_eod_columns()),
+            sod_columns=frozenset(signal_strategy.required_sod_columns()),
+            filter_plan=compile_signal_filters(signal_strategy),
+            open_filter_plan=compile_filter_rules(
+                signal_strategy.validate_at_open_filters
+            ),
+            ranking_plan=compile_ranking(signal_strategy),
+        )
+        _COMPILED_STRATEGIES.put(key, compiled)
+    return compiled
+
+
+# Compiled strategies by strategy_config_hash
+_COMPILED_STRATEGIES: LRUCache[CompiledStrategy] = LRUCache(
+    get_settings().COMPILED_STRATEGY_CACHE_SIZE
+)
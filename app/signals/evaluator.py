@@ -0,0 +1,67 @@
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.models.signal_strategy import SignalStrategy
+from app.signals.compiled import compile_strategy
+from app.signals.filters import ColumnArrays, FilterPlan, FilterTerm
+from app.utils.log_wrapper import Log
+
+
+class StrategyEvaluator:
+    """
+    Evaluates any number of signal strategies against one feature frame (combined
+    OHLCV and indicator rows for one or more dates).
+
+    Each strategy is compiled once per distinct config (see compile_strategy). Every
+    distinct term is evaluated once over the whole frame and its mask shared by
+    every strategy that uses it: the default NaN, price, volume and ATR filters,
+    and custom rules such as close > sma_50 that appear in several strategies.
+    Columns are converted to arrays once, and a strategy's rows are sliced from the
+    frame once, after all of its masks are combined. Results match
+    apply_strategy_filters and apply_strategy_ranking run on the frame per strategy.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self.hits = 0
+        self._columns = ColumnArrays(df)
+        self._masks: Dict[FilterTerm, np.ndarray] = {}
+
+    def evaluate(
+        self, signal_strategy: SignalStrategy, by: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Filtered and ranked rows of the frame for signal_strategy, see ranking."""
+        compiled = compile_strategy(signal_strategy)
+        mask = self.mask(compiled.filter_plan)
+        Log.info(
+            f"{int(mask.sum())} of {len(self.df)} rows remaining after applying "
+            f"{signal_strategy.name} filters."
+        )
+        return compiled.ranking_plan.apply(self.df[mask], by=by)
+
+    def mask(self, plan: FilterPlan) -> np.ndarray:
+        mask = np.ones(len(self.df), dtype=bool)
+        for term in plan.terms:
+            term_mask = self._masks.get(term)
+            if term_mask is None:
+                term_mask = term.evaluate(self._columns)
+                self._masks[term] = term_mask
+            else:
+                self.hits += 1
+            mask &= term_mask
+        return mask
+
+
+def evaluate_strategies(
+    df: pd.DataFrame,
+    signal_strategies: Iterable[SignalStrategy],
+    by: Optional[str] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Ranked signals of each strategy over one shared frame, by strategy_id."""
+    evaluator = StrategyEvaluator(df)
+    return {
+        strategy.strategy_id: evaluator.evaluate(strategy, by=by)
+        for strategy in signal_strategies
+    }
@@ -1,12 +1,21 @@
-from typing import List
+import hashlib
 
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
+from app.core.settings import get_settings
 from app.models.signal_strategy import FilterRule, SignalStrategy
+from app.utils.lru import LRUCache
 
 # This assumes USD
 # TODO replace with a currency specific version later
 PRICE_FLOOR = 5
+MIN_VOLUME = 1_000_000
+MIN_ATR_PCT = 0.015
 
 MIN_EARLY_VOL_PERCENT = 0.01
 MAX_GAP_ABS = 0.05
@@ -16,20 +25,8 @@ OPEN_STALENESS_SECONDS = 60
 def apply_default_signal_filters(
     df: pd.DataFrame, required_columns: set[str]
 ) -> pd.DataFrame:
-    # 1. Drop rows with NaNs in required columns
-    for col in required_columns:
-        df = df[df[col].notna()]
-
-    # 2. Apply price filter
-    df = df[df["close"] >= PRICE_FLOOR]
-
-    # 3. Apply volume filter
-    df = df[df["volume"] >= 1_000_000]
-
-    # 4. Apply ATR% filter: atr / entry_price >= 0.015
-    df = df[(df["atr_14"] / df["close"]) >= 0.015]
-
-    return df
+    # Drop rows with NaNs in required columns, then price, volume and ATR% floors
+    return FilterPlan(default_filter_terms(frozenset(required_columns))).apply(df)
 
 
 def apply_default_open_validation_filters(
@@ -73,52 +70,156 @@ def apply_validate_at_open_filters(
     return apply_filters(df, strategy_config.validate_at_open_filters)
 
 
+def apply_strategy_filters(
+    df: pd.DataFrame, strategy_config: SignalStrategy
+) -> pd.DataFrame:
+    """
+    apply_default_signal_filters followed by apply_signal_filters, evaluated as one
+    compiled plan: a single mask, and the surviving rows copied once.
+    """
+    return compile_signal_filters(strategy_config).apply(df)
+
+
 def apply_filters(df: pd.DataFrame, filters: List[FilterRule]) -> pd.DataFrame:
     """Return only rows that pass all rules."""
     if not filters:
         return df
-    mask = pd.Series(True, index=df.index)
-    for rule in filters:
-        mask &= _build_filter_mask(df, rule)
-    return df[mask].copy()
-
-
-def _build_filter_mask(df: pd.DataFrame, rule: FilterRule) -> pd.Series:
-    left_hand_side = rule.indicator
-
-    if left_hand_side not in df.columns:
-        raise ValueError(f"Missing indicator column in DataFrame: '{left_hand_side}'")
-
-    # Determine the right-hand side of the comparison
-    right_hand_side: pd.Series | float
-
+    return compile_filter_rules(filters).apply(df)
+
+
+@dataclass(frozen=True)
+class FilterTerm:
+    """
+    One condition of a FilterPlan over a frame's columns. Terms are values: two equal
+    terms always produce the same mask, so plans can share them.
+    """
+
+    column: str
+    comparison: str  # "notna", ">", ">=", "<", "==" or "between"
+    value: float = 0.0  # threshold, multiplier of comparison_field, or between's min
+    upper: float = 0.0  # between's max
+    comparison_field: Optional[str] = None
+    divisor: Optional[str] = None  # compare column / divisor instead of column
+
+    def evaluate(self, columns: "ColumnArrays") -> np.ndarray:
+        left = columns.get(self.column)
+        if self.comparison == "notna":
+            return ~np.isnan(left)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self.divisor is not None:
+                left = left / columns.get(self.divisor)
+            if self.comparison == "between":
+                return (left >= self.value) & (left <= self.upper)
+
+            right: np.ndarray | float = self.value
+            if self.comparison_field is not None:
+                right = self.value * columns.get(
+                    self.comparison_field, "comparison field"
+                )
+            return COMPARISONS[self.comparison](left, right)
+
+
+class ColumnArrays:
+    """A frame's columns as float64 arrays (NaN for missing values), converted once."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str, kind: str = "indicator column") -> np.ndarray:
+        array = self._arrays.get(name)
+        if array is None:
+            if name not in self.df.columns:
+                raise ValueError(f"Missing {kind} in DataFrame: '{name}'")
+            array = self.df[name].to_numpy(dtype="float64", na_value=np.nan)
+            self._arrays[name] = array
+        return array
+
+
+@dataclass(frozen=True)
+class FilterPlan:
+    """
+    Filter rules compiled to NumPy: every term is evaluated on column arrays and
+    and-ed into one mask in place, and rows are only materialized once at the end.
+    """
+
+    terms: Tuple[FilterTerm, ...]
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        columns = ColumnArrays(df)
+        mask = np.ones(len(df), dtype=bool)
+        for term in self.terms:
+            mask &= term.evaluate(columns)
+        return mask
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[self.mask(df)].copy()
+
+
+def compile_filter_rules(rules: Iterable[FilterRule]) -> FilterPlan:
+    return FilterPlan(tuple(dict.fromkeys(_rule_term(rule) for rule in rules)))
+
+
+@lru_cache(maxsize=256)
+def default_filter_terms(required_columns: FrozenSet[str]) -> Tuple[FilterTerm, ...]:
+    return tuple(FilterTerm(column, "notna") for column in sorted(required_columns)) + (
+        FilterTerm("close", ">=", PRICE_FLOOR),
+        FilterTerm("volume", ">=", MIN_VOLUME),
+        FilterTerm("atr_14", ">=", MIN_ATR_PCT, divisor="close"),
+    )
+
+
+def compile_signal_filters(strategy_config: SignalStrategy) -> FilterPlan:
+    """
+    The default and signal filters of a strategy as one plan, compiled once per
+    distinct strategy config (see strategy_config_hash).
+    """
+    key = strategy_config_hash(strategy_config)
+    plan = _COMPILED_SIGNAL_FILTERS.get(key)
+    if plan is None:
+        terms = (
+            default_filter_terms(frozenset(strategy_config.required_eod_columns()))
+            + compile_filter_rules(strategy_config.signal_filters).terms
+        )
+        plan = FilterPlan(tuple(dict.fromkeys(terms)))
+        _COMPILED_SIGNAL_FILTERS.put(key, plan)
+    return plan
+
+
+def strategy_config_hash(strategy_config: SignalStrategy) -> str:
+    return hashlib.sha256(strategy_config.model_dump_json().encode()).hexdigest()
+
+
+def _rule_term(rule: FilterRule) -> FilterTerm:
     if rule.comparison == "between":
         # 'value' is not used for 'between' — it's min/max-based
         if rule.min is None or rule.max is None:
             raise ValueError(
                 f"'between' comparison requires 'min' and 'max' values: {rule}"
             )
-        return (df[left_hand_side] >= rule.min) & (df[left_hand_side] <= rule.max)
-
-    # Otherwise, all other comparisons require a numeric 'value'
-    base_value = rule.value
+        return FilterTerm(rule.indicator, "between", rule.min, upper=rule.max)
 
-    if rule.comparison_field:
-        right_hand_side_field = rule.comparison_field
-        if right_hand_side_field not in df.columns:
-            raise ValueError(
-                f"Missing comparison field in DataFrame: '{right_hand_side_field}'"
-            )
-        right_hand_side = base_value * df[right_hand_side_field]
-    else:
-        right_hand_side = base_value
-
-    # Apply the operator
-    if rule.comparison == ">":
-        return df[left_hand_side] > right_hand_side
-    elif rule.comparison == "<":
-        return df[left_hand_side] < right_hand_side
-    elif rule.comparison == "==":
-        return df[left_hand_side] == right_hand_side
-    else:
+    if rule.comparison not in COMPARISONS:
         raise ValueError(f"Unsupported comparison operator: '{rule.comparison}'")
+
+    return FilterTerm(
+        rule.indicator,
+        rule.comparison,
+        rule.value,
+        comparison_field=rule.comparison_field,
+    )
+
+
+COMPARISONS: Dict[str, Callable[..., np.ndarray]] = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "==": np.equal,
+}
+
+# Compiled plans by strategy_config_hash. Bounded, since the screener compiles
+# arbitrary rule sets from requests.
+_COMPILED_SIGNAL_FILTERS: LRUCache[FilterPlan] = LRUCache(
+    get_settings().COMPILED_STRATEGY_CACHE_SIZE
+)
@@ -0,0 +1,75 @@
+import hashlib
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Set
+
+from app.indicators.on_demand import is_on_demand
+from app.models.signal_run import SignalRun
+from app.models.signal_strategy import SignalStrategy
+from app.signals.compiled import compile_strategy
+
+
+@dataclass
+class SignalRunPlan:
+    """What a daily signal run does with each strategy, see plan_signal_runs."""
+
+    skipped: List[SignalStrategy] = field(default_factory=list)
+    merged: List[SignalStrategy] = field(default_factory=list)
+    full: List[SignalStrategy] = field(default_factory=list)
+
+
+def input_fingerprint(row_hashes: Mapping[int, str]) -> str:
+    """One hash of a day's inputs from {security_id: row hash}."""
+    digest = hashlib.sha256()
+    for security_id, row_hash in sorted(row_hashes.items()):
+        digest.update(f"{security_id}:{row_hash}\n".encode())
+    return digest.hexdigest()
+
+
+def changed_security_ids(
+    previous: Mapping[int, str], current: Mapping[int, str]
+) -> Set[int]:
+    """Securities whose row was added, removed or changed between two days' hashes."""
+    return {
+        security_id
+        for security_id in previous.keys() | current.keys()
+        if previous.get(security_id) != current.get(security_id)
+    }
+
+
+def plan_signal_runs(
+    signal_strategies: List[SignalStrategy],
+    runs: Dict[str, SignalRun],
+    data_version: str,
+    previous_version: str,
+) -> SignalRunPlan:
+    """
+    Sort strategies by what their signals for a day need, from their last run
+    (runs, by strategy_id), the day's current data_version and the data version
+    the previous daily run recorded:
+
+      - skipped: same config, and already generated from the current inputs
+      - merged: same config, generated from the previous inputs, and a row-local
+        ranking, so only the changed securities are ranked again and merged into
+        the stored top N (see merge_top_n)
+      - full: everything else, including strategies that read on-demand
+        indicators, which depend on candle history the row hashes do not cover
+    """
+    plan = SignalRunPlan()
+    for signal_strategy in signal_strategies:
+        compiled = compile_strategy(signal_strategy)
+        run = runs.get(signal_strategy.strategy_id)
+
+        if (
+            run is None
+            or run.config_hash != compiled.config_hash
+            or any(is_on_demand(column) for column in compiled.eod_columns)
+        ):
+            plan.full.append(signal_strategy)
+        elif run.data_version == data_version:
+            plan.skipped.append(signal_strategy)
+        elif run.data_version == previous_version and compiled.ranking_plan.row_local:
+            plan.merged.append(signal_strategy)
+        else:
+            plan.full.append(signal_strategy)
+    return plan
@@ -1,58 +1,229 @@
+from dataclasses import dataclass
+from typing import Collection, FrozenSet, Optional, Tuple
+
 import numpy as np
 import pandas as pd
 
 from app.models.signal_strategy import SignalStrategy
 
 
-def apply_strategy_ranking(
-    df: pd.DataFrame, strategy_config: SignalStrategy
-) -> pd.DataFrame:
-    df = df.copy()
-    df["score"] = 0.0
-    total_weight = 0.0
-
-    for rule in strategy_config.ranking:
-        indicator = rule.indicator
-        weight = float(rule.weight)
-        func = rule.function
-
-        if indicator not in df.columns:
-            raise KeyError(f"Missing indicator column '{indicator}' for ranking rule.")
-
-        if func == "gaussian":
-            assert rule.center is not None and rule.sigma is not None
-            center = rule.center
-            sigma = rule.sigma
-            comp = _gaussian_score(df[indicator], center, sigma)  # ∈ [0,1]
-
-        elif func == "log_ratio":
-            assert rule.max is not None and rule.denominator is not None
-            denom = rule.denominator
-            max_ratio = rule.max
-            if denom not in df.columns:
+@dataclass(frozen=True)
+class RankingTerm:
+    """One weighted ranking formula, with the columns it reads resolved up front."""
+
+    indicator: str
+    function: str  # "gaussian", "log_ratio" or "linear"
+    weight: float
+    center: Optional[float] = None
+    sigma: Optional[float] = None
+    denominator: Optional[str] = None
+    max_ratio: Optional[float] = None
+
+    def score(self, df: pd.DataFrame, groups: Optional[pd.Series]) -> np.ndarray:
+        if self.indicator not in df.columns:
+            raise KeyError(
+                f"Missing indicator column '{self.indicator}' for ranking rule."
+            )
+        values = df[self.indicator]
+
+        if self.function == "gaussian":
+            assert self.center is not None and self.sigma is not None
+            comp = _gaussian_score(values, self.center, self.sigma)  # ∈ [0,1]
+
+        elif self.function == "log_ratio":
+            assert self.max_ratio is not None and self.denominator is not None
+            if self.denominator not in df.columns:
                 raise KeyError(
-                    f"Missing denominator column '{denom}' for log_ratio rule."
+                    f"Missing denominator column '{self.denominator}' for log_ratio "
+                    "rule."
                 )
-            comp = _log_ratio_score(df[indicator], df[denom], max_ratio)  # ∈ [0,1]
+            comp = _log_ratio_score(
+                values, df[self.denominator], self.max_ratio
+            )  # ∈ [0,1]
 
-        elif func == "linear":
-            comp = _linear_score(df[indicator])  # ∈ [0,1]
+        elif self.function == "linear":
+            comp = _linear_score(values, groups)  # ∈ [0,1]
 
         else:
-            raise ValueError(f"Unsupported ranking function: {func}")
+            raise ValueError(f"Unsupported ranking function: {self.function}")
+
+        return comp.to_numpy(dtype="float64")
+
+
+@dataclass(frozen=True)
+class RankingPlan:
+    """A strategy's ranking formulas and how many signals it keeps per day."""
+
+    terms: Tuple[RankingTerm, ...]
+    top_n: int
+
+    @property
+    def columns(self) -> FrozenSet[str]:
+        """Columns the formulas read."""
+        return frozenset(
+            column
+            for term in self.terms
+            for column in (term.indicator, term.denominator)
+            if column
+        )
+
+    @property
+    def row_local(self) -> bool:
+        """Whether a row's score depends only on that row (no linear formulas)."""
+        return all(term.function != "linear" for term in self.terms)
+
+    def scores(self, df: pd.DataFrame, by: Optional[str] = None) -> np.ndarray:
+        """Weighted mean of the ranking formulas per row, in [0, 1]."""
+        groups = df[by] if by is not None else None
+        score = np.zeros(len(df))
+        total_weight = 0.0
+        for term in self.terms:
+            score += term.weight * term.score(df, groups)
+            total_weight += term.weight
+
+        if total_weight > 0:
+            score /= total_weight  # weighted mean keeps score in [0,1]
+
+        # Numerical guard against tiny FP drift
+        return np.clip(score, 0.0, 1.0)
+
+    def apply(self, df: pd.DataFrame, by: Optional[str] = None) -> pd.DataFrame:
+        """See apply_strategy_ranking."""
+        score = self.scores(df, by)
+        positions = top_n_positions(
+            score, self.top_n, df[by] if by is not None else None
+        )
+
+        ranked = df.iloc[positions].copy()
+        ranked["score"] = score[positions]
+        return ranked
+
+
+def apply_strategy_ranking(
+    df: pd.DataFrame, strategy_config: SignalStrategy, by: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Score rows by the strategy's ranking formulas and keep the top
+    max_signals_per_day, highest score first and ties in row order. With by (e.g.
+    measurement_date), rows are ranked within each group as if each group had been
+    ranked alone: linear scores are normalized per group and the top N are kept per
+    group.
+
+    Only the kept rows are copied; see top_n_positions for the selection.
+    """
+    return compile_ranking(strategy_config).apply(df, by)
+
+
+def strategy_scores(
+    df: pd.DataFrame, strategy_config: SignalStrategy, by: Optional[str] = None
+) -> np.ndarray:
+    """Weighted mean of the strategy's ranking formulas per row, in [0, 1]."""
+    return compile_ranking(strategy_config).scores(df, by)
+
+
+def compile_ranking(strategy_config: SignalStrategy) -> RankingPlan:
+    return RankingPlan(
+        terms=tuple(
+            RankingTerm(
+                indicator=rule.indicator,
+                function=rule.function,
+                weight=float(rule.weight),
+                center=rule.center,
+                sigma=rule.sigma,
+                denominator=rule.denominator,
+                max_ratio=rule.max,
+            )
+            for rule in strategy_config.ranking
+        ),
+        top_n=strategy_config.max_signals_per_day,
+    )
+
+
+def top_n_positions(
+    score: np.ndarray, top_n: int, groups: Optional[pd.Series] = None
+) -> np.ndarray:
+    """
+    Positions of the top_n highest scores (per group), ordered by descending score
+    with ties in position order: the rows a stable sort followed by head(top_n), or
+    groupby(groups).head(top_n), keeps, in the same order.
+
+    Each group is reduced with a partial selection (np.partition) rather than a sort,
+    so only the kept rows are ever sorted. NaN scores rank last.
+    """
+    key = np.where(np.isnan(score), -np.inf, score)
+    top_n = max(top_n, 0)
+
+    if groups is None:
+        kept = _top_n(key, np.arange(len(key)), top_n)
+    else:
+        codes = pd.factorize(groups)[0]
+        by_group = np.argsort(codes, kind="stable")
+        starts = np.flatnonzero(np.diff(codes[by_group], prepend=-2))
+        kept = np.concatenate(
+            [np.empty(0, dtype="int64")]
+            + [
+                _top_n(key, positions, top_n)
+                for positions in np.split(by_group, starts[1:])
+                if codes[positions[0]] >= 0  # rows without a group are dropped
+            ]
+        )
+
+    # NaN after -inf keeps sort_values' na_position="last"
+    return kept[np.lexsort((kept, np.isnan(score[kept]), -key[kept]))]
+
+
+def merge_top_n(
+    previous: pd.DataFrame,
+    changed: pd.DataFrame,
+    changed_ids: Collection[int],
+    top_n: int,
+) -> Optional[pd.DataFrame]:
+    """
+    A day's top_n after the rows of changed_ids changed, without ranking the
+    unchanged rows again: previous is the day's top_n before the change and changed
+    the changed securities' ranked rows, both with security_id and score. Order and
+    ties follow top_n_positions on a frame ordered by security_id.
+
+    Only exact for row-local scores (see RankingPlan.row_local). Returns None when
+    the answer depends on unchanged rows previous does not hold: previous was full
+    and fewer than top_n rows now rank at or above its last row.
+    """
+    kept = previous[~previous["security_id"].isin(list(changed_ids))]
+    merged = pd.concat([kept, changed], ignore_index=True)
+    order = np.lexsort(
+        (
+            merged["security_id"].to_numpy(dtype="int64"),
+            -merged["score"].to_numpy(dtype="float64"),
+        )
+    )
+    merged = merged.iloc[order].reset_index(drop=True)
+
+    if len(previous) >= top_n > 0:
+        last = previous.sort_values(
+            ["score", "security_id"], ascending=[False, True]
+        ).iloc[top_n - 1]
+        at_or_above = (merged["score"] > last["score"]) | (
+            (merged["score"] == last["score"])
+            & (merged["security_id"] <= last["security_id"])
+        )
+        if int(at_or_above.sum()) < top_n:
+            return None
 
-        df["score"] += weight * comp
-        total_weight += weight
+    return merged.head(max(top_n, 0))
 
-    if total_weight > 0:
-        df["score"] /= total_weight  # weighted mean keeps score in [0,1]
 
-    # Numerical guard against tiny FP drift
-    df["score"] = df["score"].clip(0.0, 1.0)
+def _top_n(key: np.ndarray, positions: np.ndarray, top_n: int) -> np.ndarray:
+    # positions is ascending; at the cut, the earliest tied positions are kept
+    if top_n >= len(positions):
+        return positions
+    if top_n == 0:
+        return positions[:0]
 
-    # Sort and truncate to N results
-    top_n = strategy_config.max_signals_per_day
-    return df.sort_values(by="score", ascending=False).head(top_n)
+    values = key[positions]
+    threshold = np.partition(values, len(values) - top_n)[len(values) - top_n]
+    above = positions[values > threshold]
+    tied = positions[values == threshold][: top_n - len(above)]
+    return np.concatenate([above, tied])
 
 
 def _gaussian_score(series: pd.Series, center: float, sigma: float) -> pd.Series:
@@ -85,12 +256,13 @@ def _log_ratio_score(
     return pd.Series(out, index=numerator.index).fillna(0.0)
 
 
-def _linear_score(series: pd.Series) -> pd.Series:
-    # Min-max to [0,1]; constant series → all zeros
-    smin = series.min()
-    smax = series.max()
+def _linear_score(series: pd.Series, groups: Optional[pd.Series] = None) -> pd.Series:
+    # Min-max to [0,1] (within each group); constant series → all zeros
+    if groups is None:
+        smin, smax = series.min(), series.max()
+    else:
+        grouped = series.groupby(groups)
+        smin, smax = grouped.transform("min"), grouped.transform("max")
     denom = smax - smin
-    if denom == 0 or np.isclose(denom, 0.0):
-        return pd.Series(0.0, index=series.index)
-    out = (series - smin) / denom
+    out = np.where(np.isclose(denom, 0.0), 0.0, (series - smin) / denom)
     return pd.Series(out, index=series.index).fillna(0.0)
@@ -0,0 +1,145 @@
+import itertools
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.models.signal_strategy import SignalStrategy
+from app.signals.compiled import compile_strategy
+from app.signals.evaluator import StrategyEvaluator
+from app.signals.ranking import top_n_positions
+
+# Columns of each variant's signal set, as EODSignal needs them
+SIGNAL_COLUMNS = ["security_id", "measurement_date", "ohlcv_daily_id", "score"]
+
+# {"max_signals_per_day": [3, 5], "ranking.0.center": [50, 55], ...}
+ParameterGrid = Dict[str, Sequence[Any]]
+
+
+@dataclass(frozen=True)
+class SweepVariant:
+    index: int
+    params: Dict[str, Any]
+    strategy: SignalStrategy
+
+
+def strategy_variants(
+    signal_strategy: SignalStrategy, grid: ParameterGrid
+) -> Iterator[SweepVariant]:
+    """
+    Every combination of the grid's values applied to signal_strategy. Keys are
+    dotted paths into the strategy config, with list positions as numbers:
+    max_signals_per_day, ranking.0.sigma, signal_filters.2.value, ...
+
+    Each variant gets its own strategy_id and name so its signals can be stored
+    next to the original strategy's.
+    """
+    paths = list(grid)
+    for index, values in enumerate(itertools.product(*(grid[p] for p in paths))):
+        params = dict(zip(paths, values))
+        config = signal_strategy.model_dump()
+        for path, value in params.items():
+            _set_path(config, path, value)
+
+        label = ", ".join(f"{path}={value}" for path, value in params.items())
+        config["strategy_id"] = f"{signal_strategy.strategy_id}-sweep-{index}"
+        config["name"] = f"{signal_strategy.name} ({label})"
+        yield SweepVariant(index, params, SignalStrategy.model_validate(config))
+
+
+class SweepEngine:
+    """
+    Evaluates many variants of a strategy against one cached feature frame.
+
+    Filter masks are shared through a StrategyEvaluator, so a rule whose parameters
+    do not change between variants is evaluated once for the whole sweep. Ranking
+    then only reads the rows a variant's filters keep, from columns converted to
+    arrays once. A variant's signals are the rows StrategyEvaluator.evaluate would
+    return, reduced to SIGNAL_COLUMNS.
+    """
+
+    def __init__(self, df: pd.DataFrame, by: str = "measurement_date") -> None:
+        self.df = df
+        self.by = by
+        self.evaluator = StrategyEvaluator(df)
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def evaluate(self, signal_strategy: SignalStrategy) -> pd.DataFrame:
+        compiled = compile_strategy(signal_strategy)
+        positions = np.flatnonzero(self.evaluator.mask(compiled.filter_plan))
+        ranking = compiled.ranking_plan
+        candidates = self._rows(positions, sorted(ranking.columns | {self.by}))
+
+        score = ranking.scores(candidates, self.by)
+        kept = top_n_positions(score, ranking.top_n, candidates[self.by])
+
+        signals = self._rows(positions[kept], SIGNAL_COLUMNS[:-1])
+        signals["score"] = score[kept]
+        return signals
+
+    def run(
+        self, signal_strategy: SignalStrategy, grid: ParameterGrid
+    ) -> Iterator[Tuple[SweepVariant, pd.DataFrame]]:
+        for variant in strategy_variants(signal_strategy, grid):
+            yield variant, self.evaluate(variant.strategy)
+
+    def _rows(self, positions: np.ndarray, columns: List[str]) -> pd.DataFrame:
+        missing = [c for c in columns if c not in self.df.columns]
+        if missing:
+            raise KeyError(f"Missing column(s) {missing} in the feature frame.")
+        return pd.DataFrame({c: self._column(c)[positions] for c in columns})
+
+    def _column(self, name: str) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = self.df[name].to_numpy()
+        return column
+
+
+def sweep_frames(
+    results: Iterator[Tuple[SweepVariant, pd.DataFrame]],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Collect a sweep into two frames: one row per variant with its parameters,
+    signal count and mean score, and every variant's signals tagged with variant.
+    """
+    variants, signals = [], []
+    for variant, variant_signals in results:
+        variants.append(
+            {
+                "variant": variant.index,
+                "strategy_id": variant.strategy.strategy_id,
+                **variant.params,
+                "signals": len(variant_signals),
+                "mean_score": variant_signals["score"].mean(),
+            }
+        )
+        signals.append(variant_signals.assign(variant=variant.index))
+
+    columns = ["variant"] + SIGNAL_COLUMNS
+    return (
+        pd.DataFrame(variants),
+        (
+            pd.concat(signals, ignore_index=True)[columns]
+            if signals
+            else pd.DataFrame(columns=columns)
+        ),
+    )
+
+
+def _set_path(config: Dict[str, Any], path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    node: Any = config
+    try:
+        for part in parents:
+            node = node[int(part)] if isinstance(node, list) else node[part]
+        if isinstance(node, list):
+            node[int(leaf)] = value
+        elif leaf in node:
+            node[leaf] = value
+        else:
+            raise KeyError(leaf)
+    except (KeyError, IndexError, ValueError, TypeError) as e:
+        raise ValueError(f"Unknown strategy parameter '{path}'") from e
@@ -1,7 +1,8 @@
 from pathlib import Path
-from typing import Final
+from typing import Final, Iterator
 
 from app.models.signal_strategy import SignalStrategy
+from app.signals.compiled import CompiledStrategy, compile_strategy
 from app.stratagies.strategy_provider import StrategyProvider
 
 SIGNAL_STRATEGIES_DIR: Final = Path(__file__).parent  # .../signal_strategies
@@ -11,3 +12,10 @@ class SignalStrategyProvider(StrategyProvider[SignalStrategy]):
     STRATEGIES_DIR = Path(__file__).parent
     MODEL = SignalStrategy
     ID_FIELD = "strategy_id"
+
+    def iter_compiled(self) -> Iterator[CompiledStrategy]:
+        for signal_strategy in self.iter_strategies():
+            yield compile_strategy(signal_strategy)
+
+    def get_compiled(self, strategy_id: str) -> CompiledStrategy:
+        return compile_strategy(self.get_by_id(strategy_id))
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import threading
+
 from dataclasses import dataclass
 from pathlib import Path
 from typing import ClassVar, Generic, Iterator, TypeVar
 
 from pydantic import BaseModel
 
+from app.utils.log_wrapper import Log
+
 T = TypeVar("T", bound=BaseModel)
 
+# sha256 of a strategy file's content when it was parsed
+Fingerprint = str
+
 
 @dataclass
 class StrategyProvider(Generic[T]):
@@ -17,19 +25,45 @@ class StrategyProvider(Generic[T]):
     MODEL: ClassVar[type[BaseModel]]  # set by subclass
     ID_FIELD: ClassVar[str]  # set by subclass
 
-    def __init__(self, by_id: dict[str, T]) -> None:
+    def __init__(
+        self,
+        by_id: dict[str, T],
+        root: Path | None = None,
+        parsed: dict[Path, tuple[Fingerprint, T]] | None = None,
+    ) -> None:
         self._by_id = by_id
+        self._root = root or self.STRATEGIES_DIR
+        self._parsed = parsed or {}
+        self._lock = threading.Lock()
+        self._stop_watching: threading.Event | None = None
 
     @classmethod
     def from_directory(
         cls: type[StrategyProvider[T]], root: Path | None = None
     ) -> StrategyProvider[T]:
         root = root or cls.STRATEGIES_DIR
+        by_id, parsed = cls._load(root, {})
+        return cls(by_id, root, parsed)
+
+    @classmethod
+    def _load(
+        cls, root: Path, previous: dict[Path, tuple[Fingerprint, T]]
+    ) -> tuple[dict[str, T], dict[Path, tuple[Fingerprint, T]]]:
+        """
+        Parse every strategy file under root. Files whose content is unchanged
+        since previous keep their parsed config rather than being validated again.
+        """
         by_id: dict[str, T] = {}
+        parsed: dict[Path, tuple[Fingerprint, T]] = {}
 
         for path in sorted(root.glob("*.json")):
             raw = path.read_text(encoding="utf-8")
-            cfg = cls.MODEL.model_validate_json(raw)
+            fingerprint = hashlib.sha256(raw.encode()).hexdigest()
+            known = previous.get(path)
+            if known is not None and known[0] == fingerprint:
+                cfg = known[1]
+            else:
+                cfg = cls.MODEL.model_validate_json(raw)
             file_id = path.stem
 
             if cfg.strategy_id != file_id:
@@ -43,12 +77,62 @@ class StrategyProvider(Generic[T]):
                 )
 
             by_id[cfg.strategy_id] = cfg
+            parsed[path] = (fingerprint, cfg)
+
+        return by_id, parsed
+
+    def reload(self) -> bool:
+        """
+        Pick up added, edited and removed strategy files. Only files whose content
+        changed since they were last parsed are validated again. If any file is invalid, the
+        current strategies are kept and the error is logged.
+
+        Returns whether the strategies changed.
+        """
+        with self._lock:
+            try:
+                by_id, parsed = self._load(self._root, self._parsed)
+            except (OSError, ValueError) as e:
+                Log.error(
+                    f"[STRATEGIES] Keeping current strategies, reload failed: {e}"
+                )
+                return False
+
+            changed = by_id != self._by_id
+            self._by_id, self._parsed = by_id, parsed
+
+        if changed:
+            Log.info(f"[STRATEGIES] Reloaded {len(by_id)} strategies from {self._root}")
+        return changed
+
+    def watch(self, interval_seconds: float) -> threading.Thread:
+        """
+        Reload every interval_seconds on a daemon thread, so a long-lived process
+        sees edited strategy files without a restart. Stop with stop_watching.
+        """
+        self.stop_watching()
+        stop = threading.Event()
+        self._stop_watching = stop
+
+        def poll() -> None:
+            while not stop.wait(interval_seconds):
+                self.reload()
+
+        thread = threading.Thread(
+            target=poll, name=f"watch-{self._root.name}", daemon=True
+        )
+        thread.start()
+        return thread
 
-        return cls(by_id)
+    def stop_watching(self) -> None:
+        if self._stop_watching is not None:
+            self._stop_watching.set()
+            self._stop_watching = None
 
     def iter_strategies(self) -> Iterator[T]:
-        for sid in sorted(self._by_id):
-            yield self._by_id[sid]
+        by_id = self._by_id
+        for sid in sorted(by_id):
+            yield by_id[sid]
 
     def get_by_id(self, strategy_id: str) -> T:
         try:
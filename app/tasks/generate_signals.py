@@ -1,135 +1,457 @@
-from datetime import date
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from functools import partial
 from pathlib import Path
-from typing import List, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import pandas as pd
 
-from app.core.db import get_db
-from app.handlers.eod_signal import EODSignalHandler
+from app.core.db import engine, get_db
+from app.core.settings import get_settings
+from app.handlers.eod_signal import SIGNAL_FRAME_COLUMNS, EODSignalHandler
 from app.handlers.security import SecurityHandler
+from app.handlers.signal_input import SignalInputHandler
+from app.handlers.signal_run import SignalRunHandler
 from app.handlers.technical_indicator import TechnicalIndicatorHandler
-from app.models.eod_signal import EODSignal
+from app.indicators.lazy import ensure_indicator_columns
+from app.indicators.on_demand import attach_on_demand_indicators
 from app.models.signal_strategy import SignalStrategy
-from app.signals.filters import apply_default_signal_filters, apply_signal_filters
-from app.signals.ranking import apply_strategy_ranking
+from app.signals.compiled import compile_strategy
+from app.signals.evaluator import StrategyEvaluator
+from app.signals.incremental import (
+    changed_security_ids,
+    input_fingerprint,
+    plan_signal_runs,
+)
+from app.signals.ranking import merge_top_n
 from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
 from app.utils.datetime_utils import last_year, yesterday
 from app.utils.log_wrapper import Log
-from app.utils.trading_calendar import get_all_trading_days_between
+
+settings = get_settings()
 
 BASE_CONFIG_DIR = Path(__file__).parent / ".." / ".." / "strategies"
 REQUIRED_COLS: Set[str] = {"security_id", "measurement_date", "ohlcv_daily_id", "score"}
 
+# Calendar days of combined rows run_signal_pickers holds in memory at once
+HISTORIC_SIGNAL_WINDOW_DAYS = 366
 
-def run_signal_picker(generation_date: date, signal_strategy: SignalStrategy):
-    with next(get_db()) as db_session:
 
-        security_handler = SecurityHandler(db_session)
-        tickers = security_handler.get_all()
+@dataclass
+class HistoricSignalReport:
+    windows: int
+    signals: Dict[str, int]
+    completed: int = 0
+    failed: List[Tuple[date, date]] = field(default_factory=list)
+
+    def add(
+        self, window: Tuple[date, date], result: Callable[[], Dict[str, int]]
+    ) -> None:
+        """Merge one window's signal counts, or record it as failed."""
+        try:
+            counts = result()
+        except Exception as e:
+            Log.error(f"[HISTORIC] Window {window[0]} → {window[1]} failed: {e}")
+            self.failed.append(window)
+            return
+
+        self.completed += 1
+        for strategy_id, count in counts.items():
+            self.signals[strategy_id] = self.signals.get(strategy_id, 0) + count
+        Log.info(
+            f"[HISTORIC] {self.completed + len(self.failed)}/{self.windows} windows, "
+            f"{window[0]} → {window[1]}: {sum(counts.values())} signals"
+        )
 
-        indicator_data = TechnicalIndicatorHandler(
-            db_session
-        ).get_combined_data_by_date_and_security_ids(
-            generation_date, [ticker.id for ticker in tickers]
+    def summary(self) -> str:
+        return (
+            f"{self.completed}/{self.windows} windows completed, "
+            f"{sum(self.signals.values())} signals"
+            + (f", failed: {self.failed}" if self.failed else "")
         )
 
-        df = pd.DataFrame([ti.model_dump() for ti in indicator_data])
 
+def run_signal_picker(generation_date: date, signal_strategy: SignalStrategy):
+    run_signal_pickers(generation_date, generation_date, [signal_strategy])
+
+
+def run_signal_pickers(
+    start_date: date, end_date: date, signal_strategies: List[SignalStrategy]
+) -> Dict[str, int]:
+    """
+    Generate the strategies' signals for every day in [start_date, end_date] in one
+    pass: the combined OHLCV and indicator rows every strategy reads are loaded with a
+    single query, each strategy is filtered and ranked per day against that shared
+    frame by a StrategyEvaluator, and all signals are persisted together. Equivalent
+    to picking each strategy's signals on each day separately.
+
+    Returns the number of signals persisted per strategy_id.
+    """
+    counts: Dict[str, int] = {}
+    if not signal_strategies:
+        return counts
+
+    with next(get_db()) as db_session:
+        df = load_feature_frame(
+            db_session, start_date, end_date, _eod_columns(signal_strategies)
+        )
         if df.empty:
-            return  # probably a non trading day # TODO look up based on ticker exchange
-            # raise ValueError("Indicator Data dataframe was empty was empty")
+            Log.info(f"No indicator data between {start_date} and {end_date}.")
+            return counts  # probably a non trading day
+
+        evaluator = StrategyEvaluator(df)
+        frames: List[pd.DataFrame] = []
+        for signal_strategy in signal_strategies:
+            try:
+                ranked_signals = evaluator.evaluate(
+                    signal_strategy, by="measurement_date"
+                )
+            except (KeyError, ValueError) as e:
+                # One misconfigured strategy must not stop the others
+                Log.error(f"Strategy {signal_strategy.name} failed to evaluate: {e}")
+                continue
+
+            Log.info(
+                f"Found {len(ranked_signals)} signals on "
+                f"{ranked_signals['measurement_date'].nunique()} days using strategy "
+                f"{signal_strategy.name}."
+            )
+            frames.append(ranked_df_to_signal_frame(ranked_signals, signal_strategy))
+            counts[signal_strategy.strategy_id] = len(ranked_signals)
 
-        required_cols = signal_strategy.required_eod_columns()
-        default_filtered = apply_default_signal_filters(df, required_cols)
         Log.info(
-            f"{len(df) - len(default_filtered)} tickers removed by default filtering."
+            f"Persisting {sum(counts.values())} signals of {len(signal_strategies)} "
+            f"strategies ({evaluator.hits} shared filter masks reused)."
         )
+        if frames:
+            EODSignalHandler(db_session).save_frame(
+                pd.concat(frames, ignore_index=True)
+            )
+            db_session.commit()
+
+    return counts
+
 
-        strategy_filtered = apply_signal_filters(default_filtered, signal_strategy)
+def load_feature_frame(
+    db_session,
+    start_date: date,
+    end_date: date,
+    required_cols: Set[str],
+    security_ids: Optional[List[int]] = None,
+) -> pd.DataFrame:
+    """
+    Combined OHLCV and indicator rows of every security (or only security_ids)
+    between two dates with the columns in required_cols, after backfilling lazily
+    skipped indicators.
+    """
+    if security_ids is None:
+        security_ids = [
+            security.id for security in SecurityHandler(db_session).get_all()
+        ]
+    ensure_indicator_columns(
+        db_session, security_ids, start_date, end_date, required_cols
+    )
+
+    df = TechnicalIndicatorHandler(db_session).get_combined_frame_between_dates(
+        start_date, end_date, required_cols, security_ids=security_ids
+    )
+    if df.empty:
+        return df
+
+    # Parameterized indicators such as sma(100) are not stored; compute them
+    return attach_on_demand_indicators(db_session, df, required_cols)
+
+
+def generate_daily_signals():
+    # Run the signal pickers for yesterday's trading
+    active = [cfg for cfg in SIGNAL_STRATEGY_PROVIDER.iter_strategies() if cfg.active]
+    Log.info(f"Generating signals using strategies {[cfg.name for cfg in active]}")
+    run_incremental_signal_pickers(yesterday(), active)
+
+
+def run_incremental_signal_pickers(
+    signal_date: date, signal_strategies: List[SignalStrategy]
+) -> Dict[str, int]:
+    """
+    Generate the strategies' signals for signal_date, redoing only what changed
+    since the last run for that day. Every security's combined row is hashed, and a
+    strategy is skipped when its config and the day's rows are those it last ran
+    on; see plan_signal_runs. A rerun after a partial failure, or a cron that fires
+    twice, only generates the strategies that are out of date.
+
+    When only some securities' rows changed, strategies with a row-local ranking
+    rank just those securities and merge them into the stored top N. Signals that
+    drop out of a strategy's top N are deleted.
+
+    Returns the number of signals written per strategy_id.
+    """
+    counts: Dict[str, int] = {}
+    if not signal_strategies:
+        return counts
+
+    with next(get_db()) as db_session:
+        row_hashes = TechnicalIndicatorHandler(db_session).get_input_hashes(signal_date)
+        if not row_hashes:
+            Log.info(f"No indicator data on {signal_date}.")
+            return counts  # probably a non trading day
+
+        input_handler = SignalInputHandler(db_session)
+        run_handler = SignalRunHandler(db_session)
+        previous_hashes = input_handler.get_hashes(signal_date)
+        data_version = input_fingerprint(row_hashes)
+        plan = plan_signal_runs(
+            signal_strategies,
+            run_handler.get_for_date(signal_date),
+            data_version,
+            input_fingerprint(previous_hashes),
+        )
         Log.info(
-            f"{len(strategy_filtered)} tickers remaining after applying {signal_strategy.name} filters."
+            f"[SIGNALS] {signal_date}: {len(plan.skipped)} strategies up to date, "
+            f"{len(plan.merged)} to merge, {len(plan.full)} to recompute"
         )
 
-        ranked_signals = apply_strategy_ranking(strategy_filtered, signal_strategy)
+        full = list(plan.full)
+        if plan.merged:
+            full += _merge_changed_signals(
+                db_session,
+                signal_date,
+                plan.merged,
+                changed_security_ids(previous_hashes, row_hashes),
+                counts,
+            )
+        if full:
+            _recompute_signals(db_session, signal_date, full, counts)
 
-        Log.info(
-            f"Found {len(ranked_signals)} signal using strategy {signal_strategy.name}, persisting to db."
+        run_handler.record(
+            signal_date,
+            {
+                strategy.strategy_id: compile_strategy(strategy).config_hash
+                for strategy in signal_strategies
+                if strategy.strategy_id in counts
+            },
+            data_version,
         )
-        if not ranked_signals.empty:
-            EODSignalHandler(db_session).save_all(
-                _map_ranked_df_to_eod_signals(ranked_signals, signal_strategy)
+        input_handler.replace(signal_date, row_hashes)
+        db_session.commit()
+
+    return counts
+
+
+def _merge_changed_signals(
+    db_session,
+    signal_date: date,
+    signal_strategies: List[SignalStrategy],
+    changed_ids: Set[int],
+    counts: Dict[str, int],
+) -> List[SignalStrategy]:
+    """
+    Rank the changed securities for each strategy and merge them into its stored
+    top N. Returns the strategies whose top N cannot be merged (see merge_top_n).
+    """
+    df = load_feature_frame(
+        db_session,
+        signal_date,
+        signal_date,
+        _eod_columns(signal_strategies),
+        security_ids=sorted(changed_ids),
+    )
+    evaluator = StrategyEvaluator(df)
+    handler = EODSignalHandler(db_session)
+
+    unmerged = []
+    for signal_strategy in signal_strategies:
+        try:
+            ranked = (
+                evaluator.evaluate(signal_strategy, by="measurement_date")
+                if not df.empty
+                else pd.DataFrame(columns=list(REQUIRED_COLS))
             )
-            db_session.commit()
+        except (KeyError, ValueError) as e:
+            Log.error(f"Strategy {signal_strategy.name} failed to evaluate: {e}")
+            continue
 
+        merged = merge_top_n(
+            handler.get_scores_for_strategy_and_date(
+                signal_strategy.strategy_id, signal_date
+            ),
+            ranked[["security_id", "ohlcv_daily_id", "score"]],
+            changed_ids,
+            signal_strategy.max_signals_per_day,
+        )
+        if merged is None:
+            unmerged.append(signal_strategy)
+            continue
 
-def generate_daily_signals():
-    for cfg in SIGNAL_STRATEGY_PROVIDER.iter_strategies():
-        if cfg.active:
-            Log.info(f"Generating signals using strategy {cfg.name}")
-            # Run the signal picker for yesterday's trading
-            run_signal_picker(generation_date=yesterday(), signal_strategy=cfg)
+        # Unchanged signals are left as they are, keeping their open validation
+        written = merged[merged["security_id"].isin(list(changed_ids))]
+        handler.save_frame(
+            ranked_df_to_signal_frame(
+                written.assign(measurement_date=signal_date), signal_strategy
+            )
+        )
+        handler.delete_for_strategy_and_date_except(
+            signal_strategy.strategy_id, signal_date, merged["security_id"].tolist()
+        )
+        counts[signal_strategy.strategy_id] = len(written)
+        Log.info(
+            f"Merged {len(written)} of {len(changed_ids)} changed securities into "
+            f"the {signal_strategy.name} signals."
+        )
+
+    return unmerged
+
+
+def _recompute_signals(
+    db_session,
+    signal_date: date,
+    signal_strategies: List[SignalStrategy],
+    counts: Dict[str, int],
+) -> None:
+    """Generate the strategies' signals for signal_date over every security."""
+    df = load_feature_frame(
+        db_session, signal_date, signal_date, _eod_columns(signal_strategies)
+    )
+    evaluator = StrategyEvaluator(df)
+    handler = EODSignalHandler(db_session)
 
+    for signal_strategy in signal_strategies:
+        try:
+            ranked = evaluator.evaluate(signal_strategy, by="measurement_date")
+        except (KeyError, ValueError) as e:
+            Log.error(f"Strategy {signal_strategy.name} failed to evaluate: {e}")
+            continue
+
+        frame = ranked_df_to_signal_frame(ranked, signal_strategy)
+        handler.save_frame(frame)
+        handler.delete_for_strategy_and_date_except(
+            signal_strategy.strategy_id, signal_date, frame["security_id"].tolist()
+        )
+        counts[signal_strategy.strategy_id] = len(frame)
+        Log.info(f"Found {len(frame)} signals using strategy {signal_strategy.name}.")
+
+
+def _eod_columns(signal_strategies: List[SignalStrategy]) -> Set[str]:
+    return set().union(
+        *(compile_strategy(strategy).eod_columns for strategy in signal_strategies)
+    )
 
-def _map_ranked_df_to_eod_signals(
+
+def ranked_df_to_signal_frame(
     ranked_df: pd.DataFrame,
     strategy: SignalStrategy,
-) -> List[EODSignal]:
+) -> pd.DataFrame:
     """
-    Convert ranked signal dataframe into EODSignal models (no persistence).
+    Convert a ranked signal dataframe into the signal frame
+    EODSignalHandler.save_frame writes (no persistence).
 
     Expects ranked_df to include (at minimum):
       - security_id: int
       - measurement_date: date (your signal_date)
       - ohlcv_daily_id: int
       - score: float in [0, 1]
-
-    Returns a list[EODSignal] ready for persistence.
     """
     missing = REQUIRED_COLS - set(ranked_df.columns)
     if missing:
         raise ValueError(f"ranked_df missing required columns: {sorted(missing)}")
 
-    # Optional dedupe by (signal_date, strategy_name, security_id) in case caller sent dupes
-    ranked_df = ranked_df.drop_duplicates(
-        subset=["measurement_date", "security_id"], keep="first"
+    return pd.DataFrame(
+        {
+            "signal_date": ranked_df["measurement_date"].to_numpy(),
+            "strategy_name": strategy.name,
+            "strategy_id": strategy.strategy_id,
+            "security_id": ranked_df["security_id"].to_numpy(dtype="int64"),
+            "ohlcv_daily_id": ranked_df["ohlcv_daily_id"].to_numpy(dtype="int64"),
+            "score": ranked_df["score"].to_numpy(dtype="float64"),
+        },
+        columns=SIGNAL_FRAME_COLUMNS,
     )
 
-    out: List[EODSignal] = []
-    for row in ranked_df.itertuples(index=False):
-        out.append(
-            EODSignal(
-                signal_date=row.measurement_date,
-                strategy_name=strategy.name,
-                strategy_id=strategy.strategy_id,
-                security_id=int(row.security_id),
-                ohlcv_daily_id=int(row.ohlcv_daily_id),
-                score=float(row.score),
-            )
-        )
-    return out
-
 
 def generate_historic_signals_for_all_strategies(
     start_date: date = last_year(),
-) -> None:
-    for signal_strategy in SIGNAL_STRATEGY_PROVIDER.iter_strategies():
-        Log.info(f"Generating historic signals for strategy {signal_strategy.name}")
-        generate_historic_signals_for_strategy(signal_strategy, start_date)
+    workers: int = settings.SIGNAL_WORKERS,
+) -> HistoricSignalReport:
+    strategies = list(SIGNAL_STRATEGY_PROVIDER.iter_strategies())
+    Log.info(f"Generating historic signals for {len(strategies)} strategies")
+    return generate_historic_signals(strategies, start_date, workers=workers)
 
 
 def generate_historic_signals_for_strategy(
-    signal_strategy: SignalStrategy, start_date: date
-) -> None:
-    exchange = "NYSE"  # hardcoded for now, replace with exchange abstraction later.
-
-    trading_days = get_all_trading_days_between(
-        exchange=exchange,
-        start=start_date,
-        end=yesterday(),
+    signal_strategy: SignalStrategy,
+    start_date: date,
+    end_date: Optional[date] = None,
+    workers: int = settings.SIGNAL_WORKERS,
+) -> HistoricSignalReport:
+    return generate_historic_signals(
+        [signal_strategy], start_date, end_date, workers=workers
     )
 
-    for trading_day in trading_days:
-        Log.info(
-            f"generating historic signals for {trading_day} using {signal_strategy.name}"
+
+def generate_historic_signals(
+    signal_strategies: List[SignalStrategy],
+    start_date: date,
+    end_date: Optional[date] = None,
+    window_days: Optional[int] = None,
+    workers: int = settings.SIGNAL_WORKERS,
+) -> HistoricSignalReport:
+    """
+    Generate the strategies' signals for [start_date, end_date] window by window
+    with run_signal_pickers, and report the signals persisted per strategy.
+
+    Windows are independent: every day is filtered and ranked on its own. Above one
+    worker they run in a process pool, each worker loading and writing its windows
+    with its own DB session, and windows default to an even split of the range
+    across the workers (never longer than HISTORIC_SIGNAL_WINDOW_DAYS). A failed
+    window is logged and reported rather than stopping the others.
+    """
+    end_date = end_date or yesterday()
+    if window_days is None:
+        total_days = (end_date - start_date).days + 1
+        window_days = min(
+            HISTORIC_SIGNAL_WINDOW_DAYS, -(-total_days // max(workers, 1))
         )
-        run_signal_picker(trading_day, signal_strategy)
+    windows = _signal_windows(start_date, end_date, window_days)
+
+    report = HistoricSignalReport(
+        windows=len(windows),
+        signals={strategy.strategy_id: 0 for strategy in signal_strategies},
+    )
+    Log.info(
+        f"[HISTORIC] {len(windows)} windows of up to {window_days} days "
+        f"between {start_date} and {end_date} on {workers} workers"
+    )
+
+    if workers <= 1:
+        for window in windows:
+            report.add(window, partial(run_signal_pickers, *window, signal_strategies))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_signal_worker
+        ) as pool:
+            futures = {
+                pool.submit(run_signal_pickers, *window, signal_strategies): window
+                for window in windows
+            }
+            for future in as_completed(futures):
+                report.add(futures[future], future.result)
+
+    Log.info(f"[HISTORIC] {report.summary()}")
+    return report
+
+
+def _signal_windows(
+    start_date: date, end_date: date, window_days: int
+) -> List[Tuple[date, date]]:
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(window_start + timedelta(days=window_days - 1), end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+def _init_signal_worker() -> None:
+    # Forked workers must not reuse the parent's pooled connections
+    engine.dispose(close=False)
@@ -1,134 +1,528 @@
-from datetime import date
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, timedelta
 from decimal import InvalidOperation
-from typing import Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
 from dateutil.utils import today
 
-from app.core.db import get_db
+from app.core.db import engine, get_db
+from app.core.settings import get_settings
+from app.handlers.indicator_invalidation import IndicatorInvalidationHandler
+from app.handlers.indicator_state import IndicatorStateHandler
+from app.handlers.ohlcv_daily import OHLCVDailyHandler
 from app.handlers.security import SecurityHandler
 from app.handlers.technical_indicator import TechnicalIndicatorHandler
-from app.indicators.compute import compute_indicators_for_range
+from app.indicators.compute import (
+    EXCHANGE,
+    TRADING_DAYS_REQUIRED,
+    compute_indicators_for_range,
+    compute_indicators_from_ohlcv,
+    load_ohlcv_history,
+)
+from app.indicators.cross_sectional import (
+    CROSS_SECTIONAL_INPUTS,
+    cross_sectional_indicators,
+)
 from app.indicators.exceptions import InsufficientOHLCVDataError
-from app.models.technical_indicator import TechnicalIndicator
+from app.indicators.incremental import (
+    advance_indicator_state,
+    build_indicator_state,
+    find_inconsistencies,
+)
+from app.indicators.lazy import ensure_indicator_columns
+from app.indicators.panel import (
+    compute_indicators_for_ranges,
+    compute_indicators_for_securities,
+)
+from app.models.indicator_state import IndicatorState
 from app.utils.datetime_utils import last_year, yesterday
 from app.utils.log_wrapper import Log
 from app.utils.trading_calendar import (
     get_all_trading_days_between,
+    get_nth_trading_day,
 )
 
+settings = get_settings()
+
+# Securities per panel; bounds memory at roughly batch_size × (lookback + range) candles
+PANEL_BATCH_SIZE = settings.INDICATOR_SHARD_SIZE
+
+# Present trading days tolerated between two missing runs before they are healed apart
+HEAL_MAX_GAP_DAYS = 5
+
+
+@dataclass(frozen=True)
+class HealRange:
+    security_id: int
+    start_date: date
+    end_date: date
+
 
 def compute_daily_indicators_for_all_securities(
     compute_date: date = yesterday(),
+    columns: Optional[List[str]] = None,
 ) -> None:
+    """
+    Compute indicators for compute_date. With columns (see active_indicator_columns),
+    only those are computed and persisted; the rest are backfilled lazily by
+    ensure_indicator_columns when first read.
+    """
     _generate_indicators_for_range(
         start_date=compute_date,
         end_date=compute_date,
-        context="EOD",
+        context="EOD" if columns is None else "EOD/LAZY",
+        columns=columns,
+    )
+
+
+def compute_daily_indicators_incrementally(
+    compute_date: date = yesterday(),
+) -> None:
+    """
+    Advance each security's persisted rolling state by the candles it has not seen yet,
+    up to compute_date, instead of reloading TRADING_DAYS_REQUIRED days of history.
+    Securities without state are seeded from a full history load. Rows and states are
+    written PANEL_BATCH_SIZE securities at a time.
+
+    Opt-in through INCREMENTAL_INDICATORS until verify_incremental_indicators shows it
+    agrees with compute_daily_indicators_for_all_securities.
+    """
+    context = "EOD/INCREMENTAL"
+    Log.info(f"[{context}] Computing indicators incrementally up to {compute_date}")
+
+    with next(get_db()) as db_session:
+        states = IndicatorStateHandler(db_session).get_all_by_security_id()
+        frames: List[pd.DataFrame] = []
+        new_states: List[IndicatorState] = []
+
+        for security in SecurityHandler(db_session).get_all():
+            try:
+                state = states.get(security.id)
+                if state is None:
+                    rows, new_state = _seed_indicator_state(
+                        security.id, compute_date, db_session
+                    )
+                else:
+                    rows, new_state = _advance_indicator_state_to(
+                        state, compute_date, db_session
+                    )
+            except InsufficientOHLCVDataError as e:
+                Log.warning(
+                    f"[{context}] Insufficient OHLCV data for {security.symbol}: "
+                    f"{e.start_date} → {e.end_date}"
+                )
+                db_session.rollback()
+                continue
+            except Exception as e:
+                Log.error(
+                    f"[{context}] Failed to compute indicators for {security.symbol}: {e}"
+                )
+                db_session.rollback()
+                continue
+
+            if not rows:
+                Log.debug(f"[{context}] {security.symbol} is already up to date")
+                continue
+
+            frames.append(pd.DataFrame(rows))
+            new_states.append(new_state)
+            if len(new_states) >= PANEL_BATCH_SIZE:
+                _save_incremental_batch(db_session, frames, new_states, context)
+                frames, new_states = [], []
+
+        _save_incremental_batch(db_session, frames, new_states, context)
+
+    Log.info(f"[{context}] Completed incremental indicator generation.")
+
+
+def _save_incremental_batch(
+    db_session,
+    frames: List[pd.DataFrame],
+    states: List[IndicatorState],
+    context: str,
+) -> None:
+    if not frames:
+        return
+
+    try:
+        TechnicalIndicatorHandler(db_session).save_frame(
+            pd.concat(frames, ignore_index=True)
+        )
+        IndicatorStateHandler(db_session).save_all(states)
+        db_session.commit()
+    except Exception as e:
+        Log.error(
+            f"[{context}] Failed to save indicators for {len(states)} securities: {e}"
+        )
+        db_session.rollback()
+
+
+def verify_incremental_indicators(
+    check_date: date = yesterday(), rtol: float = 1e-6
+) -> Dict[int, List[str]]:
+    """
+    Compare persisted indicators for check_date against a full recomputation.
+    Returns the mismatching columns per security id; securities that agree are omitted.
+    """
+    mismatches: Dict[int, List[str]] = {}
+
+    with next(get_db()) as db_session:
+        indicator_handler = TechnicalIndicatorHandler(db_session)
+
+        for security in SecurityHandler(db_session).get_all():
+            stored = indicator_handler.get_by_date_and_security_id(
+                check_date, security.id
+            )
+            if stored is None:
+                continue
+
+            try:
+                full = compute_indicators_for_range(
+                    security_id=security.id,
+                    start_date=check_date,
+                    end_date=check_date,
+                    session=db_session,
+                )
+            except InsufficientOHLCVDataError:
+                continue
+
+            if full.empty:
+                continue
+
+            columns = find_inconsistencies(
+                stored.model_dump(), full.iloc[-1].to_dict(), rtol=rtol
+            )
+            if columns:
+                Log.warning(
+                    f"[VERIFY] {security.symbol} incremental indicators differ from full "
+                    f"recomputation on {check_date}: {columns}"
+                )
+                mismatches[security.id] = columns
+
+    Log.info(
+        f"[VERIFY] {len(mismatches)} securities with inconsistent indicators on {check_date}"
     )
+    return mismatches
 
 
-def heal_missing_technical_indicators() -> None:
+def heal_missing_technical_indicators(
+    workers: int = settings.INDICATOR_WORKERS,
+    batch_size: int = PANEL_BATCH_SIZE,
+    max_gap_days: int = HEAL_MAX_GAP_DAYS,
+) -> None:
+    """
+    Recompute indicators only for the security/date ranges that are actually missing
+    over the last year, batching ranges with similar dates into one panel pass.
+    """
+    start_date, end_date = last_year(), today()
+
     with next(get_db()) as db_session:
-        security_handler = SecurityHandler(db_session)
-        all_securities = security_handler.get_all()
+        existing_dates = TechnicalIndicatorHandler(
+            db_session
+        ).get_dates_with_indicators_between(start_date, end_date)
+
+        trading_days_by_exchange: Dict[str, List[date]] = {}
+        ranges: List[HealRange] = []
 
-        for security in all_securities:
+        for security in SecurityHandler(db_session).get_all():
             if security.exchange is None or security.first_trade_date is None:
                 Log.warning(f"[HEAL] Skipping {security.symbol}: missing metadata.")
                 continue
 
-            trading_days = set(
-                get_all_trading_days_between(
-                    exchange=security.exchange,
-                    start=last_year(),
-                    end=today(),
+            if security.exchange not in trading_days_by_exchange:
+                trading_days_by_exchange[security.exchange] = (
+                    get_all_trading_days_between(
+                        exchange=security.exchange, start=start_date, end=end_date
+                    )
                 )
-            )
 
-            indicator_handler = TechnicalIndicatorHandler(db_session)
-            existing_dates = indicator_handler.get_dates_with_indicators_for_security(
-                security.id
+            trading_days = [
+                day
+                for day in trading_days_by_exchange[security.exchange]
+                if day >= security.first_trade_date
+            ]
+            security_ranges = plan_indicator_heal(
+                security.id,
+                trading_days,
+                existing_dates.get(security.id, set()),
+                max_gap_days=max_gap_days,
             )
-            missing_dates = sorted(list(trading_days - existing_dates))
 
-            if not missing_dates:
-                Log.info(f"[HEAL] No indicator gaps for {security.symbol}")
+            if not security_ranges:
+                Log.debug(f"[HEAL] No indicator gaps for {security.symbol}")
                 continue
 
-            start_date = min(missing_dates)
-            end_date = max(missing_dates)
+            Log.info(
+                f"[HEAL] {security.symbol}: "
+                + ", ".join(f"{r.start_date} → {r.end_date}" for r in security_ranges)
+            )
+            ranges.extend(security_ranges)
+
+    if not ranges:
+        Log.info("[HEAL] No indicator gaps found.")
+        return
+
+    shards = _heal_range_shards(ranges, batch_size)
+    Log.info(f"[HEAL] Healing {len(ranges)} ranges in {len(shards)} batches")
+    _write_indicator_shards(_compute_heal_shard, shards, "HEAL", workers)
+
+    for span_start, span_end in _merge_heal_spans(ranges):
+        compute_cross_sectional_indicators(span_start, span_end)
+    Log.info("[HEAL] Completed indicator heal.")
+
+
+def plan_indicator_heal(
+    security_id: int,
+    trading_days: List[date],
+    existing_dates: Set[date],
+    max_gap_days: int = HEAL_MAX_GAP_DAYS,
+) -> List[HealRange]:
+    """
+    Collapse a security's missing trading days into date ranges to recompute.
+
+    Runs of missing days separated by at most max_gap_days present trading days are
+    merged, since recomputing a few existing rows is cheaper than another load.
+    """
+    ranges: List[HealRange] = []
+    run: Optional[HealRange] = None
+    present_since_run = 0
+
+    for day in sorted(trading_days):
+        if day in existing_dates:
+            present_since_run += 1
+            continue
+
+        if run is not None and present_since_run > max_gap_days:
+            ranges.append(run)
+            run = None
+
+        run = HealRange(security_id, run.start_date if run else day, day)
+        present_since_run = 0
+
+    if run is not None:
+        ranges.append(run)
+
+    return ranges
+
+
+def recompute_invalidated_indicators(
+    workers: int = settings.INDICATOR_WORKERS,
+    batch_size: int = PANEL_BATCH_SIZE,
+) -> None:
+    """
+    Recompute the indicators made stale by candles inserted or corrected in the middle
+    of a security's history, as recorded by OHLCVDailyHandler.save_all.
+
+    Only the suffix of each security's history that can read a changed candle is
+    recomputed: from the earliest changed date to TRADING_DAYS_REQUIRED candles later,
+    the longest dependency horizon in the registry. Cross-sectional indicators are
+    then refreshed over the recomputed dates, and incremental state that reached
+    into a changed window is dropped so it is reseeded on the next run.
+    """
+    context = "INVALIDATED"
+
+    with next(get_db()) as db_session:
+        invalidations = IndicatorInvalidationHandler(db_session).get_all()
+        if not invalidations:
+            Log.info(f"[{context}] No invalidated indicators.")
+            return
+
+        ohlcv_handler = OHLCVDailyHandler(db_session)
+        ranges: List[HealRange] = []
+        stale_states: List[int] = []
+        for invalidation in invalidations:
+            candle_dates = sorted(
+                ohlcv_handler.get_dates_for_security(invalidation.security_id)
+            )
+            invalidated = plan_invalidated_range(
+                invalidation.security_id,
+                invalidation.earliest_changed_date,
+                candle_dates,
+            )
+            if invalidated is None:
+                continue
 
             Log.info(
-                f"[HEAL] Healing indicators for {security.symbol} ({start_date} → {end_date})"
+                f"[{context}] Security {invalidation.security_id}: "
+                f"{invalidated.start_date} → {invalidated.end_date}"
             )
-            _generate_indicators_for_range(start_date, end_date, context="HEAL")
+            ranges.append(invalidated)
+            if invalidated.end_date == candle_dates[-1]:
+                stale_states.append(invalidation.security_id)
+
+    shards = _heal_range_shards(ranges, batch_size)
+    Log.info(f"[{context}] Recomputing {len(ranges)} ranges in {len(shards)} batches")
+    failed = _write_indicator_shards(_compute_heal_shard, shards, context, workers)
+    if failed:
+        Log.error(
+            f"[{context}] {failed} batches failed; keeping invalidations for a retry."
+        )
+        return
+
+    with next(get_db()) as db_session:
+        IndicatorStateHandler(db_session).delete_for_securities(stale_states)
+        IndicatorInvalidationHandler(db_session).clear(invalidations)
+        db_session.commit()
+
+    if ranges:
+        compute_cross_sectional_indicators(
+            min(r.start_date for r in ranges), max(r.end_date for r in ranges)
+        )
+    Log.info(f"[{context}] Completed recompute of invalidated indicators.")
+
+
+def plan_invalidated_range(
+    security_id: int,
+    changed_date: date,
+    candle_dates: List[date],
+    horizon: int = TRADING_DAYS_REQUIRED,
+) -> Optional[HealRange]:
+    """
+    Indicator dates that can read a candle changed on changed_date, given the
+    security's sorted candle dates: an indicator needing horizon candles reads the
+    changed one for horizon candles at most. None when no candle is left from
+    changed_date on.
+    """
+    first = bisect_left(candle_dates, changed_date)
+    if first == len(candle_dates):
+        return None
+
+    last = min(first + horizon, len(candle_dates)) - 1
+    return HealRange(security_id, candle_dates[first], candle_dates[last])
 
 
 def recompute_indicators_for_all_securities(
     start_date: date,
     end_date: date = today(),
+    workers: int = settings.INDICATOR_WORKERS,
+    shard_size: int = PANEL_BATCH_SIZE,
 ) -> None:
-    _generate_indicators_for_range(start_date, end_date, context="RECOMPUTE")
+    _generate_indicators_for_range(
+        start_date,
+        end_date,
+        context="RECOMPUTE",
+        batch_size=shard_size,
+        workers=workers,
+    )
+
+
+def compute_cross_sectional_indicators(
+    start_date: date = yesterday(), end_date: Optional[date] = None
+) -> None:
+    """
+    Rank and sector z-score the universe's indicators for every date in
+    [start_date, end_date] (default: start_date only) and store them on the
+    technical_indicator rows. Run after the per-security indicators of those dates
+    are persisted; inputs a lazy computation skipped are backfilled first.
+    """
+    end_date = end_date or start_date
+    context = "CROSS-SECTIONAL"
+    Log.info(
+        f"[{context}] Computing cross-sectional indicators {start_date} → {end_date}"
+    )
+
+    with next(get_db()) as db_session:
+        security_ids = [
+            security.id for security in SecurityHandler(db_session).get_all()
+        ]
+        ensure_indicator_columns(
+            db_session, security_ids, start_date, end_date, CROSS_SECTIONAL_INPUTS
+        )
+
+        handler = TechnicalIndicatorHandler(db_session)
+        inputs = handler.get_cross_sectional_inputs(start_date, end_date)
+        if inputs.empty:
+            Log.warning(
+                f"[{context}] No indicators between {start_date} and {end_date}"
+            )
+            return
+
+        handler.save_cross_sectional(cross_sectional_indicators(inputs))
+        db_session.commit()
+
+    Log.info(f"[{context}] Updated {len(inputs)} indicator rows.")
 
 
 def _generate_indicators_for_range(
     start_date: date,
     end_date: date,
     context: str,
+    batch_size: int = PANEL_BATCH_SIZE,
+    workers: int = 1,
+    columns: Optional[List[str]] = None,
 ) -> None:
     """
     Core reusable routine for computing and persisting indicators for all securities
     within a specified date range.
 
+    Securities are computed in batches with the panel engine: one OHLCV load and one
+    vectorized indicator pass per batch.
+
     Args:
         start_date: First trading date to compute indicators.
         end_date: Last trading date to compute indicators.
         context: Logging context (e.g. 'EOD', 'heal', 'recompute').
+        batch_size: Number of securities computed per panel.
+        workers: Worker processes; above 1, batches are sharded across a process pool.
+        columns: Indicator columns to compute and persist; all of them when omitted.
     """
     Log.info(f"[{context}] Computing indicators between {start_date} and {end_date}")
 
     with next(get_db()) as db_session:
-        for security in SecurityHandler(db_session).get_all():
+        security_ids = [
+            security.id for security in SecurityHandler(db_session).get_all()
+        ]
+
+        if workers > 1:
+            _generate_indicators_in_process_pool(
+                security_ids,
+                start_date,
+                end_date,
+                context,
+                batch_size,
+                workers,
+                columns,
+            )
+            Log.info(f"[{context}] Completed indicator generation for all securities.")
+            return
+
+        for batch_start in range(0, len(security_ids), batch_size):
+            batch = security_ids[batch_start : batch_start + batch_size]
             try:
-                df = compute_indicators_for_range(
-                    security_id=security.id,
+                df = compute_indicators_for_securities(
+                    security_ids=batch,
                     start_date=start_date,
                     end_date=end_date,
                     session=db_session,
+                    columns=columns,
                 )
 
                 if df.empty:
-                    Log.debug(f"[{context}] No indicator data for {security.symbol}")
-                    continue
-
-                models = [
-                    _map_indicators_df_to_model(
-                        row._asdict() if hasattr(row, "_asdict") else row
+                    Log.debug(
+                        f"[{context}] No indicator data for securities {batch[0]}..{batch[-1]}"
                     )
-                    for _, row in df.iterrows()
-                ]
+                    continue
 
-                TechnicalIndicatorHandler(db_session).save_all(models)
+                TechnicalIndicatorHandler(db_session).save_frame(df, columns)
                 db_session.commit()
 
-            except InsufficientOHLCVDataError as e:
-                Log.warning(
-                    f"[{context}] Insufficient OHLCV data for {security.symbol}: "
-                    f"{e.start_date} → {e.end_date}"
-                )
-                db_session.rollback()
-                continue
             except InvalidOperation as e:
                 Log.error(
-                    f"[{context}] Decimal error while processing {security.symbol}: {e}"
+                    f"[{context}] Decimal error while processing securities "
+                    f"{batch[0]}..{batch[-1]}: {e}"
                 )
                 db_session.rollback()
                 continue
             except Exception as e:
                 Log.error(
-                    f"[{context}] Failed to compute indicators for {security.symbol}: {e}"
+                    f"[{context}] Failed to compute indicators for securities "
+                    f"{batch[0]}..{batch[-1]}: {e}"
                 )
                 db_session.rollback()
                 continue
@@ -136,46 +530,196 @@ def _generate_indicators_for_range(
     Log.info(f"[{context}] Completed indicator generation for all securities.")
 
 
-def _map_indicators_df_to_model(computed_values: dict) -> TechnicalIndicator:
-    """
-    Map indicator row(s) to a list of TechnicalIndicator models.
-    Currently supports one row (latest measurement).
-    """
-
-    tc = TechnicalIndicator(
-        measurement_date=computed_values["measurement_date"],
-        security_id=computed_values["security_id"],
-        sma_20=_to_float(computed_values.get("sma_20")),
-        sma_50=_to_float(computed_values.get("sma_50")),
-        sma_200=_to_float(computed_values.get("sma_200")),
-        ema_9=_to_float(computed_values.get("ema_9")),
-        ema_20=_to_float(computed_values.get("ema_20")),
-        rsi_14=_to_float(computed_values.get("rsi_14")),
-        high_10d=_to_float(computed_values.get("high_10d")),
-        low_10d=_to_float(computed_values.get("low_10d")),
-        avg_vol_5d=_to_float(computed_values.get("avg_vol_5d")),
-        avg_vol_20d=_to_float(computed_values.get("avg_vol_20d")),
-        avg_vol_50d=_to_float(computed_values.get("avg_vol_50d")),
-        avg_vol_weighted_change_5d=_to_float(
-            computed_values.get("avg_vol_weighted_change_5d")
-        ),
-        avg_vol_weighted_change_50d=_to_float(
-            computed_values.get("avg_vol_weighted_change_50d")
-        ),
-        macd=_to_float(computed_values.get("macd")),
-        macd_signal=_to_float(computed_values.get("macd_signal")),
-        macd_hist=_to_float(computed_values.get("macd_hist")),
-        atr_14=_to_float(computed_values.get("atr_14")),
-        close_position=_to_float(computed_values.get("close_position")),
-        percent_change=_to_float(computed_values.get("percent_change")),
-        price_volume_corr_20=_to_float(computed_values.get("price_volume_corr_20")),
-        range_pct_20=_to_float(computed_values.get("range_pct_20")),
-        breakout_proximity_20=_to_float(computed_values.get("breakout_proximity_20")),
-        rolling_volatility_20=_to_float(computed_values.get("rolling_volatility_20")),
+def _generate_indicators_in_process_pool(
+    security_ids: List[int],
+    start_date: date,
+    end_date: date,
+    context: str,
+    shard_size: int,
+    workers: int,
+    columns: Optional[List[str]] = None,
+) -> None:
+    shards = [
+        (
+            f"securities {shard[0]}..{shard[-1]}",
+            (shard, start_date, end_date, columns),
+        )
+        for shard in (
+            security_ids[shard_start : shard_start + shard_size]
+            for shard_start in range(0, len(security_ids), shard_size)
+        )
+    ]
+    Log.info(
+        f"[{context}] Computing {len(shards)} shards of up to {shard_size} securities "
+        f"on {workers} workers"
+    )
+    _write_indicator_shards(_compute_indicator_shard, shards, context, workers, columns)
+
+
+def _heal_range_shards(
+    ranges: List[HealRange], batch_size: int
+) -> List[Tuple[str, tuple]]:
+    # Ranges with similar dates have similar lengths, which keeps panel padding small
+    ranges = sorted(ranges, key=lambda r: (r.start_date, r.end_date, r.security_id))
+    return [
+        (f"{len(batch)} ranges from {batch[0].start_date}", (batch,))
+        for batch in (
+            ranges[batch_start : batch_start + batch_size]
+            for batch_start in range(0, len(ranges), batch_size)
+        )
+    ]
+
+
+def _merge_heal_spans(ranges: List[HealRange]) -> List[Tuple[date, date]]:
+    """Union of the ranges' dates as disjoint (start, end) spans, for ranking them."""
+    spans: List[Tuple[date, date]] = []
+    for r in sorted(ranges, key=lambda r: r.start_date):
+        if spans and r.start_date <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], r.end_date))
+        else:
+            spans.append((r.start_date, r.end_date))
+    return spans
+
+
+def _write_indicator_shards(
+    compute_shard: Callable[..., Dict[str, np.ndarray]],
+    shards: List[Tuple[str, tuple]],
+    context: str,
+    workers: int,
+    columns: Optional[List[str]] = None,
+) -> int:
+    """
+    Run compute_shard over (label, args) shards and upsert each result as it arrives,
+    writing only columns when given. Returns the number of shards that failed.
+
+    Above one worker, shards run in a process pool. Each worker loads and computes with
+    its own DB session and returns compact column arrays; this process is the single
+    writer, so inserts are never contended between workers.
+    """
+    with next(get_db()) as db_session:
+        if workers <= 1:
+            return sum(
+                not _save_indicator_shard(
+                    partial(compute_shard, *args), label, context, db_session, columns
+                )
+                for label, args in shards
+            )
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_indicator_worker
+        ) as pool:
+            futures = {
+                pool.submit(compute_shard, *args): label for label, args in shards
+            }
+            return sum(
+                not _save_indicator_shard(
+                    future.result, futures[future], context, db_session, columns
+                )
+                for future in as_completed(futures)
+            )
+
+
+def _save_indicator_shard(
+    compute: Callable[[], Dict[str, np.ndarray]],
+    label: str,
+    context: str,
+    db_session,
+    columns: Optional[List[str]] = None,
+) -> bool:
+    try:
+        arrays = compute()
+        if not len(arrays["security_id"]):
+            Log.debug(f"[{context}] No indicator data for {label}")
+            return True
+
+        TechnicalIndicatorHandler(db_session).save_frame(pd.DataFrame(arrays), columns)
+        db_session.commit()
+        return True
+
+    except Exception as e:
+        Log.error(f"[{context}] Failed to compute indicators for {label}: {e}")
+        db_session.rollback()
+        return False
+
+
+def _init_indicator_worker() -> None:
+    # Forked workers must not reuse the parent's pooled connections
+    engine.dispose(close=False)
+
+
+def _compute_indicator_shard(
+    security_ids: List[int],
+    start_date: date,
+    end_date: date,
+    columns: Optional[List[str]] = None,
+) -> Dict[str, np.ndarray]:
+    with next(get_db()) as db_session:
+        df = compute_indicators_for_securities(
+            security_ids=security_ids,
+            start_date=start_date,
+            end_date=end_date,
+            session=db_session,
+            columns=columns,
+        )
+
+    return _indicator_frame_to_columns(df)
+
+
+def _compute_heal_shard(ranges: List[HealRange]) -> Dict[str, np.ndarray]:
+    with next(get_db()) as db_session:
+        df = compute_indicators_for_ranges(
+            [(r.security_id, r.start_date, r.end_date) for r in ranges],
+            session=db_session,
+        )
+
+    return _indicator_frame_to_columns(df)
+
+
+def _indicator_frame_to_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    if df.empty:
+        return {"security_id": np.empty(0, dtype="int64")}
+
+    columns = {
+        column: df[column].to_numpy(dtype="float64")
+        for column in df.columns
+        if column not in {"security_id", "measurement_date"}
+    }
+    columns["security_id"] = df["security_id"].to_numpy(dtype="int64")
+    columns["measurement_date"] = pd.to_datetime(df["measurement_date"]).to_numpy(
+        dtype="M8[D]"
+    )
+    return columns
+
+
+def _seed_indicator_state(
+    security_id: int, compute_date: date, db_session
+) -> tuple[List[Dict[str, Any]], IndicatorState]:
+    lookback_start = get_nth_trading_day(
+        exchange=EXCHANGE, as_of=compute_date, offset=-abs(TRADING_DAYS_REQUIRED)
+    )
+    df = load_ohlcv_history(security_id, lookback_start, compute_date, db_session)
+    indicators = compute_indicators_from_ohlcv(df, security_id)
+
+    rows = indicators[indicators["measurement_date"] == compute_date].to_dict(
+        orient="records"
     )
+    return rows, build_indicator_state(security_id, df)
+
 
-    return tc
+def _advance_indicator_state_to(
+    state: IndicatorState, compute_date: date, db_session
+) -> tuple[List[Dict[str, Any]], IndicatorState]:
+    if state.as_of_date >= compute_date:
+        return [], state
 
+    candles = OHLCVDailyHandler(db_session).get_period_for_security(
+        start=state.as_of_date + timedelta(days=1),
+        end=compute_date,
+        security_id=state.security_id,
+    )
 
-def _to_float(value) -> Optional[float]:
-    return float(value) if pd.notna(value) else None
+    rows = []
+    for candle in candles:
+        state, row = advance_indicator_state(state, candle.model_dump())
+        rows.append(row)
+    return rows, state
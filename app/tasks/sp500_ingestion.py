@@ -1,7 +1,7 @@
 import time
 
 from datetime import date, datetime
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from requests import HTTPError
 
@@ -9,6 +9,7 @@ from app.core.db import get_db
 from app.handlers.security import SecurityHandler
 from app.handlers.stock_index_constituent import StockIndexConstituentHandler
 from app.models.stock_index_constituent import SP500, StockIndexConstituentCreate
+from app.models.stock_index_constituent_delta import diff_constituents
 from app.models.stock_index_snapshot import StockIndexSnapshot
 from app.services.stock_index_service import (
     extract_constituents,
@@ -18,6 +19,10 @@ from app.services.stock_index_service import (
 )
 from app.utils.log_wrapper import Log
 
+# Materialize a full constituent set after this many consecutive delta snapshots so
+# membership-as-of replays stay short.
+SNAPSHOT_COMPACTION_INTERVAL = 20
+
 
 def daily_sp500_sync() -> bool:
     html = get_latest_snapshot_html()
@@ -37,17 +42,36 @@ def daily_sp500_sync() -> bool:
 
             return False
 
-        snapshot = ic_handler.save_snapshot(SP500, snapshot_hash, today)
+        security_ids = _resolve_security_ids(records, security_handler)
+        previous_snapshot = ic_handler.get_most_recent_snapshot(SP500)
+
+        if previous_snapshot is None:
+            snapshot = ic_handler.save_snapshot(SP500, snapshot_hash, today)
+            if snapshot is None or snapshot.id is None:
+                raise ValueError("Snapshot returned was empty")
+
+            ic_objects = _map_ic_objects(security_ids, snapshot.id)
+            ic_handler.save_all(ic_objects)
+            db_session.commit()
+            Log.info(
+                f"{len(ic_objects)} records inserted for {today} with hash {snapshot_hash}"
+            )
+            return True
+
+        previous_members = ic_handler.get_membership_as_of(
+            previous_snapshot.snapshot_date, SP500
+        )
+        added, removed = diff_constituents(previous_members, security_ids)
 
+        snapshot = ic_handler.save_snapshot(SP500, snapshot_hash, today, is_delta=True)
         if snapshot is None or snapshot.id is None:
             raise ValueError("Snapshot returned was empty")
 
-        ic_objects = _map_ic_objects(records, security_handler, snapshot.id)
-        ic_handler.save_all(ic_objects)
-
+        ic_handler.save_deltas(snapshot, added, removed)
         db_session.commit()
         Log.info(
-            f"{len(ic_objects)} records inserted for {today} with hash {snapshot_hash}"
+            f"Delta snapshot stored for {today} with hash {snapshot_hash}: "
+            f"{len(added)} added, {len(removed)} removed"
         )
 
         return True
@@ -63,6 +87,7 @@ def backfill_sp500_from_wayback():
         oldest_snapshot = ic_handler.get_earliest_snapshot(SP500)
         oldest_hash = oldest_snapshot.snapshot_hash
         oldest_snapshot_date = oldest_snapshot.snapshot_date
+        oldest_members = ic_handler.get_membership_as_of(oldest_snapshot_date, SP500)
 
         for timestamp, original_path in reversed(snapshot_urls[:-1]):
             snapshot_date = datetime.strptime(timestamp, "%Y%m%d%H%M%S").date()
@@ -92,24 +117,64 @@ def backfill_sp500_from_wayback():
                 )
                 continue
 
+            # The older snapshot becomes the materialized base and the previous
+            # oldest is rewritten as adds/removes against it.
+            security_ids = _resolve_security_ids(records, security_handler)
             snapshot = ic_handler.save_snapshot(SP500, snapshot_hash, snapshot_date)
-            ic_objects = _map_ic_objects(records, security_handler, snapshot.id)
-
+            ic_objects = _map_ic_objects(security_ids, snapshot.id)
             ic_handler.save_all(ic_objects)
+
+            added, removed = diff_constituents(security_ids, oldest_members)
+            ic_handler.convert_to_delta(oldest_snapshot, added, removed)
+
             db_session.commit()
             Log.info(
-                f"{len(ic_objects)} records inserted for {snapshot_date} with hash {snapshot_hash}"
+                f"{len(ic_objects)} records inserted for {snapshot_date} with hash {snapshot_hash}; "
+                f"{oldest_snapshot.snapshot_date} stored as {len(added)} adds, {len(removed)} removes"
             )
 
+            oldest_snapshot = snapshot
             oldest_hash = snapshot_hash
+            oldest_members = security_ids
 
+    compact_sp500_snapshots()
 
-def _map_ic_objects(
-    records: List[Dict],
-    security_handler: SecurityHandler,
-    snapshot_id: int,
-) -> List[StockIndexConstituentCreate]:
-    ic_objects = []
+
+def compact_sp500_snapshots(interval: int = SNAPSHOT_COMPACTION_INTERVAL) -> int:
+    """
+    Materialize the full constituent set of every `interval`-th consecutive delta snapshot.
+    Returns the number of snapshots materialized.
+    """
+    materialized = 0
+
+    with next(get_db()) as db_session:
+        ic_handler = StockIndexConstituentHandler(db_session)
+        deltas_since_full = 0
+
+        for snapshot in ic_handler.get_snapshots_ordered(SP500):
+            if not snapshot.is_delta:
+                deltas_since_full = 0
+                continue
+
+            deltas_since_full += 1
+            if deltas_since_full < interval:
+                continue
+
+            members = ic_handler.get_membership_as_of(snapshot.snapshot_date, SP500)
+            ic_handler.materialize_snapshot(snapshot, members)
+            deltas_since_full = 0
+            materialized += 1
+
+        db_session.commit()
+
+    Log.info(f"Materialized {materialized} S&P 500 snapshots during compaction.")
+    return materialized
+
+
+def _resolve_security_ids(
+    records: List[Dict], security_handler: SecurityHandler
+) -> Set[int]:
+    security_ids = set()
     for record in records:
         security = security_handler.get_or_create(record)
 
@@ -117,11 +182,18 @@ def _map_ic_objects(
             Log.warning(f"Security {record['symbol']} could not be created")
             continue
 
-        ic_objects.append(
-            StockIndexConstituentCreate(
-                index_name=SP500,
-                snapshot_id=snapshot_id,
-                security_id=security.id,
-            )
+        security_ids.add(security.id)
+    return security_ids
+
+
+def _map_ic_objects(
+    security_ids: Set[int], snapshot_id: int
+) -> List[StockIndexConstituentCreate]:
+    return [
+        StockIndexConstituentCreate(
+            index_name=SP500,
+            snapshot_id=snapshot_id,
+            security_id=security_id,
         )
-    return ic_objects
+        for security_id in sorted(security_ids)
+    ]
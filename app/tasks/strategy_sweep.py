@@ -0,0 +1,78 @@
+from datetime import date
+from typing import Optional, Set, Tuple
+
+import pandas as pd
+
+from app.core.db import get_db
+from app.handlers.eod_signal import EODSignalHandler
+from app.models.signal_strategy import SignalStrategy
+from app.signals.compiled import compile_strategy
+from app.signals.sweep import (
+    SIGNAL_COLUMNS,
+    ParameterGrid,
+    SweepEngine,
+    strategy_variants,
+    sweep_frames,
+)
+from app.tasks.generate_signals import load_feature_frame, ranked_df_to_signal_frame
+from app.utils.datetime_utils import yesterday
+from app.utils.log_wrapper import Log
+
+
+def sweep_strategy(
+    signal_strategy: SignalStrategy,
+    grid: ParameterGrid,
+    start_date: date,
+    end_date: Optional[date] = None,
+    persist: bool = False,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Evaluate every variant of signal_strategy in grid (see strategy_variants) over
+    [start_date, end_date], loading the feature frame once for all of them.
+
+    Returns the variants (parameters, signal count, mean score) and all of their
+    signals tagged with variant. Signals are only stored as EODSignal rows, under
+    each variant's own strategy_id and name, when persist is set.
+    """
+    end_date = end_date or yesterday()
+    variants = list(strategy_variants(signal_strategy, grid))
+    required_cols: Set[str] = set().union(
+        *(compile_strategy(variant.strategy).eod_columns for variant in variants)
+    )
+    Log.info(
+        f"[SWEEP] {signal_strategy.name}: {len(variants)} variants over "
+        f"{start_date} → {end_date}"
+    )
+
+    with next(get_db()) as db_session:
+        df = load_feature_frame(db_session, start_date, end_date, required_cols)
+        if df.empty:
+            Log.warning(
+                f"[SWEEP] No indicator data between {start_date} and {end_date}"
+            )
+            return sweep_frames(iter(()))
+
+        engine = SweepEngine(df)
+        summary, signals = sweep_frames(
+            (variant, engine.evaluate(variant.strategy)) for variant in variants
+        )
+        Log.info(
+            f"[SWEEP] Evaluated {len(variants)} variants on {len(df)} rows "
+            f"({engine.evaluator.hits} filter masks reused)"
+        )
+
+        if persist and not signals.empty:
+            frame = pd.concat(
+                [
+                    ranked_df_to_signal_frame(
+                        variant_signals[SIGNAL_COLUMNS], variants[index].strategy
+                    )
+                    for index, variant_signals in signals.groupby("variant", sort=True)
+                ],
+                ignore_index=True,
+            )
+            EODSignalHandler(db_session).save_frame(frame)
+            db_session.commit()
+            Log.info(f"[SWEEP] Persisted {len(frame)} signals")
+
+    return summary, signals
@@ -3,11 +3,16 @@
 import logging
 import sys
 
+from app.core.settings import get_settings
+from app.indicators.lazy import active_indicator_columns
 from app.tasks.candle_ingestion import daily_candle_fetch, heal_missing_candle_data
 from app.tasks.generate_signals import generate_daily_signals
 from app.tasks.indicator_computation import (
+    compute_cross_sectional_indicators,
     compute_daily_indicators_for_all_securities,
+    compute_daily_indicators_incrementally,
     heal_missing_technical_indicators,
+    recompute_invalidated_indicators,
 )
 from app.tasks.ticker_ingestion import region_security_sync
 from app.tasks.update_securities import check_for_missing_metadata
@@ -43,10 +48,23 @@ def main() -> int:
         if new_tickers_added:
             Log.info("Healing indicator gaps (historical backfill).")
             heal_missing_technical_indicators()
+        elif get_settings().LAZY_INDICATORS:
+            columns = active_indicator_columns()
+            Log.info(f"Computing indicators needed by active strategies: {columns}")
+            compute_daily_indicators_for_all_securities(columns=columns)
+        elif get_settings().INCREMENTAL_INDICATORS:
+            Log.info("Advancing indicator state with pulled daily OHLCV data...")
+            compute_daily_indicators_incrementally()
         else:
             Log.info("Computing indicators on pulled daily OHLCV data...")
             compute_daily_indicators_for_all_securities()
 
+        Log.info("Recomputing indicators invalidated by corrected candles...")
+        recompute_invalidated_indicators()
+
+        Log.info("Ranking indicators across the universe...")
+        compute_cross_sectional_indicators()
+
         Log.info("Generating daily signals...")
         generate_daily_signals()
 
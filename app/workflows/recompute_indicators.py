@@ -5,7 +5,10 @@ import sys
 
 from datetime import date
 
-from app.tasks.indicator_computation import recompute_indicators_for_all_securities
+from app.tasks.indicator_computation import (
+    compute_cross_sectional_indicators,
+    recompute_indicators_for_all_securities,
+)
 from app.utils.log_setup import configure_logging
 from app.utils.log_wrapper import Log
 
@@ -21,6 +24,7 @@ def main() -> int:
         end_date = date.today()
 
         recompute_indicators_for_all_securities(start_date, end_date)
+        compute_cross_sectional_indicators(start_date, end_date)
 
     except Exception as e:
         Log.critical(f"Indicator recomputation failed: {e}")
@@ -22,7 +22,10 @@ def main() -> int:
     try:
         start_date = date(2025, 1, 1)
 
-        generate_historic_signals_for_all_strategies(start_date)
+        report = generate_historic_signals_for_all_strategies(start_date)
+        if report.failed:
+            Log.critical(f"Signal recomputation incomplete: {report.summary()}")
+            return 1
 
     except Exception as e:
         Log.critical(f"Indicator recomputation failed: {e}")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Sweep a signal strategy's parameters over historic data without editing its JSON.
+
+The grid is a JSON object of dotted config paths to lists of values:
+
+    {"max_signals_per_day": [3, 5, 10],
+     "ranking.0.center": [50, 55, 60],
+     "signal_filters.1.value": [1.0, 1.02]}
+
+    python -m app.workflows.strategy_sweep --strategy momentum_strength \\
+        --grid grid.json --start 2024-01-01 --output-dir sweep/
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from datetime import date
+from pathlib import Path
+
+from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
+from app.tasks.strategy_sweep import sweep_strategy
+from app.utils.log_setup import configure_logging
+from app.utils.log_wrapper import Log
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--strategy", required=True, help="signal strategy id")
+    parser.add_argument("--grid", required=True, help="JSON file of the grid")
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument("--end", type=date.fromisoformat)
+    parser.add_argument("--output-dir", help="write variants.csv and signals.csv here")
+    parser.add_argument(
+        "--persist", action="store_true", help="store every variant's EOD signals"
+    )
+    args = parser.parse_args()
+
+    configure_logging(logger_name="strategy-sweep", level=logging.INFO, use_utc=False)
+
+    try:
+        grid = json.loads(Path(args.grid).read_text(encoding="utf-8"))
+        summary, signals = sweep_strategy(
+            SIGNAL_STRATEGY_PROVIDER.get_by_id(args.strategy),
+            grid,
+            args.start,
+            args.end,
+            persist=args.persist,
+        )
+    except Exception as e:
+        Log.critical(f"Strategy sweep failed: {e}")
+        return 1
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        summary.to_csv(output_dir / "variants.csv", index=False)
+        signals.to_csv(output_dir / "signals.csv", index=False)
+        Log.info(f"Wrote {len(summary)} variants to {output_dir}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,10 @@ from app.routers.eod_signals import router as signals
 from app.routers.financials import router as financials
 from app.routers.indicators import router as indicators
 from app.routers.ohlcv_dailies import router as ohlcv_dailies
+from app.routers.screener import router as screener
 from app.routers.securities import router as securities
+from app.stratagies.execution_strategies import EXECUTION_STRATEGY_PROVIDER
+from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
 from app.utils import Log
 from app.utils.log_setup import configure_logging
 
@@ -45,6 +48,11 @@ def get_app():
     stock_picker_api.include_router(ohlcv_dailies)
     stock_picker_api.include_router(securities)
     stock_picker_api.include_router(signals)
+    stock_picker_api.include_router(screener)
+
+    if app_settings.STRATEGY_RELOAD_SECONDS > 0:
+        SIGNAL_STRATEGY_PROVIDER.watch(app_settings.STRATEGY_RELOAD_SECONDS)
+        EXECUTION_STRATEGY_PROVIDER.watch(app_settings.STRATEGY_RELOAD_SECONDS)
 
     @stock_picker_api.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
@@ -2,8 +2,11 @@ import importlib
 import logging
 import pkgutil
 
-from typing import Generator
+from datetime import date
+from typing import Callable, Generator
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from sqlalchemy_utils import create_database, database_exists, drop_database
@@ -115,6 +118,96 @@ def client(
         yield test_client
 
 
+@pytest.fixture
+def synthetic_ohlcv() -> Callable[..., pd.DataFrame]:
+    """
+    Factory of one security's random daily candles, the last on end, with flat bars
+    and a zero-volume day that hit the indicator edge cases.
+    """
+
+    def build(
+        security_id: int, n_days: int, seed: int, end: date = date(2024, 12, 31)
+    ) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        dates = pd.bdate_range(end=end, periods=n_days).date
+        close = 50 + np.cumsum(rng.normal(0, 1, n_days)).round(2)
+        close = np.abs(close) + 1
+        high = close + rng.uniform(0, 2, n_days).round(2)
+        low = close - rng.uniform(0, 2, n_days).round(2)
+        high[::17] = low[::17] = close[
+            ::17
+        ]  # flat bars hit the close_position edge case
+        volume = rng.integers(500_000, 5_000_000, n_days)
+        volume[n_days // 3] = 0  # zero-volume day hits the avg_volume edge case
+        return pd.DataFrame(
+            {
+                "security_id": security_id,
+                "candle_date": dates,
+                "open": close + rng.normal(0, 0.5, n_days).round(2),
+                "high": high,
+                "low": low,
+                "close": close,
+                "adjusted_close": close,
+                "volume": volume,
+            }
+        )
+
+    return build
+
+
+@pytest.fixture
+def feature_frame() -> Callable[..., pd.DataFrame]:
+    """
+    Factory of random combined OHLCV and indicator rows shaped like
+    get_combined_frame_between_dates, with some indicators missing.
+    """
+
+    def build(n_securities: int = 300, n_days: int = 5, seed: int = 0) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        n = n_securities * n_days
+        close = rng.uniform(3, 200, n).round(2)
+
+        def around(scale: float) -> np.ndarray:
+            return close * (1 + rng.normal(0, scale, n))
+
+        df = pd.DataFrame(
+            {
+                "security_id": np.tile(np.arange(1, n_securities + 1), n_days),
+                "measurement_date": np.repeat(
+                    pd.bdate_range("2024-03-04", periods=n_days).date, n_securities
+                ),
+                "ohlcv_daily_id": np.arange(n),
+                "open": around(0.01),
+                "close": close,
+                "volume": rng.integers(100_000, 10_000_000, n),
+                "sma_20": around(0.03),
+                "sma_50": around(0.05),
+                "sma_200": around(0.1),
+                "ema_20": around(0.03),
+                "high_10d": close * (1 + rng.uniform(0, 0.05, n)),
+                "rsi_14": rng.uniform(10, 90, n),
+                "atr_14": close * rng.uniform(0.005, 0.06, n),
+                "macd": rng.normal(0, 1, n),
+                "macd_hist": rng.normal(0, 0.5, n),
+                "avg_vol_5d": rng.uniform(1e5, 1e7, n),
+                "avg_vol_20d": rng.uniform(1e5, 1e7, n),
+                "avg_vol_50d": rng.uniform(1e5, 1e7, n),
+                "avg_vol_weighted_change_5d": rng.normal(0, 0.02, n),
+                "avg_vol_weighted_change_50d": rng.normal(0, 0.02, n),
+                "close_position": rng.uniform(0, 1, n),
+                "range_pct_20": rng.uniform(0, 0.3, n),
+                "breakout_proximity_20": rng.uniform(0, 0.1, n),
+                "rolling_volatility_20": rng.uniform(0, 0.05, n),
+            }
+        )
+        # Missing indicators, as for recent listings
+        df.loc[rng.choice(n, n // 20, replace=False), "sma_200"] = np.nan
+        df.loc[rng.choice(n, n // 50, replace=False), "rsi_14"] = np.nan
+        return df
+
+    return build
+
+
 @pytest.fixture(autouse=True, scope="session")
 def configure_test_logging() -> None:
     """
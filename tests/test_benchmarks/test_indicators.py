@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from app.benchmarks.indicators import build_report, find_regressions, run_suite
+from app.benchmarks.universe import security_frame, synthetic_universe
+from app.indicators.panel import OHLCVPanel
+
+
+def test_synthetic_universe_is_reproducible_and_ordered():
+    universe = synthetic_universe(20, years=1, seed=3)
+    again = synthetic_universe(20, years=1, seed=3)
+
+    np.testing.assert_array_equal(universe.dates, again.dates)
+    np.testing.assert_array_equal(universe.fields["close"], again.fields["close"])
+
+    frame = universe.to_frame()
+    assert frame.groupby("security_id")["candle_date"].is_monotonic_increasing.all()
+    # Every security ends on the same day; histories have different lengths
+    assert frame.groupby("security_id")["candle_date"].max().nunique() == 1
+    assert frame.groupby("security_id").size().nunique() > 1
+    assert (universe.fields["low"] <= universe.fields["high"]).all()
+
+    panel = OHLCVPanel.from_long(frame)
+    assert panel.valid.to_numpy().sum() == len(universe)
+
+
+def test_security_frame_selects_one_security():
+    universe = synthetic_universe(5, years=1, seed=1)
+    frame = security_frame(universe, 4)
+
+    pd.testing.assert_frame_equal(
+        frame,
+        universe.to_frame().query("security_id == 4").reset_index(drop=True),
+    )
+
+
+def test_suite_reports_every_benchmark():
+    universe = synthetic_universe(4, years=1, seed=0)
+    results = run_suite(universe, sample=2, shard_size=3, repeat=1)
+
+    assert "compute_indicators_for_range" in results
+    assert "panel/compute_indicator_panel" in results
+    assert results["function/sma_200"]["securities"] == 2
+    assert results["panel/from_long"]["securities"] == 4
+
+
+def test_find_regressions_beyond_threshold():
+    baseline = build_report({"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}, {})
+    report = build_report(
+        {"a": {"seconds": 1.2}, "b": {"seconds": 1.3}, "new": {"seconds": 9.0}}, {}
+    )
+
+    regressions = find_regressions(report, baseline, threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b:")
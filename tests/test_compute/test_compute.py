@@ -1,5 +1,4 @@
 from datetime import date, timedelta
-from typing import List
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
@@ -7,9 +6,9 @@ import pytest
 
 from freezegun import freeze_time
 
+from app.handlers.ohlcv_daily import ohlcv_rows_to_arrays
 from app.indicators.compute import compute_indicators_for_range
 from app.indicators.exceptions import InsufficientOHLCVDataError
-from app.models.ohlcv_daily import OHLCVDaily
 
 
 @patch("app.handlers.ohlcv_daily.OHLCVDailyHandler")
@@ -21,23 +20,8 @@ def test_compute_all_indicators_raises_on_insufficient_rows(
     mock_handler = MagicMock()
     mock_handler_cls.return_value = mock_handler
 
-    # Simulate only 150 rows of OHLCV data
-    dates = pd.date_range(start="2024-06-01", periods=150, freq="B")
-    mock_ohlcv_rows: List[OHLCVDaily] = [
-        MagicMock(
-            model_dump=lambda i=i, d=d: {
-                "candle_date": date.today(),
-                "open": float(i),
-                "high": float(i + 1),
-                "low": float(i - 1),
-                "adjusted_close": float(i),
-                "close": float(i),
-                "volume": 1000 + i,
-            }
-        )
-        for i, d in enumerate(dates)
-    ]
-    mock_handler.get_period_for_security.return_value = mock_ohlcv_rows
+    # A security without candles cannot produce any indicator
+    mock_handler.load_arrays.return_value = ohlcv_rows_to_arrays([])
 
     compute_date = date(2024, 12, 31)
 
@@ -0,0 +1,58 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.indicators.cross_sectional import cross_sectional_indicators
+from app.models.technical_indicator import CROSS_SECTIONAL_COLUMNS
+
+DAY_1 = date(2024, 12, 30)
+DAY_2 = date(2024, 12, 31)
+
+
+@pytest.fixture
+def inputs() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "security_id": [1, 2, 3, 4, 1, 2, 3, 4],
+            "measurement_date": [DAY_1] * 4 + [DAY_2] * 4,
+            "gics_sector": ["Energy", "Energy", "Utilities", "Utilities"] * 2,
+            "rsi_14": [30.0, 70.0, 50.0, 50.0, 10.0, np.nan, 90.0, 60.0],
+            "percent_change": [0.01, -0.02, 0.03, 0.00, 0.02, 0.01, 0.01, 0.01],
+            "volume": [200.0, 100.0, 300.0, 50.0, 100.0, 100.0, 100.0, 100.0],
+            "avg_vol_20d": [100.0, 100.0, 100.0, 0.0, 100.0, 50.0, 200.0, np.nan],
+        }
+    )
+
+
+def test_percentile_ranks_are_per_date(inputs):
+    result = cross_sectional_indicators(inputs)
+
+    assert list(result.columns[2:]) == CROSS_SECTIONAL_COLUMNS
+    np.testing.assert_allclose(
+        result["rsi_14_pct_rank"], [0.25, 1.0, 0.625, 0.625, 1 / 3, np.nan, 1.0, 2 / 3]
+    )
+    # Zero or missing average volume leaves relative volume, and its rank, missing
+    np.testing.assert_allclose(
+        result["relative_volume_pct_rank"],
+        [2 / 3, 1 / 3, 1.0, np.nan, 2 / 3, 1.0, 1 / 3, np.nan],
+    )
+
+
+def test_sector_z_scores_are_per_date_and_sector(inputs):
+    result = cross_sectional_indicators(inputs)
+
+    z = 1 / np.sqrt(2)  # two values, sample std
+    np.testing.assert_allclose(
+        result["rsi_14_sector_z"], [-z, z, np.nan, np.nan, np.nan, np.nan, z, -z]
+    )
+    # A sector without dispersion has no z-score
+    assert result.loc[4:, "percent_change_sector_z"].iloc[2:].isna().all()
+
+
+def test_keys_are_preserved(inputs):
+    result = cross_sectional_indicators(inputs.iloc[::-1])
+
+    assert result["security_id"].tolist() == [4, 3, 2, 1, 4, 3, 2, 1]
+    assert result["measurement_date"].tolist() == [DAY_2] * 4 + [DAY_1] * 4
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from app.indicators.compute import compute_indicators_from_ohlcv
+from app.indicators.incremental import (
+    advance_indicator_state,
+    build_indicator_state,
+    find_inconsistencies,
+)
+
+
+def _synthetic_ohlcv(n_days: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = np.abs(50 + np.cumsum(rng.normal(0, 1, n_days))).round(2) + 1
+    high = close + rng.uniform(0, 2, n_days).round(2)
+    low = close - rng.uniform(0, 2, n_days).round(2)
+    high[::13] = low[::13] = close[::13]
+    volume = rng.integers(500_000, 5_000_000, n_days).astype("float64")
+    volume[n_days - 30] = 0.0
+    return pd.DataFrame(
+        {
+            "candle_date": pd.bdate_range("2023-01-02", periods=n_days).date,
+            "open": close,
+            "high": high,
+            "low": low,
+            "close": close,
+            "adjusted_close": close,
+            "volume": volume,
+        }
+    )
+
+
+def test_incremental_updates_match_full_recomputation():
+    df = _synthetic_ohlcv(320)
+    seed_rows = 250
+
+    full = compute_indicators_from_ohlcv(df, security_id=1)
+
+    state = build_indicator_state(1, df.iloc[:seed_rows])
+    for i in range(seed_rows, len(df)):
+        state, row = advance_indicator_state(state, df.iloc[i].to_dict())
+
+        expected = full.iloc[i].to_dict()
+        assert row["measurement_date"] == expected["measurement_date"]
+        assert find_inconsistencies(row, expected, rtol=1e-9) == []
+
+    assert state.as_of_date == df["candle_date"].iloc[-1]
+    assert len(state.adjusted_close_tail) == 200
+
+
+def test_incremental_update_after_zero_close_matches_full_recomputation():
+    df = _synthetic_ohlcv(260)
+    seed_rows = 250
+    df.loc[seed_rows - 1, ["close", "low"]] = 0.0
+
+    full = compute_indicators_from_ohlcv(df, security_id=1)
+
+    state = build_indicator_state(1, df.iloc[:seed_rows])
+    state, row = advance_indicator_state(state, df.iloc[seed_rows].to_dict())
+
+    assert np.isinf(row["percent_change"])
+    assert find_inconsistencies(row, full.iloc[seed_rows].to_dict(), rtol=1e-9) == []
+
+
+def test_find_inconsistencies_reports_mismatched_columns():
+    full = {"measurement_date": None, "sma_20": 10.0, "rsi_14": None, "atr_14": 1.0}
+    incremental = {"sma_20": 10.0, "rsi_14": float("nan"), "atr_14": 1.5}
+
+    assert find_inconsistencies(incremental, full) == ["atr_14"]
@@ -0,0 +1,87 @@
+import pandas as pd
+
+from app.indicators.compute import compute_indicators_from_ohlcv
+from app.indicators.lazy import required_indicator_columns
+from app.indicators.panel import OHLCVPanel, compute_indicator_panel
+from app.models.execution_strategy import ExecutionStrategy
+from app.models.signal_strategy import SignalStrategy
+
+
+def _signal_strategy() -> SignalStrategy:
+    return SignalStrategy.model_validate(
+        {
+            "strategy_id": "lazy_test",
+            "name": "Lazy Test",
+            "signal_filters": [
+                {
+                    "indicator": "sma_50",
+                    "comparison": "<",
+                    "value": 1.0,
+                    "comparison_field": "close",
+                }
+            ],
+            "validate_at_open_filters": [
+                {"indicator": "rsi_14", "comparison": "<", "value": 70}
+            ],
+            "ranking": [
+                {
+                    "indicator": "avg_vol_5d",
+                    "function": "log_ratio",
+                    "denominator": "avg_vol_50d",
+                    "weight": 1.0,
+                }
+            ],
+        }
+    )
+
+
+def _execution_strategy() -> ExecutionStrategy:
+    return ExecutionStrategy.model_validate(
+        {
+            "strategy_id": "exec_test",
+            "entry": {"mode": "IMMEDIATE_AT_OPEN"},
+            "exit": {
+                "stop_offset": {"unit": "atr_14", "multiple": 1.0},
+                "target_offset": {"unit": "atr_14", "multiple": 2.0},
+            },
+            "max_hold_days": 5,
+        }
+    )
+
+
+def test_required_indicator_columns_is_union_of_strategy_columns():
+    columns = required_indicator_columns([_signal_strategy()], [_execution_strategy()])
+
+    # close and volume are OHLCV fields, not indicators
+    assert columns == [
+        "sma_50",
+        "rsi_14",
+        "avg_vol_5d",
+        "avg_vol_20d",
+        "avg_vol_50d",
+        "atr_14",
+    ]
+
+
+def test_compute_only_requested_columns_matches_full_computation(synthetic_ohlcv):
+    df = synthetic_ohlcv(1, 260, seed=4)
+    for column in ["open", "high", "low", "close", "adjusted_close", "volume"]:
+        df[column] = df[column].astype("float64")
+    columns = ["rsi_14", "range_pct_20"]
+
+    full = compute_indicators_from_ohlcv(df, 1)
+    partial = compute_indicators_from_ohlcv(df, 1, columns)
+
+    assert list(partial.columns) == ["measurement_date", "security_id", *columns]
+    pd.testing.assert_frame_equal(partial[columns], full[columns])
+
+
+def test_panel_computes_only_requested_columns(synthetic_ohlcv):
+    panel = OHLCVPanel.from_long(
+        pd.concat([synthetic_ohlcv(1, 260, seed=1), synthetic_ohlcv(2, 230, seed=2)])
+    )
+
+    result = compute_indicator_panel(panel, ["atr_14"])
+
+    assert list(result.columns) == ["measurement_date", "security_id", "atr_14"]
+    assert len(result) == 490
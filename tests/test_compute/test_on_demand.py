@@ -0,0 +1,171 @@
+from datetime import date
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sqlmodel import Session
+
+from app.handlers.ohlcv_daily import ARRAY_FIELDS, ohlcv_rows_to_arrays
+from app.indicators.compute import compute_indicators_for_range
+from app.indicators.on_demand import (
+    IndicatorCache,
+    IndicatorSpec,
+    OnDemandIndicatorError,
+    attach_on_demand_indicators,
+    compute_on_demand_indicators,
+    on_demand_specs,
+)
+
+START = date(2024, 6, 3)
+END = date(2024, 12, 31)
+
+
+@pytest.fixture
+def ohlcv(synthetic_ohlcv) -> pd.DataFrame:
+    return pd.concat([synthetic_ohlcv(1, 400, seed=1), synthetic_ohlcv(2, 300, seed=2)])
+
+
+@pytest.fixture
+def handler(ohlcv):
+    rows = list(
+        ohlcv[["security_id", "candle_date", *ARRAY_FIELDS]].itertuples(
+            index=False, name=None
+        )
+    )
+    handler = MagicMock()
+    handler.get_data_versions.return_value = {1: ("v1",), 2: ("v1",)}
+    handler.load_arrays.side_effect = lambda start, end, ids: ohlcv_rows_to_arrays(
+        [[row for row in rows if row[0] in ids and start <= row[1] <= end]]
+    )
+    with patch("app.handlers.ohlcv_daily.OHLCVDailyHandler", return_value=handler):
+        yield handler
+
+
+def test_parse_indicator_spec():
+    assert IndicatorSpec.parse(" sma( 100 ) ") == IndicatorSpec("sma", (100,))
+    assert IndicatorSpec.parse("rsi(7)").column == "rsi(7)"
+    assert on_demand_specs(["close", "rsi(7)", "sma_20", "rsi( 7)"]) == [
+        IndicatorSpec("rsi", (7,))
+    ]
+
+    for text in ["sma", "sma(0)", "sma(5, 10)", "vwap(5)"]:
+        with pytest.raises(OnDemandIndicatorError):
+            IndicatorSpec.parse(text)
+
+
+def test_on_demand_matches_stored_indicators(handler, ohlcv):
+    specs = [IndicatorSpec.parse(text) for text in ["sma(20)", "ema(9)", "rsi(14)"]]
+    cache = IndicatorCache(max_bytes=10_000_000)
+
+    result = compute_on_demand_indicators(
+        Mock(spec=Session), specs, [1, 2], START, END, cache
+    )
+    # Only the warm-up the specs need is loaded before START, not the whole history
+    lookback_start, _, _ = handler.load_arrays.call_args.args
+    assert ohlcv["candle_date"].min() < lookback_start < START
+
+    for security_id in (1, 2):
+        with patch(
+            "app.indicators.compute._load_ohlcv_df",
+            return_value=ohlcv[ohlcv["security_id"] == security_id],
+        ):
+            stored = compute_indicators_for_range(
+                security_id, START, END, session=Mock(spec=Session)
+            ).reset_index(drop=True)
+        actual = result[result["security_id"] == security_id].reset_index(drop=True)
+
+        assert (
+            actual["measurement_date"].tolist() == stored["measurement_date"].tolist()
+        )
+        for column, stored_column in [
+            ("sma(20)", "sma_20"),
+            ("ema(9)", "ema_9"),
+            ("rsi(14)", "rsi_14"),
+        ]:
+            # EWMs are seeded only their own warm-up before START, not 200 days
+            np.testing.assert_allclose(
+                actual[column], stored[stored_column], rtol=1e-4, err_msg=column
+            )
+
+
+def test_results_are_cached_per_data_version(handler):
+    specs = [IndicatorSpec.parse("sma(100)")]
+    cache = IndicatorCache(max_bytes=10_000_000)
+
+    session = Mock(spec=Session)
+    first = compute_on_demand_indicators(session, specs, [1, 2], START, END, cache)
+    second = compute_on_demand_indicators(session, specs, [1, 2], START, END, cache)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert handler.load_arrays.call_count == 1
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    handler.get_data_versions.return_value = {1: ("v2",), 2: ("v1",)}
+    compute_on_demand_indicators(session, specs, [1, 2], START, END, cache)
+
+    assert handler.load_arrays.call_args.args[2] == [1]
+
+
+def test_cached_series_serve_later_ranges_and_reload_for_earlier_ones(handler):
+    specs = [IndicatorSpec.parse("sma(50)")]
+    cache = IndicatorCache(max_bytes=10_000_000)
+    session = Mock(spec=Session)
+
+    full = compute_on_demand_indicators(session, specs, [1], START, END, cache)
+    later = compute_on_demand_indicators(
+        session, specs, [1], date(2024, 9, 2), date(2024, 10, 31), cache
+    )
+
+    assert handler.load_arrays.call_count == 1
+    assert len(cache) == 2  # one series per security, whatever the range
+    expected = full[
+        (full["security_id"] == 1)
+        & full["measurement_date"].between(date(2024, 9, 2), date(2024, 10, 31))
+    ]
+    np.testing.assert_array_equal(
+        later.loc[later["security_id"] == 1, "sma(50)"], expected["sma(50)"]
+    )
+
+    compute_on_demand_indicators(
+        session, specs, [1], date(2024, 3, 1), date(2024, 3, 29), cache
+    )
+
+    assert handler.load_arrays.call_count == 2
+    assert handler.load_arrays.call_args.args[0] < date(2024, 3, 1)
+    assert len(cache) == 2
+
+
+def test_cache_evicts_least_recently_used_by_size():
+    series = pd.Series(np.zeros(100))
+    size = int(series.memory_usage(index=True, deep=True))
+    cache = IndicatorCache(max_bytes=2 * size)
+
+    cache.put("a", series)
+    cache.put("b", series)
+    cache.get("a")
+    cache.put("c", series)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.nbytes == 2 * size
+
+    cache.put("huge", pd.Series(np.zeros(1000)))
+    assert cache.get("huge") is None
+
+
+def test_attach_on_demand_indicators_to_signal_rows(handler):
+    rows = pd.DataFrame(
+        {"security_id": [1, 2], "measurement_date": [END, END], "close": [1.0, 2.0]}
+    )
+
+    result = attach_on_demand_indicators(Mock(spec=Session), rows, {"close", "sma(50)"})
+
+    assert list(result.columns) == [
+        "security_id",
+        "measurement_date",
+        "close",
+        "sma(50)",
+    ]
+    assert result["sma(50)"].notna().all()
@@ -0,0 +1,163 @@
+from datetime import date
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sqlmodel import Session
+
+from app.handlers.ohlcv_daily import (
+    ARRAY_FIELDS,
+    OHLCVDailyHandler,
+    ohlcv_rows_to_arrays,
+)
+from app.indicators.compute import compute_indicators_for_range
+from app.indicators.panel import (
+    OHLCVPanel,
+    compute_indicator_panel,
+    compute_indicators_for_securities,
+)
+from app.indicators.registry import INDICATOR_REGISTRY
+
+START = date(2024, 6, 3)
+END = date(2024, 12, 31)
+
+
+@pytest.fixture
+def ohlcv_by_security(synthetic_ohlcv) -> dict[int, pd.DataFrame]:
+    # Different history lengths exercise the right-aligned padding
+    return {
+        1: synthetic_ohlcv(1, 400, seed=1),
+        2: synthetic_ohlcv(2, 330, seed=2),
+        3: synthetic_ohlcv(3, 260, seed=3),
+    }
+
+
+def test_panel_matches_per_security_indicators(ohlcv_by_security):
+    panel = OHLCVPanel.from_long(pd.concat(ohlcv_by_security.values()))
+    panel_result = compute_indicator_panel(panel)
+
+    for security_id, df in ohlcv_by_security.items():
+        with patch("app.indicators.compute._load_ohlcv_df", return_value=df):
+            expected = compute_indicators_for_range(
+                security_id=security_id,
+                start_date=START,
+                end_date=END,
+                session=Mock(spec=Session),
+            )
+
+        actual = panel_result[
+            (panel_result["security_id"] == security_id)
+            & (panel_result["measurement_date"] >= START)
+            & (panel_result["measurement_date"] <= END)
+        ]
+
+        expected = expected.reset_index(drop=True)
+        actual = actual.reset_index(drop=True)
+        indicator_columns = [
+            c for c in expected.columns if c not in {"measurement_date", "security_id"}
+        ]
+
+        assert list(actual.columns) == list(expected.columns)
+        assert actual["measurement_date"].tolist() == (
+            expected["measurement_date"].tolist()
+        )
+        pd.testing.assert_frame_equal(
+            actual[indicator_columns],
+            expected[indicator_columns].astype("float64"),
+            check_exact=True,
+        )
+
+
+def test_panel_right_aligns_histories(ohlcv_by_security):
+    panel = OHLCVPanel.from_long(pd.concat(ohlcv_by_security.values()))
+
+    assert panel.dates.shape == (400, 3)
+    assert panel.valid.sum(axis=0).tolist() == [400, 330, 260]
+    # Every security's most recent candle lands on the last row
+    assert (panel.dates[-1] == np.datetime64(END)).all()
+
+
+def _as_rows(df: pd.DataFrame) -> list[tuple]:
+    columns = ["security_id", "candle_date", *ARRAY_FIELDS]
+    return list(df[columns].itertuples(index=False, name=None))
+
+
+def test_ohlcv_arrays_build_the_same_panel_as_orm_rows(ohlcv_by_security):
+    long = pd.concat(ohlcv_by_security.values())
+    rows = _as_rows(long)
+
+    arrays = ohlcv_rows_to_arrays([rows[:500], rows[500:], []])
+
+    assert arrays.security_ids.tolist() == [1, 2, 3]
+    assert arrays.dates.dtype == np.dtype("M8[D]")
+    assert all(values.dtype == np.float64 for values in arrays.fields.values())
+    assert all(values.flags.c_contiguous for values in arrays.fields.values())
+
+    from_arrays = OHLCVPanel.from_long(arrays.to_frame())
+    from_rows = OHLCVPanel.from_long(long)
+    np.testing.assert_array_equal(from_arrays.dates, from_rows.dates)
+    for field in ARRAY_FIELDS:
+        pd.testing.assert_frame_equal(
+            from_arrays.fields[field], from_rows.fields[field]
+        )
+
+
+def test_ohlcv_arrays_empty():
+    arrays = ohlcv_rows_to_arrays([])
+
+    assert len(arrays) == 0
+    assert arrays.to_frame().empty
+
+
+def test_load_arrays_streams_with_a_server_side_cursor(ohlcv_by_security):
+    rows = _as_rows(ohlcv_by_security[1])
+    session = MagicMock()
+    result = session.connection.return_value.execute.return_value
+    result.partitions.return_value = iter([rows[:100], rows[100:]])
+
+    arrays = OHLCVDailyHandler(session).load_arrays(
+        start=START, end=END, security_ids=[1], fetch_size=100
+    )
+
+    _, kwargs = session.connection.return_value.execute.call_args
+    assert kwargs["execution_options"] == {"stream_results": True, "yield_per": 100}
+    assert len(arrays) == len(rows)
+
+
+def test_new_listing_gets_indicators_it_has_history_for(synthetic_ohlcv):
+    listing = synthetic_ohlcv(9, 60, seed=9)
+    history = INDICATOR_REGISTRY.history()
+
+    with patch("app.indicators.compute._load_ohlcv_df", return_value=listing):
+        per_security = compute_indicators_for_range(
+            security_id=9, start_date=START, end_date=END, session=Mock(spec=Session)
+        )
+    with patch("app.indicators.panel._load_ohlcv_long_df", return_value=listing):
+        panel = compute_indicators_for_securities(
+            [9], START, END, session=Mock(spec=Session)
+        )
+
+    for result in (per_security, panel):
+        assert len(result) == 60
+        for name in INDICATOR_REGISTRY.outputs:
+            values = result[name].reset_index(drop=True)
+            assert values.iloc[: history[name] - 1].isna().all(), name
+        assert result["sma_200"].isna().all()
+        assert result["sma_20"].iloc[19:].notna().all()
+        assert result["ema_9"].iloc[history["ema_9"] - 1 :].notna().all()
+
+    pd.testing.assert_frame_equal(
+        per_security.reset_index(drop=True), panel, check_dtype=False
+    )
+
+
+def test_lookback_follows_requested_indicators():
+    with (
+        patch("app.indicators.panel._load_ohlcv_long_df", return_value=pd.DataFrame()),
+        patch("app.indicators.panel.get_nth_trading_day") as nth_trading_day,
+    ):
+        compute_indicators_for_securities([1], START, END, None, columns=["sma_20"])
+
+    assert nth_trading_day.call_args.kwargs["offset"] == -20
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.indicators.atr import atr
+from app.indicators.avg_volume import avg_volume
+from app.indicators.breakout_proximity import breakout_proximity
+from app.indicators.close_position import close_position
+from app.indicators.compute import PRICE_FIELDS
+from app.indicators.ema import ema
+from app.indicators.high_low import breakout_high_n, breakout_low_n
+from app.indicators.macd import macd
+from app.indicators.percent_change import percent_change
+from app.indicators.price_volume_corr import price_volume_corr
+from app.indicators.range_pct import range_pct
+from app.indicators.registry import (
+    INDICATOR_REGISTRY,
+    IndicatorGraphError,
+    IndicatorRegistry,
+)
+from app.indicators.rolling_volatility import rolling_volatility
+from app.indicators.rsi import rsi
+from app.indicators.sma import sma
+from app.indicators.volume_weighted_change import volume_weighted_change
+
+
+@pytest.fixture
+def ohlcv(synthetic_ohlcv) -> pd.DataFrame:
+    df = synthetic_ohlcv(1, 300, seed=7)
+    for column in PRICE_FIELDS:
+        df[column] = df[column].astype("float64")
+    return df
+
+
+def _compute(df: pd.DataFrame, targets=None) -> dict:
+    sources = {field: df[field] for field in PRICE_FIELDS}
+    sources["valid"] = pd.Series(True, index=df.index)
+    return INDICATOR_REGISTRY.compute(sources, targets)
+
+
+def test_registry_matches_plain_pandas_formulas(ohlcv):
+    result = _compute(ohlcv)
+    adjusted_close, close, volume = (
+        ohlcv["adjusted_close"],
+        ohlcv["close"],
+        ohlcv["volume"],
+    )
+    high, low = ohlcv["high"], ohlcv["low"]
+
+    delta = adjusted_close.diff()
+    avg_gain = delta.where(delta > 0, 0.0).ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = (-delta.where(delta < 0, 0.0)).ewm(alpha=1 / 14, adjust=False).mean()
+    macd = (
+        adjusted_close.ewm(span=12, adjust=False).mean()
+        - adjusted_close.ewm(span=26, adjust=False).mean()
+    )
+    macd_signal = macd.ewm(span=9, adjust=False).mean()
+    prev_close = close.shift(1)
+    true_range = pd.concat(
+        [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+    ).max(axis=1)
+    close_max = close.rolling(window=20, min_periods=1).max()
+    close_min = close.rolling(window=20, min_periods=1).min()
+    daily_range = high - low
+
+    expected = {
+        "sma_200": adjusted_close.rolling(window=200).mean(),
+        "ema_20": adjusted_close.ewm(span=20, adjust=False).mean(),
+        "rsi_14": 100 - (100 / (1 + avg_gain / avg_loss)),
+        "high_10d": high.rolling(window=10).max(),
+        "low_10d": low.rolling(window=10).min(),
+        "avg_vol_20d": volume.rolling(window=20).apply(
+            lambda window: np.nan if (window == 0).any() else window.mean(), raw=True
+        ),
+        "avg_vol_weighted_change_50d": (volume * close.pct_change().abs())
+        .rolling(window=50, min_periods=1)
+        .mean(),
+        "price_volume_corr_20": close.pct_change().rolling(window=20).corr(volume),
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "macd_hist": macd - macd_signal,
+        "atr_14": true_range.ewm(alpha=1 / 14, adjust=False).mean(),
+        "close_position": ((close - low) / daily_range).where(daily_range != 0, 0.5),
+        "percent_change": close.pct_change(),
+        "range_pct_20": (close_max - close_min) / close_min,
+        "breakout_proximity_20": (close / close_max) - 1,
+        "rolling_volatility_20": close.rolling(window=20, min_periods=1).std()
+        / close.rolling(window=20, min_periods=1).mean(),
+    }
+
+    for name, values in expected.items():
+        np.testing.assert_allclose(
+            result[name].to_numpy(dtype="float64"),
+            values.to_numpy(dtype="float64", na_value=np.nan),
+            rtol=1e-9,
+            err_msg=name,
+        )
+
+
+def test_indicator_functions_match_registry(ohlcv):
+    result = _compute(ohlcv)
+    macd_df = macd(ohlcv)
+
+    expected = {
+        "sma_200": sma(ohlcv, lookback_days=200),
+        "ema_20": ema(ohlcv, lookback_days=20),
+        "rsi_14": rsi(ohlcv, lookback_days=14),
+        "high_10d": breakout_high_n(ohlcv, lookback_days=10),
+        "low_10d": breakout_low_n(ohlcv, lookback_days=10),
+        "avg_vol_20d": avg_volume(ohlcv, lookback_days=20),
+        "avg_vol_weighted_change_50d": volume_weighted_change(ohlcv, lookback_days=50),
+        "price_volume_corr_20": price_volume_corr(ohlcv, lookback_days=20),
+        "macd": macd_df["macd"],
+        "macd_signal": macd_df["macd_signal"],
+        "macd_hist": macd_df["macd_hist"],
+        "atr_14": atr(ohlcv, lookback_days=14),
+        "close_position": close_position(ohlcv),
+        "percent_change": percent_change(ohlcv),
+        "range_pct_20": range_pct(ohlcv, lookback_days=20),
+        "breakout_proximity_20": breakout_proximity(ohlcv, lookback_days=20),
+        "rolling_volatility_20": rolling_volatility(ohlcv, lookback_days=20),
+    }
+
+    for name, values in expected.items():
+        np.testing.assert_allclose(
+            result[name].to_numpy(dtype="float64"),
+            values.to_numpy(dtype="float64"),
+            rtol=1e-12,
+            err_msg=name,
+        )
+
+
+def test_plan_computes_shared_intermediates_once():
+    plan = INDICATOR_REGISTRY.plan(
+        ["range_pct_20", "breakout_proximity_20", "percent_change"]
+    )
+
+    assert plan.count("close_max_20") == 1
+    assert plan.count("percent_change") == 1
+    assert plan.index("close_max_20") < plan.index("range_pct_20")
+    assert "sma_200" not in plan
+
+
+def test_compute_only_requested_targets(ohlcv):
+    result = _compute(ohlcv, ["macd_hist"])
+
+    assert list(result) == ["macd_hist"]
+
+
+def test_plan_rejects_cycles_and_unknown_inputs():
+    registry = IndicatorRegistry()
+    registry.register("a", lambda b: b, ["b"])
+    registry.register("b", lambda a: a, ["a"])
+    registry.register("c", lambda x: x, ["missing"])
+
+    with pytest.raises(IndicatorGraphError, match="Cycle"):
+        registry.plan(["a"])
+    with pytest.raises(IndicatorGraphError, match="Unknown"):
+        registry.plan(["c"])
+
+
+def test_history_adds_warmups_along_the_longest_input_chain():
+    registry = IndicatorRegistry()
+    registry.register("change", lambda close: close, ["close"], warmup=1)
+    registry.register("mean", lambda change: change, ["change"], warmup=19)
+    registry.register("spread", lambda close, mean: mean, ["close", "mean"])
+
+    assert registry.history(["change", "mean", "spread"]) == {
+        "change": 2,
+        "mean": 21,
+        "spread": 21,
+    }
+    assert INDICATOR_REGISTRY.history(["sma_200"]) == {"sma_200": 200}
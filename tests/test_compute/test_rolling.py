@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.indicators.rolling import RollingWindows
+
+
+@pytest.fixture
+def panel_values() -> np.ndarray:
+    rng = np.random.default_rng(11)
+    values = 50 + np.cumsum(rng.normal(0, 1, (600, 4)), axis=0)
+    values[:150, 1] = np.nan  # right-aligned panel padding
+    values[300, 2] = np.nan  # gap inside a history
+    values[:595, 3] = np.nan  # history shorter than the windows
+    return values
+
+
+@pytest.mark.parametrize("stat", ["mean", "sum", "std", "max", "min"])
+@pytest.mark.parametrize("window", [5, 10, 20, 50, 200])
+@pytest.mark.parametrize("min_periods", [None, 1])
+def test_rolling_windows_match_pandas(panel_values, stat, window, min_periods):
+    windows = RollingWindows(panel_values)
+    expected = getattr(
+        pd.DataFrame(panel_values).rolling(window, min_periods=min_periods), stat
+    )().to_numpy()
+
+    np.testing.assert_allclose(
+        getattr(windows, stat)(window, min_periods), expected, rtol=1e-9, atol=1e-9
+    )
+
+
+def test_rolling_windows_on_a_series_match_its_panel_column(panel_values):
+    panel = RollingWindows(panel_values)
+    series = RollingWindows(panel_values[:, 2])
+
+    assert series.mean(20).shape == (600,)
+    np.testing.assert_array_equal(series.mean(20), panel.mean(20)[:, 2])
+    np.testing.assert_array_equal(series.max(10), panel.max(10)[:, 2])
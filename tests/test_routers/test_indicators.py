@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock, Mock, patch
+
+import pandas as pd
+import pytest
+
+from sqlmodel import Session
+from starlette.testclient import TestClient
+
+from app.core.db import get_db
+from app.handlers.ohlcv_daily import ARRAY_FIELDS, ohlcv_rows_to_arrays
+from app.indicators.on_demand import ON_DEMAND_CACHE
+from main import get_app
+
+
+@pytest.fixture
+def ohlcv(synthetic_ohlcv) -> pd.DataFrame:
+    return synthetic_ohlcv(1, 300, seed=1)
+
+
+@pytest.fixture
+def indicators_client(ohlcv):
+    rows = list(
+        ohlcv[["security_id", "candle_date", *ARRAY_FIELDS]].itertuples(
+            index=False, name=None
+        )
+    )
+    handler = MagicMock()
+    handler.get_earliest_candle_date.return_value = ohlcv["candle_date"].min()
+    handler.get_latest_candle_date.return_value = ohlcv["candle_date"].max()
+    handler.get_data_versions.return_value = {1: ("router",)}
+    handler.load_arrays.side_effect = lambda start, end, ids: ohlcv_rows_to_arrays(
+        [[row for row in rows if row[0] in ids and start <= row[1] <= end]]
+    )
+
+    app = get_app()
+    app.dependency_overrides[get_db] = lambda: Mock(spec=Session)
+    with (
+        patch("app.routers.indicators.OHLCVDailyHandler", return_value=handler),
+        patch("app.handlers.ohlcv_daily.OHLCVDailyHandler", return_value=handler),
+        TestClient(app) as test_client,
+    ):
+        yield test_client
+    ON_DEMAND_CACHE.clear()
+
+
+def test_on_demand_defaults_to_the_security_candle_range(indicators_client, ohlcv):
+    response = indicators_client.get(
+        "/indicators/1/on-demand", params={"indicator": "sma(20)"}
+    )
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == len(ohlcv)
+    assert rows[0]["sma(20)"] is None  # still warming up on the first candle
+    assert rows[-1]["sma(20)"] == pytest.approx(ohlcv["adjusted_close"].tail(20).mean())
+
+
+def test_on_demand_clamps_the_range_to_the_security_candles(indicators_client, ohlcv):
+    response = indicators_client.get(
+        "/indicators/1/on-demand",
+        params={"indicator": "sma(20)", "from": "1900-01-01", "to": "2100-01-01"},
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()) == len(ohlcv)
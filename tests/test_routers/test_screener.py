@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from starlette.testclient import TestClient
+
+from app.models.signal_strategy import FilterRule
+from app.services.screener_service import RESULT_COLUMNS, ScreenerService
+from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
+from main import get_app
+
+
+@pytest.fixture
+def latest_day(feature_frame) -> pd.DataFrame:
+    df = feature_frame(n_securities=200, n_days=1)
+    df.insert(1, "symbol", "T" + df["security_id"].astype(str))
+    return df
+
+
+@pytest.fixture
+def screener_client(latest_day):
+    screener = ScreenerService(load=lambda: latest_day)
+    with patch("app.routers.screener.SCREENER", screener):
+        with TestClient(get_app()) as test_client:
+            yield test_client
+
+
+def _rules(**update) -> dict:
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+    return strategy.model_copy(update=update).model_dump(mode="json")
+
+
+def test_screen_returns_ranked_rows(screener_client, latest_day):
+    response = screener_client.post("/screener/", json=_rules())
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert rows
+    assert list(rows[0])[: len(RESULT_COLUMNS)] == RESULT_COLUMNS
+    assert {row["symbol"] for row in rows} <= set(latest_day["symbol"])
+
+
+def test_screen_rejects_rules_reading_unknown_columns(screener_client):
+    rules = _rules(
+        signal_filters=[FilterRule(indicator="no_such_column", comparison=">", value=0)]
+    )
+
+    response = screener_client.post("/screener/", json=rules)
+
+    assert response.status_code == 400
+    assert "no_such_column" in response.json()["detail"]
+
+
+def test_refresh_reloads_the_snapshot(screener_client, latest_day):
+    response = screener_client.post("/screener/refresh")
+
+    assert response.status_code == 200
+    assert response.json()["rows"] == len(latest_day)
@@ -0,0 +1,71 @@
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from app.services.screener_service import RESULT_COLUMNS, ScreenerService
+from app.signals.evaluator import StrategyEvaluator
+from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
+
+
+@pytest.fixture
+def latest_day(feature_frame):
+    def load() -> pd.DataFrame:
+        df = feature_frame(n_securities=500, n_days=1)
+        df.insert(1, "symbol", "T" + df["security_id"].astype(str))
+        return df
+
+    return load
+
+
+def test_screen_matches_signal_generation_on_the_snapshot(latest_day):
+    df = latest_day()
+    screener = ScreenerService(load=lambda: df)
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+
+    result = screener.screen(strategy)
+
+    expected = StrategyEvaluator(df).evaluate(strategy)
+    assert list(result.columns[: len(RESULT_COLUMNS)]) == RESULT_COLUMNS
+    assert result["security_id"].tolist() == expected["security_id"].tolist()
+    assert result["score"].tolist() == expected["score"].tolist()
+    assert set(result.columns) <= set(df.columns) | {"score"}
+
+
+def test_snapshot_is_loaded_once_and_reloaded_when_stale(latest_day):
+    load = Mock(side_effect=latest_day)
+    screener = ScreenerService(load=load, max_age_seconds=3600)
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+
+    screener.screen(strategy)
+    screener.screen(strategy)
+    assert load.call_count == 1
+    assert screener.snapshot().evaluator.hits > 0
+
+    screener.max_age_seconds = 0
+    screener.screen(strategy)
+    assert load.call_count == 2
+
+
+def test_screen_rejects_rules_reading_unknown_columns(latest_day):
+    screener = ScreenerService(load=latest_day)
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+    rules = strategy.model_copy(
+        update={
+            "signal_filters": [
+                {"indicator": "no_such_column", "comparison": ">", "value": 0}
+            ]
+        }
+    )
+
+    with pytest.raises(ValueError, match="no_such_column"):
+        screener.screen(type(strategy).model_validate(rules.model_dump()))
+
+
+def test_screen_on_an_empty_snapshot_returns_no_rows():
+    screener = ScreenerService(load=lambda: pd.DataFrame(columns=["security_id"]))
+
+    result = screener.screen(SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength"))
+
+    assert result.empty
+    assert list(result.columns[: len(RESULT_COLUMNS)]) == RESULT_COLUMNS
@@ -0,0 +1,68 @@
+from app.models.signal_strategy import SignalStrategy
+from app.signals.compiled import compile_strategy
+from app.signals.filters import compile_signal_filters
+from app.signals.ranking import compile_ranking
+from app.utils.lru import LRUCache
+
+
+def _strategy(**overrides) -> SignalStrategy:
+    data = {
+        "strategy_id": "compiled_test",
+        "name": "Compiled Test",
+        "signal_filters": [
+            {
+                "indicator": "close",
+                "comparison": ">",
+                "value": 1.0,
+                "comparison_field": "sma_50",
+            }
+        ],
+        "validate_at_open_filters": [
+            {"indicator": "rsi_14", "comparison": "<", "value": 70}
+        ],
+        "ranking": [
+            {"indicator": "rsi_14", "function": "linear", "weight": 1.0},
+            {
+                "indicator": "volume",
+                "function": "log_ratio",
+                "weight": 2.0,
+                "denominator": "avg_vol_20d",
+                "max": 3.0,
+            },
+        ],
+        "max_signals_per_day": 4,
+    }
+    data.update(overrides)
+    return SignalStrategy.model_validate(data)
+
+
+def test_compile_strategy_precomputes_columns_and_plans():
+    strategy = _strategy()
+    compiled = compile_strategy(strategy)
+
+    assert compiled.eod_columns == frozenset(strategy.required_eod_columns())
+    assert compiled.sod_columns == frozenset(strategy.required_sod_columns())
+    assert compiled.filter_plan == compile_signal_filters(strategy)
+    assert compiled.ranking_plan == compile_ranking(strategy)
+    assert compiled.ranking_plan.columns == {"rsi_14", "volume", "avg_vol_20d"}
+    assert compiled.ranking_plan.top_n == 4
+    assert [term.column for term in compiled.open_filter_plan.terms] == ["rsi_14"]
+
+
+def test_compile_strategy_is_cached_by_content():
+    compiled = compile_strategy(_strategy())
+
+    assert compile_strategy(_strategy()) is compiled
+    assert compile_strategy(_strategy(max_signals_per_day=5)) is not compiled
+
+
+def test_compiled_strategies_are_bounded(monkeypatch):
+    cache: LRUCache = LRUCache(max_entries=2)
+    monkeypatch.setattr("app.signals.compiled._COMPILED_STRATEGIES", cache)
+
+    first = compile_strategy(_strategy())
+    for max_signals in (5, 6):
+        compile_strategy(_strategy(max_signals_per_day=max_signals))
+
+    assert len(cache) == 2
+    assert compile_strategy(_strategy()) is not first
@@ -0,0 +1,66 @@
+import re
+
+import pandas as pd
+import pytest
+
+from app.signals.evaluator import StrategyEvaluator, evaluate_strategies
+from app.signals.filters import (
+    apply_default_signal_filters,
+    apply_signal_filters,
+    apply_strategy_filters,
+)
+from app.signals.ranking import apply_strategy_ranking
+from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
+
+
+def _pick_separately(df: pd.DataFrame, strategy) -> pd.DataFrame:
+    filtered = apply_signal_filters(
+        apply_default_signal_filters(df, strategy.required_eod_columns()), strategy
+    )
+    return apply_strategy_ranking(filtered, strategy, by="measurement_date")
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    list(SIGNAL_STRATEGY_PROVIDER.iter_strategies()),
+    ids=lambda strategy: strategy.strategy_id,
+)
+def test_evaluator_matches_filtering_each_strategy_separately(strategy, feature_frame):
+    df = feature_frame()
+
+    try:
+        expected = _pick_separately(df, strategy)
+    except ValueError as e:
+        # Misconfigured strategies fail the same way
+        with pytest.raises(ValueError, match=re.escape(str(e))):
+            StrategyEvaluator(df).evaluate(strategy, by="measurement_date")
+        return
+
+    evaluated = StrategyEvaluator(df).evaluate(strategy, by="measurement_date")
+    pd.testing.assert_frame_equal(evaluated, expected)
+    pd.testing.assert_frame_equal(
+        apply_strategy_filters(df, strategy),
+        apply_signal_filters(
+            apply_default_signal_filters(df, strategy.required_eod_columns()),
+            strategy,
+        ),
+    )
+
+
+def test_evaluator_shares_masks_between_strategies(feature_frame):
+    df = feature_frame()
+    strategies = [
+        strategy
+        for strategy in SIGNAL_STRATEGY_PROVIDER.iter_strategies()
+        if all(rule.function != "log_ratio" for rule in strategy.ranking)
+    ]
+
+    evaluator = StrategyEvaluator(df)
+    signals = {
+        strategy.strategy_id: evaluator.evaluate(strategy) for strategy in strategies
+    }
+
+    # Default price/volume/ATR masks are built once and reused by every other strategy
+    assert evaluator.hits >= 3 * (len(strategies) - 1)
+    assert signals.keys() == evaluate_strategies(df, strategies).keys()
+    assert any(not ranked.empty for ranked in signals.values())
@@ -1,12 +1,16 @@
 import pandas as pd
+import pytest
 
 from app.models.signal_strategy import FilterRule, RankingFormula, SignalStrategy
 from app.signals.filters import (
     apply_default_open_validation_filters,
     apply_default_signal_filters,
     apply_signal_filters,
+    apply_strategy_filters,
     apply_validate_at_open_filters,
+    compile_signal_filters,
 )
+from app.utils.lru import LRUCache
 
 # ---------------------------
 # Default EOD Filters (existing)
@@ -167,6 +171,65 @@ def test_apply_strategy_filters_multiplier_of():
 
 # ---------------------------
 # Default Open-Validation Filters (CURRENT impl: no staleness)
+def _sma_strategy(multiplier: float) -> SignalStrategy:
+    return SignalStrategy(
+        strategy_id="test",
+        name="SMA rule",
+        signal_filters=[
+            FilterRule(
+                indicator="close",
+                comparison=">",
+                value=multiplier,
+                comparison_field="sma_50",
+            )
+        ],
+        ranking=_minimal_ranking(),
+    )
+
+
+def test_compile_signal_filters_is_cached_per_config():
+    plan = compile_signal_filters(_sma_strategy(1.0))
+
+    assert compile_signal_filters(_sma_strategy(1.0)) is plan
+    assert compile_signal_filters(_sma_strategy(1.02)) is not plan
+
+
+def test_compiled_signal_filters_are_bounded(monkeypatch):
+    cache: LRUCache = LRUCache(max_entries=2)
+    monkeypatch.setattr("app.signals.filters._COMPILED_SIGNAL_FILTERS", cache)
+
+    first = compile_signal_filters(_sma_strategy(1.0))
+    for multiplier in (1.01, 1.02):
+        compile_signal_filters(_sma_strategy(multiplier))
+
+    assert len(cache) == 2
+    assert compile_signal_filters(_sma_strategy(1.0)) is not first
+
+
+def test_apply_strategy_filters_combines_default_and_strategy_filters():
+    df = pd.DataFrame(
+        {
+            "ticker": ["AAPL", "MSFT", "GOOG", "AMZN"],
+            "close": [110, 90, 4, 110],
+            "sma_50": [100, 100, 3, None],
+            "volume": 2_000_000,
+            "avg_vol_20d": 1_500_000,
+            "atr_14": [3, 3, 1, 3],
+        }
+    )
+
+    filtered = apply_strategy_filters(df, _sma_strategy(1.0))
+
+    assert filtered["ticker"].tolist() == ["AAPL"]
+
+
+def test_apply_strategy_filters_reports_missing_columns():
+    df = pd.DataFrame([{"close": 110, "volume": 2e6, "atr_14": 3}])
+
+    with pytest.raises(ValueError, match="Missing indicator column in DataFrame"):
+        apply_strategy_filters(df, _sma_strategy(1.0))
+
+
 # ---------------------------
 
 
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.signal_run import SignalRun
+from app.models.signal_strategy import FilterRule, RankingFormula, SignalStrategy
+from app.signals.compiled import compile_strategy
+from app.signals.evaluator import StrategyEvaluator
+from app.signals.incremental import (
+    changed_security_ids,
+    input_fingerprint,
+    plan_signal_runs,
+)
+from app.signals.ranking import merge_top_n
+
+GAUSSIAN_RSI = RankingFormula(
+    indicator="rsi_14", function="gaussian", weight=1.0, center=50, sigma=10
+)
+
+
+def _strategy(
+    strategy_id: str, ranking: RankingFormula = GAUSSIAN_RSI
+) -> SignalStrategy:
+    return SignalStrategy(
+        strategy_id=strategy_id,
+        name=strategy_id,
+        signal_filters=[FilterRule(indicator="rsi_14", comparison="<", value=80)],
+        ranking=[ranking],
+        max_signals_per_day=10,
+    )
+
+
+def _run(strategy: SignalStrategy, data_version: str) -> SignalRun:
+    return SignalRun(
+        strategy_id=strategy.strategy_id,
+        signal_date=pd.Timestamp("2024-03-04").date(),
+        config_hash=compile_strategy(strategy).config_hash,
+        data_version=data_version,
+    )
+
+
+def test_fingerprint_and_changed_securities():
+    previous = {1: "a", 2: "b", 3: "c"}
+    current = {1: "a", 2: "x", 4: "d"}
+
+    assert changed_security_ids(previous, current) == {2, 3, 4}
+    assert input_fingerprint(previous) == input_fingerprint(
+        dict(reversed(previous.items()))
+    )
+    assert input_fingerprint(previous) != input_fingerprint(current)
+
+
+def test_plan_signal_runs_skips_merges_and_recomputes():
+    up_to_date = _strategy("up_to_date")
+    mergeable = _strategy("mergeable")
+    linear = _strategy(
+        "linear", RankingFormula(indicator="rsi_14", function="linear", weight=1.0)
+    )
+    edited = _strategy("edited")
+    new = _strategy("new")
+    runs = {
+        "up_to_date": _run(up_to_date, "current"),
+        "mergeable": _run(mergeable, "previous"),
+        "linear": _run(linear, "previous"),
+        "edited": _run(edited.model_copy(update={"max_signals_per_day": 3}), "current"),
+    }
+
+    plan = plan_signal_runs(
+        [up_to_date, mergeable, linear, edited, new], runs, "current", "previous"
+    )
+
+    assert [s.strategy_id for s in plan.skipped] == ["up_to_date"]
+    assert [s.strategy_id for s in plan.merged] == ["mergeable"]
+    assert [s.strategy_id for s in plan.full] == ["linear", "edited", "new"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merge_top_n_matches_ranking_the_whole_day_again(seed, feature_frame):
+    strategy = _strategy("mergeable")
+    rng = np.random.default_rng(seed)
+    before = feature_frame(n_securities=200, n_days=1, seed=seed)
+    changed_ids = set(rng.choice(before["security_id"], 15, replace=False).tolist())
+
+    after = before.copy()
+    rows = after["security_id"].isin(changed_ids)
+    after.loc[rows, "rsi_14"] = rng.uniform(10, 90, rows.sum())
+    after = after[after["security_id"] != min(changed_ids)]  # one delisted
+
+    columns = ["security_id", "ohlcv_daily_id", "score"]
+    previous = StrategyEvaluator(before).evaluate(strategy)[columns]
+    changed = StrategyEvaluator(after[after["security_id"].isin(changed_ids)]).evaluate(
+        strategy
+    )[columns]
+    expected = StrategyEvaluator(after).evaluate(strategy)[columns]
+
+    merged = merge_top_n(previous, changed, changed_ids, strategy.max_signals_per_day)
+
+    if merged is None:
+        # Only when a changed security left the full previous top N
+        assert previous["security_id"].isin(changed_ids).any()
+    else:
+        assert merged["security_id"].tolist() == expected["security_id"].tolist()
+        assert merged["score"].tolist() == pytest.approx(expected["score"].tolist())
+
+
+def test_merge_top_n_needs_the_unchanged_rest_when_the_top_n_loses_a_row():
+    previous = pd.DataFrame({"security_id": [1, 2], "score": [0.9, 0.8]})
+    changed = pd.DataFrame({"security_id": [1], "score": [0.1]})
+
+    assert merge_top_n(previous, changed, {1}, top_n=2) is None
+    assert merge_top_n(previous, changed, {1}, top_n=3)["security_id"].tolist() == [
+        2,
+        1,
+    ]
@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
+import pytest
 
 from app.models.signal_strategy import RankingFormula, SignalStrategy
-from app.signals.ranking import apply_strategy_ranking
+from app.signals.ranking import apply_strategy_ranking, top_n_positions
 
 
 def test_apply_strategy_ranking_gaussian():
@@ -114,3 +116,59 @@ def test_apply_strategy_ranking_limits_top_n():
 
     ranked = apply_strategy_ranking(df, config)
     assert len(ranked) == 2
+
+
+def test_apply_strategy_ranking_by_date_matches_ranking_each_date():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2024-01-01", periods=5).date
+    df = pd.DataFrame(
+        {
+            "measurement_date": np.repeat(dates, 40),
+            "security_id": np.tile(np.arange(40), len(dates)),
+            "rsi_14": rng.uniform(20, 80, 200).round(1),
+            "percent_change": rng.normal(0, 0.02, 200),
+        }
+    )
+    config = SignalStrategy(
+        strategy_id="test",
+        name="Grouped",
+        signal_filters=[],
+        ranking=[
+            RankingFormula(
+                indicator="rsi_14", function="gaussian", center=55, sigma=10, weight=1
+            ),
+            RankingFormula(indicator="percent_change", function="linear", weight=2),
+        ],
+        max_signals_per_day=3,
+    )
+
+    ranked = apply_strategy_ranking(df, config, by="measurement_date")
+
+    expected = pd.concat(
+        apply_strategy_ranking(df[df["measurement_date"] == day], config)
+        for day in dates
+    )
+    pd.testing.assert_frame_equal(
+        ranked.sort_values(["measurement_date", "score"], ascending=[True, False]),
+        expected,
+    )
+
+
+@pytest.mark.parametrize("top_n", [0, 1, 3, 7, 40])
+def test_top_n_positions_matches_stable_sort_and_head(top_n):
+    rng = np.random.default_rng(top_n)
+    # Coarse scores make many ties, including across the cut
+    score = rng.integers(0, 6, 200) / 5.0
+    score[::17] = np.nan
+    groups = pd.Series(rng.integers(0, 4, 200))
+
+    df = pd.DataFrame({"score": score, "group": groups})
+    ranked = df.sort_values(by="score", ascending=False, kind="stable")
+
+    np.testing.assert_array_equal(
+        top_n_positions(score, top_n), ranked.head(top_n).index
+    )
+    np.testing.assert_array_equal(
+        top_n_positions(score, top_n, groups),
+        ranked.groupby("group", sort=False).head(top_n).index,
+    )
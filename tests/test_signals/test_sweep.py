@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from app.signals.evaluator import StrategyEvaluator
+from app.signals.filters import compile_signal_filters
+from app.signals.sweep import (
+    SIGNAL_COLUMNS,
+    SweepEngine,
+    strategy_variants,
+    sweep_frames,
+)
+from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
+
+GRID = {
+    "max_signals_per_day": [2, 5],
+    "ranking.0.center": [55, 60, 65],
+    "signal_filters.2.value": [1.0, 1.02],
+}
+
+
+def test_strategy_variants_apply_every_combination():
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+
+    variants = list(strategy_variants(strategy, GRID))
+
+    assert len(variants) == 12
+    assert len({v.strategy.strategy_id for v in variants}) == 12
+    last = variants[-1].strategy
+    assert last.max_signals_per_day == 5
+    assert last.ranking[0].center == 65
+    assert last.signal_filters[2].value == 1.02
+    assert last.signal_filters[2].comparison_field == "sma_20"
+
+
+def test_strategy_variants_reject_unknown_parameters():
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+
+    with pytest.raises(ValueError, match="ranking.9.center"):
+        list(strategy_variants(strategy, {"ranking.9.center": [50]}))
+
+
+def test_sweep_matches_evaluating_each_variant_and_reuses_masks(feature_frame):
+    df = feature_frame()
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+    engine = SweepEngine(df)
+
+    results = list(engine.run(strategy, GRID))
+
+    for variant, signals in results:
+        expected = StrategyEvaluator(df).evaluate(
+            variant.strategy, by="measurement_date"
+        )
+        pd.testing.assert_frame_equal(
+            signals, expected[SIGNAL_COLUMNS].reset_index(drop=True)
+        )
+    # Only the swept filter needs a second mask; every other term is computed once
+    first_plan = compile_signal_filters(results[0][0].strategy)
+    assert len(engine.evaluator._masks) == len(first_plan.terms) + 1
+
+    summary, all_signals = sweep_frames(iter(results))
+    assert summary["variant"].tolist() == list(range(12))
+    assert summary["signals"].sum() == len(all_signals)
+    assert list(all_signals.columns) == ["variant"] + SIGNAL_COLUMNS
@@ -24,6 +24,36 @@ def test_id_mismatch_raises(tmp_path: Path):
     assert "ID mismatch" in str(e.value)
 
 
+def test_reload_picks_up_edits_and_reparses_only_changed_files(tmp_path: Path):
+    write_min_strategy_json(tmp_path, "kept")
+    write_min_strategy_json(tmp_path, "edited")
+    provider = SignalStrategyProvider.from_directory(tmp_path)
+    kept = provider.get_by_id("kept")
+
+    write_min_strategy_json(tmp_path, "edited", max_signals_per_day=9)
+    write_min_strategy_json(tmp_path, "added")
+
+    assert provider.reload()
+    assert provider.get_by_id("kept") is kept
+    assert provider.get_by_id("edited").max_signals_per_day == 9
+    assert [s.strategy_id for s in provider.iter_strategies()] == [
+        "added",
+        "edited",
+        "kept",
+    ]
+    assert not provider.reload()
+
+
+def test_reload_keeps_current_strategies_when_a_file_is_invalid(tmp_path: Path):
+    write_min_strategy_json(tmp_path, "sma_pullback_buy")
+    provider = SignalStrategyProvider.from_directory(tmp_path)
+
+    (tmp_path / "broken.json").write_text("{")
+
+    assert not provider.reload()
+    assert [s.strategy_id for s in provider.iter_strategies()] == ["sma_pullback_buy"]
+
+
 def write_min_strategy_json(dirpath: Path, strategy_id: str, **overrides) -> Path:
     data = {
         "strategy_id": strategy_id,
@@ -0,0 +1,109 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from app.handlers.eod_signal import SIGNAL_FRAME_COLUMNS, EODSignalHandler
+from app.models.signal_run import SignalRun
+from app.signals.compiled import compile_strategy
+from app.signals.incremental import input_fingerprint
+from app.stratagies.signal_strategies import SIGNAL_STRATEGY_PROVIDER
+from app.tasks.generate_signals import (
+    _signal_windows,
+    generate_historic_signals,
+    ranked_df_to_signal_frame,
+    run_incremental_signal_pickers,
+)
+
+
+def test_signal_windows_cover_the_range_without_overlap():
+    windows = _signal_windows(date(2024, 1, 1), date(2024, 3, 10), window_days=30)
+
+    assert windows == [
+        (date(2024, 1, 1), date(2024, 1, 30)),
+        (date(2024, 1, 31), date(2024, 2, 29)),
+        (date(2024, 3, 1), date(2024, 3, 10)),
+    ]
+
+
+def test_historic_signals_report_merges_windows_and_keeps_going_on_failure():
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+
+    def run_signal_pickers(start_date, end_date, strategies):
+        if start_date == date(2024, 2, 1):
+            raise RuntimeError("connection lost")
+        return {strategy.strategy_id: 5}
+
+    with patch(
+        "app.tasks.generate_signals.run_signal_pickers", side_effect=run_signal_pickers
+    ) as picker:
+        report = generate_historic_signals(
+            [strategy], date(2024, 1, 1), date(2024, 3, 31), workers=1, window_days=31
+        )
+
+    assert picker.call_count == 3
+    assert report.windows == 3 and report.completed == 2
+    assert report.failed == [(date(2024, 2, 1), date(2024, 3, 2))]
+    assert report.signals == {strategy.strategy_id: 10}
+
+
+def test_signal_frame_is_written_deduplicated_in_one_statement_without_returning():
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+    ranked = pd.DataFrame(
+        {
+            "security_id": [1, 2, 1],
+            "measurement_date": [date(2024, 1, 2)] * 3,
+            "ohlcv_daily_id": [10, 20, 11],
+            "score": [0.9, 0.5, 0.1],
+        }
+    )
+    frame = ranked_df_to_signal_frame(ranked, strategy)
+    assert list(frame.columns) == SIGNAL_FRAME_COLUMNS
+    assert (frame["strategy_id"] == strategy.strategy_id).all()
+
+    session = MagicMock()
+    EODSignalHandler(session).save_frame(frame)
+
+    statement = session.exec.call_args.args[0]
+    params = session.exec.call_args.kwargs["params"]
+    assert session.exec.call_count == 1
+    assert not statement._returning
+    assert [(p["security_id"], p["ohlcv_daily_id"]) for p in params] == [
+        (1, 10),
+        (2, 20),
+    ]
+    assert all(p["validated_at_open"] is None for p in params)
+
+
+def test_incremental_rerun_with_unchanged_inputs_writes_nothing():
+    strategy = SIGNAL_STRATEGY_PROVIDER.get_by_id("momentum_strength")
+    signal_date = date(2024, 1, 2)
+    row_hashes = {1: "a", 2: "b"}
+    run = SignalRun(
+        strategy_id=strategy.strategy_id,
+        signal_date=signal_date,
+        config_hash=compile_strategy(strategy).config_hash,
+        data_version=input_fingerprint(row_hashes),
+    )
+    module = "app.tasks.generate_signals"
+
+    with (
+        patch(f"{module}.get_db", return_value=iter([MagicMock()])),
+        patch(f"{module}.TechnicalIndicatorHandler") as indicators,
+        patch(f"{module}.SignalInputHandler") as inputs,
+        patch(f"{module}.SignalRunHandler") as runs,
+        patch(f"{module}.load_feature_frame") as load,
+        patch(f"{module}.EODSignalHandler") as signals,
+    ):
+        indicators.return_value.get_input_hashes.return_value = row_hashes
+        inputs.return_value.get_hashes.return_value = row_hashes
+        runs.return_value.get_for_date.return_value = {strategy.strategy_id: run}
+
+        counts = run_incremental_signal_pickers(signal_date, [strategy])
+
+    assert counts == {}
+    load.assert_not_called()
+    signals.assert_not_called()
+    runs.return_value.record.assert_called_once_with(
+        signal_date, {}, input_fingerprint(row_hashes)
+    )
@@ -0,0 +1,226 @@
+from datetime import date
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import pandas as pd
+
+from sqlmodel import Session
+
+from app.handlers.ohlcv_daily import mid_history_changes
+from app.handlers.technical_indicator import indicator_frame_to_csv
+from app.indicators.panel import compute_indicators_for_securities
+from app.tasks.indicator_computation import (
+    HealRange,
+    _compute_heal_shard,
+    _compute_indicator_shard,
+    _merge_heal_spans,
+    compute_daily_indicators_incrementally,
+    plan_indicator_heal,
+    plan_invalidated_range,
+)
+
+START = date(2024, 6, 3)
+END = date(2024, 12, 31)
+
+
+def test_indicator_shard_round_trips_through_copy_csv(synthetic_ohlcv):
+    ohlcv = pd.concat(
+        [synthetic_ohlcv(1, 400, seed=1), synthetic_ohlcv(2, 330, seed=2)]
+    )
+
+    with patch("app.indicators.panel._load_ohlcv_long_df", return_value=ohlcv):
+        columns = _compute_indicator_shard([1, 2], START, END)
+        expected = compute_indicators_for_securities(
+            [1, 2], START, END, session=Mock(spec=Session)
+        )
+
+    assert columns["measurement_date"].dtype == np.dtype("M8[D]")
+    assert all(len(values) == len(expected) for values in columns.values())
+
+    copy_columns = list(expected.columns)
+    csv = indicator_frame_to_csv(pd.DataFrame(columns), copy_columns)
+    parsed = pd.read_csv(
+        csv, header=None, names=copy_columns, float_precision="round_trip"
+    )
+
+    assert parsed["security_id"].tolist() == expected["security_id"].tolist()
+    assert pd.to_datetime(parsed["measurement_date"]).dt.date.tolist() == (
+        expected["measurement_date"].tolist()
+    )
+    # NaN is written as an empty field (NULL) and floats round-trip exactly
+    pd.testing.assert_frame_equal(
+        parsed[copy_columns[2:]], expected[copy_columns[2:]], check_exact=True
+    )
+
+
+def test_empty_indicator_shard_has_no_rows():
+    with patch("app.indicators.panel._load_ohlcv_long_df", return_value=pd.DataFrame()):
+        columns = _compute_indicator_shard([1], START, END)
+
+    assert pd.DataFrame(columns).empty
+
+
+def test_plan_indicator_heal_splits_distant_gaps_and_merges_close_ones():
+    trading_days = list(pd.bdate_range("2024-01-01", "2024-03-29").date)
+    missing = {trading_days[i] for i in (3, 4, 7, 40, 41)}
+    existing = set(trading_days) - missing
+
+    ranges = plan_indicator_heal(7, trading_days, existing, max_gap_days=5)
+
+    assert ranges == [
+        HealRange(7, trading_days[3], trading_days[7]),
+        HealRange(7, trading_days[40], trading_days[41]),
+    ]
+
+
+def test_plan_indicator_heal_without_gaps_is_empty():
+    trading_days = list(pd.bdate_range("2024-01-01", "2024-01-31").date)
+
+    assert plan_indicator_heal(1, trading_days, set(trading_days)) == []
+
+
+def test_heal_shard_only_loads_and_returns_requested_ranges(synthetic_ohlcv):
+    ohlcv = pd.concat(
+        [synthetic_ohlcv(1, 400, seed=1), synthetic_ohlcv(2, 330, seed=2)]
+    )
+    ranges = [
+        HealRange(1, date(2024, 7, 1), date(2024, 7, 3)),
+        HealRange(1, date(2024, 9, 2), date(2024, 9, 6)),
+        HealRange(2, date(2024, 12, 30), date(2024, 12, 31)),
+    ]
+    loaded = []
+
+    def load_windows(windows, session):
+        frames = []
+        for window, (security_id, start, end) in enumerate(windows):
+            rows = ohlcv[
+                (ohlcv["security_id"] == security_id)
+                & (ohlcv["candle_date"] >= start)
+                & (ohlcv["candle_date"] <= end)
+            ]
+            loaded.append(len(rows))
+            frames.append(rows.assign(security_id=window))
+        return pd.concat(frames)
+
+    with patch(
+        "app.indicators.panel._load_ohlcv_windows_long_df", side_effect=load_windows
+    ):
+        columns = _compute_heal_shard(ranges)
+
+    healed = pd.DataFrame(columns)
+    assert set(zip(healed["security_id"], healed["measurement_date"].dt.date)) == {
+        (r.security_id, day)
+        for r in ranges
+        for day in pd.bdate_range(r.start_date, r.end_date).date
+    }
+    # Each range loads its own lookback, not the batch's whole date span
+    assert max(loaded) < 400
+
+    with patch("app.indicators.panel._load_ohlcv_long_df", return_value=ohlcv):
+        full = compute_indicators_for_securities(
+            [1, 2], START, END, session=Mock(spec=Session)
+        )
+    full["measurement_date"] = pd.to_datetime(full["measurement_date"])
+    expected = healed[["security_id", "measurement_date"]].merge(full, how="left")
+    pd.testing.assert_frame_equal(
+        healed[expected.columns], expected, check_dtype=False, rtol=1e-6, atol=1e-5
+    )
+
+
+def test_heal_spans_merge_overlapping_ranges_across_securities():
+    ranges = [
+        HealRange(1, date(2024, 7, 1), date(2024, 7, 3)),
+        HealRange(2, date(2024, 7, 2), date(2024, 7, 10)),
+        HealRange(1, date(2024, 9, 2), date(2024, 9, 6)),
+    ]
+
+    assert _merge_heal_spans(ranges) == [
+        (date(2024, 7, 1), date(2024, 7, 10)),
+        (date(2024, 9, 2), date(2024, 9, 6)),
+    ]
+
+
+def test_mid_history_changes_ignores_candles_appended_after_the_latest():
+    written = [
+        (1, date(2024, 5, 6), True),  # appended
+        (1, date(2024, 3, 1), True),  # backfilled gap
+        (2, date(2024, 5, 3), False),  # corrected latest candle
+        (2, date(2024, 4, 1), False),  # corrected
+        (3, date(2024, 1, 2), True),  # first candles of a new listing
+    ]
+    latest = {1: date(2024, 5, 3), 2: date(2024, 5, 3)}
+
+    assert mid_history_changes(written, latest) == {
+        1: date(2024, 3, 1),
+        2: date(2024, 4, 1),
+    }
+
+
+def test_plan_invalidated_range_spans_the_dependency_horizon():
+    candle_dates = list(pd.bdate_range("2024-01-01", "2024-12-31").date)
+
+    # A non-trading changed date starts from the next candle
+    assert plan_invalidated_range(
+        4, date(2024, 3, 2), candle_dates, horizon=10
+    ) == HealRange(4, date(2024, 3, 4), date(2024, 3, 15))
+    assert plan_invalidated_range(
+        4, date(2024, 12, 27), candle_dates, horizon=10
+    ) == HealRange(4, date(2024, 12, 27), date(2024, 12, 31))
+    assert plan_invalidated_range(4, date(2025, 1, 2), candle_dates) is None
+
+
+def test_corrected_candle_only_changes_indicators_within_the_horizon(
+    synthetic_ohlcv,
+):
+    ohlcv = synthetic_ohlcv(1, 700, seed=4)
+    corrected = ohlcv.copy()
+    changed = 350
+    corrected.loc[changed, ["high", "close", "adjusted_close"]] += 5
+
+    def compute(df: pd.DataFrame) -> pd.DataFrame:
+        with patch("app.indicators.panel._load_ohlcv_long_df", return_value=df):
+            result = compute_indicators_for_securities(
+                [1], ohlcv["candle_date"].iloc[250], END, session=Mock(spec=Session)
+            )
+        return result.set_index("measurement_date").drop(columns="security_id")
+
+    invalidated = plan_invalidated_range(
+        1, ohlcv["candle_date"].iloc[changed], list(ohlcv["candle_date"])
+    )
+    before, after = compute(ohlcv), compute(corrected)
+    inside = (before.index >= invalidated.start_date) & (
+        before.index <= invalidated.end_date
+    )
+
+    assert not np.allclose(before[inside], after[inside], equal_nan=True)
+    np.testing.assert_allclose(
+        after[~inside], before[~inside], rtol=1e-6, atol=1e-5, equal_nan=True
+    )
+
+
+def test_incremental_indicators_are_written_as_one_frame_per_batch():
+    module = "app.tasks.indicator_computation"
+    securities = [
+        Mock(id=security_id, symbol=f"S{security_id}") for security_id in (1, 2)
+    ]
+
+    def advance(state, compute_date, db_session):
+        row = {"security_id": state, "measurement_date": compute_date, "sma_20": 1.5}
+        return [row], f"state-{state}"
+
+    with (
+        patch(f"{module}.get_db", return_value=iter([MagicMock()])),
+        patch(f"{module}.SecurityHandler") as security_handler,
+        patch(f"{module}.IndicatorStateHandler") as state_handler,
+        patch(f"{module}.TechnicalIndicatorHandler") as indicator_handler,
+        patch(f"{module}._advance_indicator_state_to", side_effect=advance),
+    ):
+        security_handler.return_value.get_all.return_value = securities
+        state_handler.return_value.get_all_by_security_id.return_value = {1: 1, 2: 2}
+        compute_daily_indicators_incrementally(date(2024, 1, 2))
+
+    indicator_handler.return_value.save_all.assert_not_called()
+    (frame,), _ = indicator_handler.return_value.save_frame.call_args
+    assert list(frame["security_id"]) == [1, 2]
+    assert list(frame["sma_20"]) == [1.5, 1.5]
+    state_handler.return_value.save_all.assert_called_once_with(["state-1", "state-2"])
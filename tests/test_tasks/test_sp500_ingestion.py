@@ -1,7 +1,34 @@
 # tests/tasks/test_sp500_ingestion.py
+import importlib.util
+
+from datetime import date, datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
-from app.tasks.sp500_ingestion import backfill_sp500_from_wayback, daily_sp500_sync
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.handlers.stock_index_constituent import StockIndexConstituentHandler
+from app.models.stock_index_constituent import (
+    SP500,
+    StockIndexConstituent,
+    StockIndexConstituentCreate,
+)
+from app.models.stock_index_constituent_delta import (
+    ConstituentChange,
+    StockIndexConstituentDelta,
+    diff_constituents,
+    replay_deltas,
+)
+from app.models.stock_index_snapshot import StockIndexSnapshot
+from app.tasks.sp500_ingestion import (
+    backfill_sp500_from_wayback,
+    compact_sp500_snapshots,
+    daily_sp500_sync,
+)
 
 
 @pytest.mark.skip(reason="Debug entry point only")
@@ -20,3 +47,157 @@ def test_backfill_sp500_from_wayback():
 
     # Optional: assert on side effects if desired
     # e.g., check logs, DB rows, etc.
+
+
+def test_diff_and_replay_deltas_round_trip():
+    previous = {1, 2, 3, 4}
+    current = {2, 3, 4, 5, 6}
+
+    added, removed = diff_constituents(previous, current)
+
+    assert added == {5, 6}
+    assert removed == {1}
+
+    deltas = [(sid, ConstituentChange.ADD) for sid in added] + [
+        (sid, ConstituentChange.REMOVE) for sid in removed
+    ]
+    assert replay_deltas(previous, deltas) == current
+
+
+def test_replay_deltas_applies_snapshots_in_order():
+    base = {1, 2}
+    deltas = [
+        (3, ConstituentChange.ADD),  # snapshot 2
+        (1, ConstituentChange.REMOVE),  # snapshot 2
+        (1, ConstituentChange.ADD),  # snapshot 3 re-adds
+        (2, ConstituentChange.REMOVE),  # snapshot 3
+    ]
+
+    assert replay_deltas(base, deltas) == {1, 3}
+    assert base == {1, 2}  # base set is not mutated
+
+
+@pytest.fixture()
+def sqlite_engine():
+    """In-memory engine with just the snapshot, constituent and delta tables."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def add_now(dbapi_connection, _):
+        dbapi_connection.create_function(
+            "now", 0, lambda: datetime.now(timezone.utc).isoformat()
+        )
+
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[
+            StockIndexSnapshot.__table__,  # type: ignore[attr-defined]
+            StockIndexConstituent.__table__,  # type: ignore[attr-defined]
+            StockIndexConstituentDelta.__table__,  # type: ignore[attr-defined]
+        ],
+    )
+    yield engine
+    engine.dispose()
+
+
+def _store_full_snapshots(engine, memberships):
+    with Session(engine) as db_session:
+        handler = StockIndexConstituentHandler(db_session)
+        for day, members in enumerate(memberships, start=1):
+            snapshot = handler.save_snapshot(SP500, f"hash{day}", date(2024, 1, day))
+            handler.save_all(
+                [
+                    StockIndexConstituentCreate(
+                        index_name=SP500, snapshot_id=snapshot.id, security_id=sid
+                    )
+                    for sid in members
+                ]
+            )
+        db_session.commit()
+
+
+def _load_migration():
+    path = next(
+        (Path(__file__).parents[2] / "alembic" / "versions").glob("*_3e8c1f2a9b47_*.py")
+    )
+    spec = importlib.util.spec_from_file_location("constituent_delta_migration", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compaction_materializes_every_nth_consecutive_delta(sqlite_engine):
+    with Session(sqlite_engine) as db_session:
+        handler = StockIndexConstituentHandler(db_session)
+        base = handler.save_snapshot(SP500, "hash1", date(2024, 1, 1))
+        handler.save_all(
+            [
+                StockIndexConstituentCreate(
+                    index_name=SP500, snapshot_id=base.id, security_id=sid
+                )
+                for sid in (1, 2)
+            ]
+        )
+        for day in range(2, 7):
+            snapshot = handler.save_snapshot(
+                SP500, f"hash{day}", date(2024, 1, day), is_delta=True
+            )
+            handler.save_deltas(snapshot, added={day + 1}, removed=set())
+        db_session.commit()
+
+    with patch(
+        "app.tasks.sp500_ingestion.get_db",
+        return_value=iter([Session(sqlite_engine)]),
+    ):
+        assert compact_sp500_snapshots(interval=2) == 2
+
+    with Session(sqlite_engine) as db_session:
+        handler = StockIndexConstituentHandler(db_session)
+        snapshots = handler.get_snapshots_ordered(SP500)
+        assert [s.is_delta for s in snapshots] == [
+            False,
+            True,
+            False,
+            True,
+            False,
+            True,
+        ]
+
+        third = {ic.security_id for ic in handler.get_by_snapshot_id(snapshots[2].id)}
+        assert third == {1, 2, 3, 4}
+        for day, snapshot in enumerate(snapshots, start=1):
+            expected = {1, 2} | set(range(3, day + 2))
+            assert handler.get_membership_as_of(snapshot.snapshot_date) == expected
+
+
+def test_migration_converts_full_snapshots_to_deltas_and_back(sqlite_engine):
+    memberships = [{1, 2, 3}, {2, 3, 4}, {2, 3, 4, 5}, {3, 4, 5}, {3, 4, 5, 6}]
+    _store_full_snapshots(sqlite_engine, memberships)
+    migration = _load_migration()
+
+    with sqlite_engine.begin() as connection:
+        assert migration.convert_snapshots_to_deltas(connection, interval=3) == 3
+
+    with Session(sqlite_engine) as db_session:
+        handler = StockIndexConstituentHandler(db_session)
+        snapshots = handler.get_snapshots_ordered(SP500)
+        assert [s.is_delta for s in snapshots] == [False, True, True, False, True]
+        assert list(handler.get_by_snapshot_id(snapshots[1].id)) == []
+        for snapshot, members in zip(snapshots, memberships, strict=True):
+            assert handler.get_membership_as_of(snapshot.snapshot_date) == members
+
+    with sqlite_engine.begin() as connection:
+        assert migration.materialize_delta_snapshots(connection) == 3
+
+    with Session(sqlite_engine) as db_session:
+        handler = StockIndexConstituentHandler(db_session)
+        snapshots = handler.get_snapshots_ordered(SP500)
+        assert not any(s.is_delta for s in snapshots)
+        for snapshot, members in zip(snapshots, memberships, strict=True):
+            stored = {ic.security_id for ic in handler.get_by_snapshot_id(snapshot.id)}
+            assert stored == members